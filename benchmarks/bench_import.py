@@ -0,0 +1,130 @@
+"""Import-time benchmark for storygraph_api.
+
+Each scenario runs in a fresh interpreter several times. The fastest run is
+reported, together with the slowest modules the package imported directly, as
+listed by python -X importtime. The script exits with
+status 1 when a scenario loads a module it should not load, or when it is more than
+20% plus 2 ms slower than benchmarks/import_baseline.json in two measurements in a row.
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --update-baseline
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'import_baseline.json')
+
+# Scenario name -> (statement, modules it must not load).
+SCENARIOS = {
+    'import storygraph_api': ('import storygraph_api', ('bs4', 'requests', 'httpx', 'selenium', 'asyncio')),
+    'from storygraph_api import Book': ('from storygraph_api import Book', ('bs4', 'requests', 'httpx', 'selenium')),
+    'Book(Transport())': ('from storygraph_api import Book, Transport; Book(Transport())', ('bs4', 'httpx', 'selenium')),
+    'first parse': ('from storygraph_api.parse.user_parser import UserParser; UserParser.parse_html(b"")',
+                    ('requests', 'httpx', 'selenium')),
+}
+
+
+# The statement is timed from inside the interpreter: -X importtime does not
+# see modules loaded through importlib.import_module, which is how the
+# package resolves its lazy exports.
+TIMED = "import time; _start = time.perf_counter_ns(); {statement}; print(time.perf_counter_ns() - _start)"
+
+
+def importtime(statement: str):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', TIMED.format(statement=statement)], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_us, name = line.split('|')
+        # Nesting is shown as two extra spaces of indentation per level.
+        rows.append((name.strip(), int(cumulative_us), (len(name) - len(name.lstrip()) - 1) // 2))
+
+    # A module is printed after everything it imported, so walking backwards
+    # meets each parent before its children.
+    modules = {}
+    parents = {}
+    for name, cumulative, depth in reversed(rows):
+        parents[depth] = name
+        modules[name] = (cumulative, depth, parents.get(depth - 1) if depth else None)
+    return int(result.stdout.split()[-1]) / 1000, modules
+
+
+def measure(statement: str, repeats: int):
+    # Returns the fastest run in microseconds and the modules it loaded beyond
+    # those the interpreter loads at startup.
+    startup = set(importtime('pass')[1])
+    elapsed_us, modules = min((importtime(statement) for _ in range(repeats)), key=lambda run: run[0])
+    return elapsed_us, {name: entry for name, entry in modules.items() if name not in startup}
+
+
+def dependencies(modules):
+    # Modules the package imported directly, at import time or later from inside
+    # a function (those show up as top level), slowest first.
+    found = [(name, cumulative) for name, (cumulative, _, parent) in modules.items()
+             if name.split('.')[0] != 'storygraph_api' and (parent is None or parent.split('.')[0] == 'storygraph_api')]
+    return sorted(found, key=lambda item: -item[1])
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeats', type=int, default=15)
+    parser.add_argument('--top', type=int, default=5, help='slowest dependencies listed per scenario')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='allowed slowdown (default: 0.2)')
+    parser.add_argument('--slack-ms', type=float, default=2.0,
+                        help='milliseconds allowed on top of the tolerance, for scenarios near zero (default: 2)')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    results = {}
+    failures = []
+    for name, (statement, forbidden) in SCENARIOS.items():
+        total_us, modules = measure(statement, args.repeats)
+        results[name] = {'import_ms': round(total_us / 1000, 1)}
+        expected = (baseline or {}).get('results', {}).get(name)
+        change = f"{total_us / 1000 / expected['import_ms'] - 1:+.0%}" if expected and expected['import_ms'] else '-'
+        print(f"{name:34} {total_us / 1000:>8.1f} ms {change:>8}")
+
+        for module, cumulative in dependencies(modules)[:args.top]:
+            print(f"    {module:30} {cumulative / 1000:>8.1f} ms")
+
+        loaded = [module for module in forbidden if module in modules]
+        if loaded:
+            failures.append(f"{name}: loaded {', '.join(loaded)}")
+        if expected and not args.update_baseline:
+            limit_us = (expected['import_ms'] * (1 + args.tolerance) + args.slack_ms) * 1000
+            if total_us > limit_us:
+                # A slowdown counts only if a second measurement shows it too.
+                total_us = min(total_us, measure(statement, args.repeats)[0])
+            if total_us > limit_us:
+                failures.append(f"{name}: {total_us / 1000:.1f} ms vs {expected['import_ms']} ms baseline")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump({'python': platform.python_version(), 'results': results}, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+
+    if failures:
+        print("\nIMPORT REGRESSION", file=sys.stderr)
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        return 1
+    print("\nNo import regressions.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
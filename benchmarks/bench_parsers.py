@@ -0,0 +1,225 @@
+"""Offline benchmarks for every BooksParser and UserParser extraction function.
+
+Runs against the HTML corpus in test/fixtures, so no network access is needed.
+Each case is timed (ops/sec) and traced with tracemalloc (peak bytes per call).
+Results are compared with benchmarks/baseline.json. The script exits with
+status 1 when a case is slower or allocates more than the tolerances allow.
+
+    python benchmarks/bench_parsers.py
+    python benchmarks/bench_parsers.py --update-baseline
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from storygraph_api.metadata import METADATA_FIELDS  # noqa: E402
+from storygraph_api.parse.backend import set_parser_backend  # noqa: E402
+from storygraph_api.parse.books_parser import BooksParser  # noqa: E402
+from storygraph_api.parse.user_parser import UserParser  # noqa: E402
+from storygraph_api.testing.templates import site_chrome  # noqa: E402
+
+FIXTURES = os.path.join(ROOT, 'test', 'fixtures')
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+
+def fixture(name: str, chrome: bytes = b'') -> bytes:
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        content = f.read()
+    start = content.find(b'<body')
+    if not chrome or start == -1:
+        return content
+    end = content.index(b'>', start) + 1
+    return content[:end] + chrome + content[end:]
+
+
+def cases(chrome_kb: int):
+    chrome = site_chrome(chrome_kb).encode()
+    book = fixture('book.html', chrome)
+    reviews = fixture('community_reviews.html', chrome)
+    warnings = fixture('content_warnings.html', chrome)
+    form = fixture('read_instance_form.html')
+    summary = fixture('summary.turbo_stream')
+    search = fixture('search.html', chrome)
+    book_journal = fixture('book_journal.html', chrome)
+    profile = fixture('profile.html', chrome)
+    shelf = fixture('shelf.html', chrome)
+    journal = fixture('journal.html', chrome)
+    entries = UserParser.all_journal_entries(journal)
+
+    return {
+        'BooksParser.book_page': lambda: BooksParser.book_page(book),
+        'BooksParser.book_page[metadata]': lambda: BooksParser.book_page(book, METADATA_FIELDS),
+        'BooksParser.average_rating': lambda: BooksParser.average_rating(reviews),
+        'BooksParser.reading_progress': lambda: BooksParser.reading_progress(book),
+        'BooksParser.read_dates_from_journal': lambda: BooksParser.read_dates_from_journal(entries, 'book-0000'),
+        'BooksParser.read_dates_edit_link': lambda: BooksParser.read_dates_edit_link(book),
+        'BooksParser.read_dates_form': lambda: BooksParser.read_dates_form(form, 'read_instance'),
+        'BooksParser.get_ai_summary': lambda: BooksParser.get_ai_summary(summary),
+        'BooksParser.content_warnings': lambda: BooksParser.content_warnings(warnings),
+        'BooksParser.search': lambda: BooksParser.search(search),
+        'BooksParser.journal_entries': lambda: BooksParser.journal_entries(book_journal),
+        'UserParser.get_user_id': lambda: UserParser.get_user_id(profile, 'reader'),
+        'UserParser.parse_html': lambda: UserParser.parse_html(shelf),
+        'UserParser.all_journal_entries': lambda: UserParser.all_journal_entries(journal),
+    }
+
+
+def parser_functions():
+    names = []
+    for parser in (BooksParser, UserParser):
+        for name, value in vars(parser).items():
+            if isinstance(value, staticmethod) and not name.startswith('_'):
+                names.append(f'{parser.__name__}.{name}')
+    return names
+
+
+def calibration() -> None:
+    data = [{'id': i, 'name': f'book-{i}', 'tags': ['a', 'b', 'c']} for i in range(200)]
+    sorted(json.loads(json.dumps(data)), key=lambda item: item['name'])
+
+
+def loops_for(fn, sample_time: float) -> int:
+    fn()
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        if time.perf_counter() - start >= sample_time:
+            return number
+        number *= 2
+
+
+def sample(fn, number: int) -> float:
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        return (time.perf_counter() - start) / number
+    finally:
+        gc.enable()
+
+
+def speed(fn, min_time: float, repeats: int) -> tuple:
+    # Samples of fn alternate with samples of the calibration workload, so
+    # each pair sees the same load on the machine. ops/sec is the fastest
+    # sample; the relative speed is the median of the per-pair ratios, which
+    # a burst of load on one side of a pair cannot move far.
+    sample_time = min_time / repeats
+    number, unit_number = loops_for(fn, sample_time), loops_for(calibration, sample_time)
+    samples, ratios = [], []
+    for _ in range(repeats):
+        unit = sample(calibration, unit_number)
+        samples.append(sample(fn, number))
+        ratios.append(unit / samples[-1])
+    return 1 / min(samples), statistics.median(ratios)
+
+
+def peak_bytes(fn) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run(selected, min_time: float, repeats: int):
+    # Speeds are also stored relative to a fixed pure-Python workload, so a
+    # baseline recorded on one machine stays meaningful on another.
+    results = {}
+    for name, fn in selected.items():
+        ops, relative = speed(fn, min_time, repeats)
+        results[name] = {'ops_per_sec': round(ops, 1), 'relative': round(relative, 6), 'peak_bytes': peak_bytes(fn)}
+    return results
+
+
+def compare(results, baseline, tolerance: float, memory_tolerance: float):
+    failures = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        if result['relative'] < expected['relative'] * (1 - tolerance):
+            failures.append(f"{name}: {result['relative'] / expected['relative']:.0%} of baseline speed")
+        if result['peak_bytes'] > expected['peak_bytes'] * (1 + memory_tolerance) + 1024:
+            failures.append(f"{name}: peak {result['peak_bytes']} B vs {expected['peak_bytes']} B baseline")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backend', default='html.parser')
+    parser.add_argument('--chrome-kb', type=int, default=50,
+                        help='kilobytes of site layout wrapped around each page (default: 50)')
+    parser.add_argument('--min-time', type=float, default=1.0, help='seconds spent timing each case')
+    parser.add_argument('--repeats', type=int, default=15)
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed slowdown (default: 0.25)')
+    parser.add_argument('--memory-tolerance', type=float, default=0.10, help='allowed peak growth (default: 0.10)')
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('-k', '--filter', default='', help='only run cases whose name contains this')
+    args = parser.parse_args(argv)
+
+    set_parser_backend(args.backend)
+    all_cases = cases(args.chrome_kb)
+    missing = [name for name in parser_functions() if name not in all_cases]
+    if missing:
+        print(f"No benchmark for: {', '.join(missing)}", file=sys.stderr)
+        return 2
+
+    selected = {name: fn for name, fn in all_cases.items() if args.filter in name}
+    results = run(selected, args.min_time, args.repeats)
+    settings = {'backend': args.backend, 'chrome_kb': args.chrome_kb}
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print(f"{'case':40} {'ops/sec':>10} {'peak KiB':>10} {'vs baseline':>12}")
+    for name, result in results.items():
+        expected = (baseline or {}).get('results', {}).get(name)
+        change = f"{result['relative'] / expected['relative'] - 1:+.0%}" if expected else '-'
+        print(f"{name:40} {result['ops_per_sec']:>10.1f} {result['peak_bytes'] / 1024:>10.1f} {change:>12}")
+
+    if args.update_baseline:
+        recorded = dict((baseline or {}).get('results', {})) if baseline and baseline.get('settings') == settings else {}
+        recorded.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump({'settings': settings, 'python': platform.python_version(), 'results': recorded}, f, indent=2)
+            f.write('\n')
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("No baseline found; run with --update-baseline to record one.")
+        return 0
+    if baseline.get('settings') != settings:
+        print(f"Baseline was recorded with {baseline.get('settings')}, not {settings}; skipping comparison.")
+        return 0
+
+    failures = compare(results, baseline['results'], args.tolerance, args.memory_tolerance)
+    if failures:
+        print("\nPERFORMANCE REGRESSION", file=sys.stderr)
+        for failure in failures:
+            print(f"  {failure}", file=sys.stderr)
+        return 1
+    print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
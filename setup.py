@@ -13,8 +13,12 @@ setup(
     install_requires=[
         'requests',
         'beautifulsoup4',
-        'selenium',
     ],
+    extras_require={
+        'async': ['httpx'],
+        'lxml': ['lxml'],
+        'brotli': ['brotli'],
+    },
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -1,48 +1,32 @@
 from dotenv import load_dotenv
 import os
-from storygraph_api import Book, User
 import json
+from storygraph_api import Book, User
+from storygraph_api.exceptions import StoryGraphAPIError
+from storygraph_api.metadata import BookStore
+from storygraph_api.models import to_json
+from storygraph_api.notion_sync import NotionRow, NotionSync
 from notion_client import Client
 from datetime import datetime
 
 
-def entry_exists(client, database_id, book_title, author, date, progress_percent):
+def load_cursor(path):
     """
-    Check if the journal entry already exists in the notion database
+    Load the journal cursor saved by the previous run, if there is one.
     """
-    query = client.databases.query(
-        database_id=database_id,
-        filter={
-            "and": [
-                {"property": "Book Title", "title": {"equals": book_title}},
-                {"property": "Author", "rich_text": {"equals": author}},
-                {"property": "Date", "date": {"equals": date}},
-                {"property": "Progress", "number": {"equals": round(progress_percent, 2)}}
-            ]
-        }
-    )
-    results = query['results']
-
-    return results[0] if results else None
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
 
 
-def create_entry(client, database_id, book_title, author, date, progress_percent):
+def save_cursor(path, cursor):
     """
-    Create a new entry for a reading session in the notion database.
+    Save the journal cursor so the next run only fetches newer entries.
     """
-    properties = {
-        "Book Title": {"title": [{"text": {"content": book_title}}]},
-        "Author": {"rich_text": [{"text": {"content": author}}]},
-        "Date": {"date": {"start": date}},
-        "Progress": {"number": round(progress_percent, 2)},
-    }
-
-    page = {
-        "parent": {"database_id": database_id},
-        "properties": properties,
-    }
-    
-    client.pages.create(**page)
+    with open(path, "w") as f:
+        json.dump(cursor, f)
+
 
 def format_date(date_str):
     date_obj = datetime.strptime(date_str, "%d %B %Y")
@@ -67,49 +51,49 @@ def main():
         database_id = os.getenv("NOTION_STORYGRAPH_DB_ID")
         client = Client(auth=notion_token)
     
-        book_client = Book()
-        user_client = User()
-        print("Setup complete.")
-
-        print("\n--- 2. Retrieving currently reading list ---")
-
-        currently_reading = user_client.currently_reading(username, auth_cookies)
-        print(currently_reading)
-        valid_date_entries = []        
-
-        try:
-            print("\nFetching all journal entries...")
-            all_journal_entries = user_client.get_all_journal_entries(auth_cookies)
-            print(all_journal_entries)
-            all_journal_data = json.loads(all_journal_entries)
-            if isinstance(all_journal_data, list):
-                for entry in all_journal_data:
-                    if entry['date'] != "No date":
-                        valid_date_entries.append(entry)
-            else:
-                print(f"Error: All journal entries not returned as a list.")
-        except Exception as e:
-            print(f"Error fetching all journal entries: {e}")
-
-        print(len(valid_date_entries))
-        
-        for entry in valid_date_entries:
-            book_title = entry['book_title']
-            book_id = entry['book_id']
-            date = entry['date']
-            clean_date = format_date(date)
-            progress_percent = entry['progress_percent']
-            if progress_percent is None:
-                progress_percent = 0
-            book_info = eval(book_client.book_info(book_id))
-            author = ", ".join(book_info['authors']) # type: ignore
-            existing_entry = entry_exists(client, database_id, book_title, author, clean_date, progress_percent)
-            if not existing_entry:
-                print(f"creating new entry for {book_title}")
-                create_entry(client, database_id, book_title, author, clean_date, progress_percent)
-            else:
-                print("entry already exists")
-
+        book_store = BookStore(os.getenv("STORYGRAPH_BOOK_STORE", "storygraph-books.sqlite3"))
+        with Book(native=True, store=book_store) as book_client:
+            user_client = User(native=True)
+            print("Setup complete.")
+
+            print("\n--- 2. Retrieving currently reading list ---")
+
+            try:
+                currently_reading = user_client.currently_reading(username, auth_cookies)
+                print(to_json(currently_reading))
+            except StoryGraphAPIError as e:
+                print(f"Error fetching currently reading list: {e}")
+            synced_entries = 0
+
+            cursor_file = os.getenv("STORYGRAPH_CURSOR_FILE", "storygraph-cursor.json")
+            cursor = load_cursor(cursor_file)
+
+            print("\nFetching new journal entries...")
+            try:
+                journal_sync = user_client.sync_journal_entries(auth_cookies, cursor)
+                entries = [entry for entry in journal_sync.entries if entry.date != "No date"]
+                synced_entries = len(entries)
+                book_ids = list(dict.fromkeys(entry.book_id for entry in entries))
+                authors = {}
+                for book_id, book_info in zip(book_ids, book_client.book_metadata_many(book_ids)):
+                    if isinstance(book_info, StoryGraphAPIError):
+                        raise book_info
+                    authors[book_id] = ", ".join(book_info.authors)
+                rows = [NotionRow.of(entry.book_title, authors[entry.book_id], format_date(entry.date), entry.progress_percent)
+                        for entry in entries]
+
+                report = NotionSync(client, database_id).sync(rows)
+                for row in report.created:
+                    print(f"created new entry for {row.title}")
+                print(f"{report.existing} entries already exist")
+                for row, error in report.failed:
+                    print(f"Error creating entry for {row.title}: {error}")
+                if not report.failed:
+                    save_cursor(cursor_file, journal_sync.cursor)
+            except StoryGraphAPIError as e:
+                print(f"Error fetching journal entries: {e}")
+
+            print(synced_entries)
 
 if __name__ == '__main__':
     main()
@@ -1,2 +1,38 @@
-from .books_client import Book
-from .users_client import User
+from importlib import import_module
+
+# Public names resolve on first access, so importing the package does not load
+# requests, httpx or bs4 until a client, transport or parser is actually used.
+_EXPORTS = {
+    'Book': '.books_client', 'AsyncBook': '.books_client',
+    'User': '.users_client', 'AsyncUser': '.users_client',
+    'Transport': '.request.transport', 'AsyncTransport': '.request.transport',
+    'ResponseCache': '.request.cache',
+    'RateLimiter': '.request.ratelimit', 'RetryPolicy': '.request.ratelimit',
+    'ResultCache': '.memo',
+    'BookStore': '.metadata',
+    'JournalIndex': '.journal',
+    'ParsePipeline': '.pipeline',
+    'NotionSync': '.notion_sync', 'NotionRow': '.notion_sync',
+    'MetricsCollector': '.metrics', 'RequestEvent': '.metrics', 'ParseEvent': '.metrics',
+    'add_hook': '.metrics', 'remove_hook': '.metrics',
+    'Tracer': '.tracing', 'trace': '.tracing', 'enable_tracing': '.tracing', 'disable_tracing': '.tracing',
+    'set_parser_backend': '.parse.backend', 'get_parser_backend': '.parse.backend',
+    'set_partial_parsing': '.parse.backend',
+    'BookInfo': '.models', 'BookMetadata': '.models', 'ShelfEntry': '.models', 'JournalEntry': '.models',
+    'ReadDates': '.models', 'SearchResult': '.models',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,36 +1,632 @@
 from storygraph_api.parse.books_parser import BooksParser
-from storygraph_api.exception_handler import handle_exceptions
+from storygraph_api.parse.user_parser import UserParser
+from storygraph_api.request.books_request import BooksScraper
+from storygraph_api.request.user_request import UserScraper
+from storygraph_api.request.transport import Transport, AsyncTransport
+from storygraph_api.exception_handler import handle_exceptions, error_message
+from storygraph_api.exceptions import StoryGraphAPIError, UnexpectedError
+from storygraph_api.pagination import fetch_pages, afetch_pages
+from storygraph_api.memo import ResultCache, MISS, memo_get, memo_set
+from storygraph_api.models import BookInfo, BookMetadata, JournalEntry, ReadDates, SearchResult, encode
+from storygraph_api.metadata import BookStore, StoredBook, METADATA_FIELDS
+from storygraph_api.journal import JournalIndex
+from storygraph_api.singleflight import SingleFlight, AsyncSingleFlight
+from storygraph_api.tracing import span, submit
+import asyncio
+import inspect
 import json
-from typing import Dict
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial, wraps
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Tuple
+
+if TYPE_CHECKING:
+    from storygraph_api.pipeline import ParsePipeline
+
+NO_READ_DATES = {'start_date': None, 'finish_date': None}
+BOOK_FIELDS = ('title', 'authors', 'pages', 'first_pub', 'tags', 'average_rating', 'description', 'warnings', 'cover_url')
+# Everything except average_rating (community reviews) and warnings (content warnings).
+MAIN_PAGE_FIELDS = ('title', 'authors', 'pages', 'first_pub', 'tags', 'description', 'cover_url')
+MISSING = None
+
+
+def _sub_page(parse, result: bytes | BaseException, field: str, errors: Dict[str, str]) -> Any:
+    try:
+        if isinstance(result, BaseException):
+            raise result
+        return parse(result)
+    except Exception as e:
+        errors[field] = error_message(e)
+        return MISSING
+
+
+def _book_fields(fields: List[str] | None) -> Tuple[str, ...]:
+    if fields is None:
+        return BOOK_FIELDS
+    unknown = [field for field in fields if field not in BOOK_FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown book field(s): {', '.join(unknown)}. Choose from: {', '.join(BOOK_FIELDS)}.")
+    return tuple(field for field in BOOK_FIELDS if field in fields)
+
+
+def validate_fields(func):
+    # An unknown field name is a caller error, so it raises ValueError at the
+    # call instead of coming back as an error result from handle_exceptions.
+    signature = inspect.signature(func)
+
+    def check(self, args, kwargs) -> None:
+        _book_fields(signature.bind(self, *args, **kwargs).arguments.get('fields'))
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            check(self, args, kwargs)
+            return await func(self, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(func)
+    def wrapper(self, *args, **kwargs):
+        check(self, args, kwargs)
+        return func(self, *args, **kwargs)
+    return wrapper
+
+
+def _needs_main_page(fields: Tuple[str, ...]) -> bool:
+    return any(field in MAIN_PAGE_FIELDS for field in fields)
+
+
+def _metadata(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {field: data[field] for field in METADATA_FIELDS}
+
+
+def _known_book_page(memo: ResultCache | None, store: BookStore | None, book_id: str,
+                     fields: Tuple[str, ...]) -> Any:
+    data = memo_get(memo, 'book_page', book_id)
+    if data is not MISS:
+        return {field: data[field] for field in fields}
+    if store is not None and all(field in METADATA_FIELDS for field in fields):
+        entry = store.get(book_id)
+        if entry is not None and store.is_fresh(entry):
+            return {field: entry.data[field] for field in fields}
+    return MISS
+
+
+def _page_fields(store: BookStore | None, fields: Tuple[str, ...]) -> Tuple[str, ...] | None:
+    if fields == BOOK_FIELDS:
+        return None
+    # The store only takes complete records, so its fields are always
+    # extracted when there is one; they are cheap next to the description.
+    return fields if store is None else (*fields, *METADATA_FIELDS)
+
+
+def _book_page_data(memo: ResultCache | None, store: BookStore | None, book_id: str,
+                    content: bytes | Dict[str, Any] | None,
+                    reviews: bytes | BaseException | None, warnings: bytes | BaseException | None,
+                    known_warnings: Any, fields: Tuple[str, ...] = BOOK_FIELDS) -> Dict[str, Any]:
+    errors: Dict[str, str] = {}
+    data: Dict[str, Any] = {}
+    if 'average_rating' in fields:
+        data['average_rating'] = _sub_page(BooksParser.average_rating, reviews, 'average_rating', errors)
+    if 'warnings' in fields:
+        if known_warnings is MISS:
+            known_warnings = _sub_page(BooksParser.content_warnings, warnings, 'warnings', errors)
+            if 'warnings' not in errors:
+                memo_set(memo, 'content_warnings', book_id, known_warnings)
+        data['warnings'] = known_warnings
+    if content is not None:
+        # A ParsePipeline hands over the main page already parsed.
+        if not isinstance(content, dict):
+            content = BooksParser.book_page(content, _page_fields(store, fields))
+        data.update(content)
+        if store is not None:
+            store.set(book_id, _metadata(data))
+
+    data = {field: data[field] for field in fields}
+    if errors:
+        data['errors'] = errors
+    elif fields == BOOK_FIELDS:
+        memo_set(memo, 'book_page', book_id, data)
+    return data
+
+
+def _encode_many(book_ids: List[str], results: Dict[str, Dict[str, Any] | BaseException], model: type,
+                 native: bool) -> Any:
+    items = [results[book_id] for book_id in book_ids]
+    if native:
+        return [model(**item) if not isinstance(item, BaseException)
+                else item if isinstance(item, StoryGraphAPIError) else UnexpectedError(error_message(item))
+                for item in items]
+    return json.dumps([{"error": error_message(item)} if isinstance(item, BaseException) else item
+                       for item in items], indent=4)
+
+
+async def _limited(semaphore: asyncio.Semaphore | None, fetch) -> bytes:
+    if semaphore is None:
+        return await fetch
+    async with semaphore:
+        return await fetch
+
+
+def _limited_call(semaphore: threading.Semaphore | None, fetch: Callable[..., bytes], *args: Any) -> bytes:
+    if semaphore is None:
+        return fetch(*args)
+    with semaphore:
+        return fetch(*args)
+
+
+def _account_key(cookies: Dict[str, str] | None) -> Tuple:
+    return tuple(sorted((cookies or {}).items()))
+
+
+def _result(future) -> bytes | BaseException | None:
+    if future is None:
+        return None
+    try:
+        return future.result()
+    except Exception as e:
+        return e
 
 class Book:
+    def __init__(self, transport: Transport | None = None, page_window: int = 1,
+                 memo: ResultCache | None = None, native: bool = False, store: BookStore | None = None,
+                 pipeline: 'ParsePipeline | None' = None, max_workers: int = 16):
+        self.page_window = page_window
+        self.memo = memo
+        self.native = native
+        self.store = store
+        self.pipeline = pipeline
+        self.scraper = BooksScraper(transport)
+        self.user_scraper = UserScraper(self.scraper.transport)
+        self._journal_indexes: Dict[Tuple, JournalIndex] = {}
+        # One lock per account, so building one account's index never holds
+        # up another account's lookups.
+        self._journal_locks: Dict[Tuple, threading.Lock] = {}
+        self._journal_locks_lock = threading.Lock()
+        self._flight = SingleFlight()
+        # Sub-pages (community reviews, content warnings) are fetched on this
+        # pool while the calling thread fetches the main page. It is created
+        # on first use, so clients that never fetch a book page own no threads.
+        self.max_workers = max(1, max_workers)
+        self._executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='storygraph-book')
+            return self._executor
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> 'Book':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _book_page(self, book_id: str, fields: Tuple[str, ...] = BOOK_FIELDS,
+                   semaphore: threading.Semaphore | None = None) -> Dict[str, Any]:
+        data = _known_book_page(self.memo, self.store, book_id, fields)
+        if data is not MISS:
+            return data
+        return self._flight.do(('book_page', book_id, fields), lambda: self._load_book_page(book_id, fields, semaphore))
+
+    def _load_book_page(self, book_id: str, fields: Tuple[str, ...],
+                        semaphore: threading.Semaphore | None) -> Dict[str, Any]:
+        reviews, warnings, known_warnings = self._submit_sub_pages(book_id, fields, semaphore)
+        try:
+            content = self._main_page(book_id, fields, semaphore) if _needs_main_page(fields) else None
+        except BaseException:
+            for future in (reviews, warnings):
+                if future is not None:
+                    future.cancel()
+            raise
+        return _book_page_data(self.memo, self.store, book_id, content, _result(reviews), _result(warnings),
+                               known_warnings, fields)
+
+    def _main_page(self, book_id: str, fields: Tuple[str, ...],
+                   semaphore: threading.Semaphore | None) -> bytes | Dict[str, Any]:
+        if self.pipeline is None:
+            return _limited_call(semaphore, self.scraper.main, book_id)
+        parse = partial(BooksParser.book_page, fields=_page_fields(self.store, fields))
+        return self.pipeline.submit(partial(_limited_call, semaphore, self.scraper.main), parse, book_id).result()
+
+    def _submit_sub_pages(self, book_id: str, fields: Tuple[str, ...],
+                          semaphore: threading.Semaphore | None) -> Tuple[Future | None, Future | None, Any]:
+        known_warnings = memo_get(self.memo, 'content_warnings', book_id)
+        reviews = None
+        if 'average_rating' in fields:
+            reviews = submit(self._pool(), _limited_call, semaphore, self.scraper.community_reviews, book_id)
+        warnings = None
+        if 'warnings' in fields and known_warnings is MISS:
+            warnings = submit(self._pool(), _limited_call, semaphore, self.scraper.content_warnings, book_id)
+        return reviews, warnings, known_warnings
+
+    @validate_fields
     @handle_exceptions
-    def book_info(self, book_id: str) -> str:
-        data = BooksParser.book_page(book_id)
-        return json.dumps(data, indent=4)
+    def book_info(self, book_id: str, fields: List[str] | None = None) -> str:
+        data = self._book_page(book_id, _book_fields(fields))
+        return encode(data, BookInfo, self.native)
+
+    @validate_fields
+    @handle_exceptions
+    def book_info_many(self, book_ids: List[str], max_concurrency: int = 8, fields: List[str] | None = None):
+        # Each book goes through the same flight as book_info, so a concurrent
+        # lookup of the same book shares one fetch. At most max_concurrency
+        # books are in progress ahead of the one being collected, so memory
+        # stays flat however long the list is, and at most max_concurrency
+        # requests are in flight.
+        fields = _book_fields(fields)
+        max_concurrency = max(1, max_concurrency)
+        semaphore = threading.Semaphore(max_concurrency)
+        results: Dict[str, Any] = {}
+        pending: deque = deque()
+        with ThreadPoolExecutor(max_workers=max_concurrency) as pool:
+            for book_id in dict.fromkeys(book_ids):
+                pending.append((book_id, submit(pool, self._book_page, book_id, fields, semaphore)))
+                if len(pending) > max_concurrency:
+                    done_id, future = pending.popleft()
+                    results[done_id] = _result(future)
+            for book_id, future in pending:
+                results[book_id] = _result(future)
+        return _encode_many(book_ids, results, BookInfo, self.native)
+
+    def _book_metadata(self, book_id: str, entry: StoredBook | None) -> Dict[str, Any]:
+        if entry is not None and self.store.is_fresh(entry):
+            return entry.data
+        data = memo_get(self.memo, 'book_page', book_id)
+        try:
+            if data is MISS:
+                data = self._flight.do(('metadata', book_id),
+                                       lambda: BooksParser.book_page(self.scraper.main(book_id), METADATA_FIELDS))
+        except Exception:
+            # An outdated record beats none when StoryGraph cannot be reached.
+            if entry is None:
+                raise
+            return entry.data
+        data = _metadata(data)
+        if self.store is not None:
+            self.store.set(book_id, data)
+        return data
+
+    @handle_exceptions
+    def book_metadata(self, book_id: str) -> str:
+        entry = self.store.get(book_id) if self.store is not None else None
+        return encode(self._book_metadata(book_id, entry), BookMetadata, self.native)
+
+    @handle_exceptions
+    def book_metadata_many(self, book_ids: List[str], max_concurrency: int = 8):
+        stored = self.store.get_many(book_ids) if self.store is not None else {}
+        results: Dict[str, Any] = {book_id: entry.data for book_id, entry in stored.items() if self.store.is_fresh(entry)}
+        missing = [book_id for book_id in dict.fromkeys(book_ids) if book_id not in results]
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as pool:
+            futures = [(book_id, submit(pool, self._book_metadata, book_id, stored.get(book_id))) for book_id in missing]
+            for book_id, future in futures:
+                results[book_id] = _result(future)
+        return _encode_many(book_ids, results, BookMetadata, self.native)
 
     @handle_exceptions
     def reading_progress(self, book_id: str, cookies: Dict[str, str]) -> str:
-        progress = BooksParser.reading_progress(book_id, cookies)
+        content = self.scraper.book_page_authenticated(book_id, cookies)
+        progress = BooksParser.reading_progress(content)
+        if self.native:
+            return progress
         data = {"progress": progress}
         return json.dumps(data, indent=4)
 
+    def _all_journal_entries(self, cookies: Dict[str, str]) -> List[Dict[str, Any]]:
+        fetch_page = lambda page: self.user_scraper.all_journal_entries(cookies, page)
+        if self.pipeline is not None:
+            return [entry for entries in self.pipeline.pages(fetch_page, UserParser.all_journal_entries)
+                    for entry in entries]
+        return fetch_pages(fetch_page, UserParser.all_journal_entries, self.page_window)
+
+    def _journal_lock(self, key: Tuple) -> threading.Lock:
+        with self._journal_locks_lock:
+            return self._journal_locks.setdefault(key, threading.Lock())
+
+    def journal_index(self, cookies: Dict[str, str], refresh: bool = False) -> JournalIndex:
+        key = _account_key(cookies)
+        with self._journal_lock(key):
+            index = self._journal_indexes.get(key)
+            if index is None or refresh:
+                with span('journal_index.build'):
+                    index = JournalIndex(self._all_journal_entries(cookies))
+                self._journal_indexes[key] = index
+            return index
+
+    def use_journal_index(self, cookies: Dict[str, str], index: JournalIndex) -> None:
+        # Taken under the account's build lock so a build already running
+        # cannot overwrite the index handed in here.
+        key = _account_key(cookies)
+        with self._journal_lock(key):
+            self._journal_indexes[key] = index
+
+    def _read_dates(self, book_id: str, cookies: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            index = self.journal_index(cookies)
+            return index.read_dates(book_id)
+        except Exception:
+            pass
+        with span('read_dates.book_page_fallback'):
+            return self._read_dates_from_book_page(book_id, cookies)
+
+    def _read_dates_from_book_page(self, book_id: str, cookies: Dict[str, str]) -> Dict[str, Any]:
+        content = self.scraper.book_page_authenticated(book_id, cookies)
+        edit_link = BooksParser.read_dates_edit_link(content)
+        if edit_link is None:
+            return dict(NO_READ_DATES)
+
+        id_type, id_val = edit_link
+        try:
+            if id_type == 'read_instance':
+                form_content = self.scraper.get_read_dates_form(book_id, id_val, cookies)
+            else:
+                form_content = self.scraper.get_journal_entry_form(book_id, id_val, cookies)
+        except Exception:
+            return dict(NO_READ_DATES)
+
+        if not form_content:
+            return dict(NO_READ_DATES)
+        return BooksParser.read_dates_form(form_content, id_type)
+
     @handle_exceptions
     def get_read_dates(self, book_id: str, cookies: Dict[str, str]) -> str:
-        data = BooksParser.get_read_dates(book_id, cookies)
+        data = self._read_dates(book_id, cookies)
+        return encode(data, ReadDates, self.native)
+
+    @handle_exceptions
+    def get_read_dates_many(self, book_ids: List[str], cookies: Dict[str, str]):
+        try:
+            index = self.journal_index(cookies)
+        except Exception:
+            index = None
+
+        data = {}
+        for book_id in dict.fromkeys(book_ids):
+            if index is not None:
+                data[book_id] = index.read_dates(book_id)
+            else:
+                data[book_id] = self._read_dates_from_book_page(book_id, cookies)
+        if self.native:
+            return {book_id: ReadDates(**dates) for book_id, dates in data.items()}
         return json.dumps(data, indent=4)
 
     @handle_exceptions
     def get_ai_summary(self, book_id: str, user_id: str) -> str:
-        data = BooksParser.get_ai_summary(book_id, user_id)
+        data = memo_get(self.memo, 'get_ai_summary', (book_id, user_id))
+        if data is MISS:
+            content = self.scraper.get_ai_summary(book_id, user_id)
+            data = BooksParser.get_ai_summary(content)
+            memo_set(self.memo, 'get_ai_summary', (book_id, user_id), data)
+        if self.native:
+            return data['summary']
         return json.dumps(data, indent=4)
 
     @handle_exceptions
     def get_journal_entries(self, book_id: str, cookies: Dict[str, str]) -> str:
-        data = BooksParser.journal_entries(book_id, cookies)
-        return json.dumps(data, indent=4)
+        content = self.scraper.get_journal_page(book_id, cookies)
+        data = BooksParser.journal_entries(content)
+        return encode(data, JournalEntry, self.native)
 
     @handle_exceptions
     def search(self, query: str) -> str:
-        data = BooksParser.search(query)
+        data = memo_get(self.memo, 'search', query)
+        if data is MISS:
+            content = self.scraper.search(query)
+            data = BooksParser.search(content)
+            memo_set(self.memo, 'search', query, data)
+        return encode(data, SearchResult, self.native)
+
+
+class AsyncBook:
+    def __init__(self, transport: AsyncTransport | None = None, page_window: int = 1,
+                 memo: ResultCache | None = None, native: bool = False, store: BookStore | None = None):
+        self.page_window = page_window
+        self.memo = memo
+        self.native = native
+        self.store = store
+        self._owns_transport = transport is None
+        self.transport = transport or AsyncTransport()
+        self.scraper = BooksScraper(self.transport)
+        self.user_scraper = UserScraper(self.transport)
+        self._journal_indexes: Dict[Tuple, JournalIndex] = {}
+        self._journal_locks: Dict[Tuple, asyncio.Lock] = {}
+        self._flight = AsyncSingleFlight()
+
+    async def aclose(self) -> None:
+        if self._owns_transport:
+            await self.transport.aclose()
+
+    async def __aenter__(self) -> 'AsyncBook':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def _book_page(self, book_id: str, fields: Tuple[str, ...] = BOOK_FIELDS,
+                         semaphore: asyncio.Semaphore | None = None) -> Dict[str, Any]:
+        data = _known_book_page(self.memo, self.store, book_id, fields)
+        if data is not MISS:
+            return data
+        return await self._flight.do(('book_page', book_id, fields),
+                                     lambda: self._load_book_page(book_id, fields, semaphore))
+
+    async def _load_book_page(self, book_id: str, fields: Tuple[str, ...],
+                              semaphore: asyncio.Semaphore | None) -> Dict[str, Any]:
+        known_warnings = memo_get(self.memo, 'content_warnings', book_id)
+        fetches = {}
+        if _needs_main_page(fields):
+            fetches['main'] = _limited(semaphore, self.scraper.main(book_id))
+        if 'average_rating' in fields:
+            fetches['reviews'] = _limited(semaphore, self.scraper.community_reviews(book_id))
+        if 'warnings' in fields and known_warnings is MISS:
+            fetches['warnings'] = _limited(semaphore, self.scraper.content_warnings(book_id))
+        results = dict(zip(fetches, await asyncio.gather(*fetches.values(), return_exceptions=True)))
+        if isinstance(results.get('main'), BaseException):
+            raise results['main']
+        return _book_page_data(self.memo, self.store, book_id, results.get('main'), results.get('reviews'),
+                               results.get('warnings'), known_warnings, fields)
+
+    @validate_fields
+    @handle_exceptions
+    async def book_info(self, book_id: str, fields: List[str] | None = None) -> str:
+        data = await self._book_page(book_id, _book_fields(fields))
+        return encode(data, BookInfo, self.native)
+
+    @validate_fields
+    @handle_exceptions
+    async def book_info_many(self, book_ids: List[str], max_concurrency: int = 8, fields: List[str] | None = None):
+        fields = _book_fields(fields)
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        unique_ids = list(dict.fromkeys(book_ids))
+        pages = await asyncio.gather(*(self._book_page(book_id, fields, semaphore) for book_id in unique_ids),
+                                     return_exceptions=True)
+        return _encode_many(book_ids, dict(zip(unique_ids, pages)), BookInfo, self.native)
+
+    async def _book_metadata(self, book_id: str, entry: StoredBook | None,
+                             semaphore: asyncio.Semaphore | None = None) -> Dict[str, Any]:
+        if entry is not None and self.store.is_fresh(entry):
+            return entry.data
+        data = memo_get(self.memo, 'book_page', book_id)
+        try:
+            if data is MISS:
+                data = await self._flight.do(('metadata', book_id), lambda: self._load_metadata(book_id, semaphore))
+        except Exception:
+            if entry is None:
+                raise
+            return entry.data
+        data = _metadata(data)
+        if self.store is not None:
+            self.store.set(book_id, data)
+        return data
+
+    async def _load_metadata(self, book_id: str, semaphore: asyncio.Semaphore | None) -> Dict[str, Any]:
+        return BooksParser.book_page(await _limited(semaphore, self.scraper.main(book_id)), METADATA_FIELDS)
+
+    @handle_exceptions
+    async def book_metadata(self, book_id: str) -> str:
+        entry = self.store.get(book_id) if self.store is not None else None
+        return encode(await self._book_metadata(book_id, entry), BookMetadata, self.native)
+
+    @handle_exceptions
+    async def book_metadata_many(self, book_ids: List[str], max_concurrency: int = 8):
+        stored = self.store.get_many(book_ids) if self.store is not None else {}
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        unique_ids = list(dict.fromkeys(book_ids))
+        results = await asyncio.gather(*(self._book_metadata(book_id, stored.get(book_id), semaphore)
+                                         for book_id in unique_ids), return_exceptions=True)
+        return _encode_many(book_ids, dict(zip(unique_ids, results)), BookMetadata, self.native)
+
+    @handle_exceptions
+    async def reading_progress(self, book_id: str, cookies: Dict[str, str]) -> str:
+        content = await self.scraper.book_page_authenticated(book_id, cookies)
+        progress = BooksParser.reading_progress(content)
+        if self.native:
+            return progress
+        data = {"progress": progress}
         return json.dumps(data, indent=4)
+
+    async def _all_journal_entries(self, cookies: Dict[str, str]) -> List[Dict[str, Any]]:
+        return await afetch_pages(lambda page: self.user_scraper.all_journal_entries(cookies, page),
+                                  UserParser.all_journal_entries, self.page_window)
+
+    def _journal_lock(self, key: Tuple) -> asyncio.Lock:
+        return self._journal_locks.setdefault(key, asyncio.Lock())
+
+    async def journal_index(self, cookies: Dict[str, str], refresh: bool = False) -> JournalIndex:
+        key = _account_key(cookies)
+        async with self._journal_lock(key):
+            index = self._journal_indexes.get(key)
+            if index is None or refresh:
+                with span('journal_index.build'):
+                    index = JournalIndex(await self._all_journal_entries(cookies))
+                self._journal_indexes[key] = index
+            return index
+
+    async def use_journal_index(self, cookies: Dict[str, str], index: JournalIndex) -> None:
+        key = _account_key(cookies)
+        async with self._journal_lock(key):
+            self._journal_indexes[key] = index
+
+    async def _read_dates(self, book_id: str, cookies: Dict[str, str]) -> Dict[str, Any]:
+        try:
+            index = await self.journal_index(cookies)
+            return index.read_dates(book_id)
+        except Exception:
+            pass
+        with span('read_dates.book_page_fallback'):
+            return await self._read_dates_from_book_page(book_id, cookies)
+
+    async def _read_dates_from_book_page(self, book_id: str, cookies: Dict[str, str]) -> Dict[str, Any]:
+        content = await self.scraper.book_page_authenticated(book_id, cookies)
+        edit_link = BooksParser.read_dates_edit_link(content)
+        if edit_link is None:
+            return dict(NO_READ_DATES)
+
+        id_type, id_val = edit_link
+        try:
+            if id_type == 'read_instance':
+                form_content = await self.scraper.get_read_dates_form(book_id, id_val, cookies)
+            else:
+                form_content = await self.scraper.get_journal_entry_form(book_id, id_val, cookies)
+        except Exception:
+            return dict(NO_READ_DATES)
+
+        if not form_content:
+            return dict(NO_READ_DATES)
+        return BooksParser.read_dates_form(form_content, id_type)
+
+    @handle_exceptions
+    async def get_read_dates(self, book_id: str, cookies: Dict[str, str]) -> str:
+        data = await self._read_dates(book_id, cookies)
+        return encode(data, ReadDates, self.native)
+
+    @handle_exceptions
+    async def get_read_dates_many(self, book_ids: List[str], cookies: Dict[str, str]):
+        try:
+            index = await self.journal_index(cookies)
+        except Exception:
+            index = None
+
+        data = {}
+        for book_id in dict.fromkeys(book_ids):
+            if index is not None:
+                data[book_id] = index.read_dates(book_id)
+            else:
+                data[book_id] = await self._read_dates_from_book_page(book_id, cookies)
+        if self.native:
+            return {book_id: ReadDates(**dates) for book_id, dates in data.items()}
+        return json.dumps(data, indent=4)
+
+    @handle_exceptions
+    async def get_ai_summary(self, book_id: str, user_id: str) -> str:
+        data = memo_get(self.memo, 'get_ai_summary', (book_id, user_id))
+        if data is MISS:
+            content = await self.scraper.get_ai_summary(book_id, user_id)
+            data = BooksParser.get_ai_summary(content)
+            memo_set(self.memo, 'get_ai_summary', (book_id, user_id), data)
+        if self.native:
+            return data['summary']
+        return json.dumps(data, indent=4)
+
+    @handle_exceptions
+    async def get_journal_entries(self, book_id: str, cookies: Dict[str, str]) -> str:
+        content = await self.scraper.get_journal_page(book_id, cookies)
+        data = BooksParser.journal_entries(content)
+        return encode(data, JournalEntry, self.native)
+
+    @handle_exceptions
+    async def search(self, query: str) -> str:
+        data = memo_get(self.memo, 'search', query)
+        if data is MISS:
+            content = await self.scraper.search(query)
+            data = BooksParser.search(content)
+            memo_set(self.memo, 'search', query, data)
+        return encode(data, SearchResult, self.native)
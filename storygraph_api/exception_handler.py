@@ -1,30 +1,99 @@
 import json
-import requests
+import inspect
+import sys
 from functools import wraps
-from storygraph_api.exceptions import RequestError, ParsingError, UnexpectedError
-from selenium.common.exceptions import WebDriverException
+from storygraph_api.exceptions import StoryGraphAPIError, RequestError, ParsingError, UnexpectedError
+from storygraph_api.tracing import span
+
+def _network_errors():
+    # Only a client library that has been imported can have raised, so neither
+    # is imported here just to build the tuple.
+    errors = ()
+    if 'requests' in sys.modules:
+        errors += (sys.modules['requests'].RequestException,)
+    if 'httpx' in sys.modules:
+        errors += (sys.modules['httpx'].HTTPError,)
+    return errors
+
+def error_message(e):
+    if isinstance(e, (RequestError, ParsingError)):
+        return e.message
+    unexpected_error = UnexpectedError(f"An unexpected error occurred: {str(e)}")
+    return unexpected_error.message
+
+def _error_json(e):
+    return json.dumps({"error": error_message(e)}, indent=4)
+
+def _request_error(e):
+    return RequestError(f"A network error occurred: {str(e)}")
 
 def handle_exceptions(func):
+    # Clients created with native=True raise typed exceptions instead of
+    # returning the error as a JSON string.
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(self, *args, **kwargs):
+            try:
+                with span(f"{type(self).__name__}.{func.__name__}", 'client'):
+                    return await func(self, *args, **kwargs)
+            except Exception as e:
+                if not getattr(self, 'native', False):
+                    return _error_json(e)
+                if isinstance(e, StoryGraphAPIError):
+                    raise
+                raise UnexpectedError(error_message(e)) from e
+        return async_wrapper
+
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(self, *args, **kwargs):
         try:
-            return func(*args, **kwargs)
-        except (RequestError, ParsingError) as e:
-            return json.dumps({"error": e.message}, indent=4)
+            with span(f"{type(self).__name__}.{func.__name__}", 'client'):
+                return func(self, *args, **kwargs)
         except Exception as e:
-            unexpected_error = UnexpectedError(f"An unexpected error occurred: {str(e)}")
-            return json.dumps({"error": unexpected_error.message}, indent=4)
+            if not getattr(self, 'native', False):
+                return _error_json(e)
+            if isinstance(e, StoryGraphAPIError):
+                raise
+            raise UnexpectedError(error_message(e)) from e
     return wrapper
 
 def request_exception(func):
+    # Streamed bodies fail while they are being read, so generators are
+    # wrapped around their iteration rather than their creation.
+    if inspect.isasyncgenfunction(func):
+        @wraps(func)
+        async def async_gen_wrapper(*args, **kwargs):
+            try:
+                async for item in func(*args, **kwargs):
+                    yield item
+            except _network_errors() as e:
+                raise _request_error(e) from e
+        return async_gen_wrapper
+
+    if inspect.isgeneratorfunction(func):
+        @wraps(func)
+        def gen_wrapper(*args, **kwargs):
+            try:
+                yield from func(*args, **kwargs)
+            except _network_errors() as e:
+                raise _request_error(e) from e
+        return gen_wrapper
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                return await func(*args, **kwargs)
+            except _network_errors() as e:
+                raise _request_error(e) from e
+        return async_wrapper
+
     @wraps(func)
     def wrapper(*args, **kwargs):
         try:
             return func(*args, **kwargs)
-        except requests.RequestException as e:
-            raise RequestError(f"A network error occurred: {str(e)}") from e
-        except WebDriverException as e:
-            raise RequestError(f"A browser automation error occurred: {str(e)}") from e
+        except _network_errors() as e:
+            raise _request_error(e) from e
     return wrapper
 
 def parsing_exception(func):
@@ -0,0 +1,89 @@
+import hashlib
+import json
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping
+from storygraph_api.parse.books_parser import BooksParser
+
+IDENTITY_FIELDS = ('book_id', 'date', 'status', 'progress_percent', 'pages_read_this_session', 'total_pages_read', 'note')
+
+
+def entry_key(entry: Mapping[str, Any]) -> str:
+    identity = [entry.get(field) for field in IDENTITY_FIELDS]
+    return hashlib.sha1(json.dumps(identity).encode()).hexdigest()[:16]
+
+
+def entry_date(entry: Mapping[str, Any]) -> date | None:
+    try:
+        return datetime.strptime(entry.get('date') or '', '%d %B %Y').date()
+    except ValueError:
+        return None
+
+
+def reached_cursor(cursor: Mapping[str, Any] | None) -> Callable[[Mapping[str, Any]], bool]:
+    # The journal lists the newest entries first, so everything before the
+    # first known entry, or the first entry older than the cursor, is new.
+    known = set((cursor or {}).get('keys', []))
+    since = date.fromisoformat(cursor['date']) if cursor and cursor.get('date') else None
+
+    def reached(entry: Mapping[str, Any]) -> bool:
+        if entry_key(entry) in known:
+            return True
+        day = entry_date(entry)
+        return since is not None and day is not None and day < since
+    return reached
+
+
+def new_entries(entries: Iterable[Dict[str, Any]], cursor: Mapping[str, Any] | None) -> Iterator[Dict[str, Any]]:
+    reached = reached_cursor(cursor)
+    for entry in entries:
+        if reached(entry):
+            return
+        yield entry
+
+
+def advance_cursor(cursor: Mapping[str, Any] | None, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    # The cursor remembers the newest journal date seen and the identity of
+    # every entry on that date.
+    cursor = dict(cursor or {})
+    newest = date.fromisoformat(cursor['date']) if cursor.get('date') else None
+    keys = set(cursor.get('keys', []))
+    for entry in entries:
+        day = entry_date(entry)
+        if day is None:
+            continue
+        if newest is None or day > newest:
+            newest = day
+            keys = set()
+        if day == newest:
+            keys.add(entry_key(entry))
+    return {'date': newest.isoformat() if newest else None, 'keys': sorted(keys)}
+
+
+class JournalIndex:
+    def __init__(self, entries: Iterable[Dict[str, Any]] = ()):
+        self.entries: List[Dict[str, Any]] = list(entries)
+        self._by_book: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for entry in self.entries:
+            self._by_book[entry.get('book_id')].append(entry)
+
+    def entries_for(self, book_id: str) -> List[Dict[str, Any]]:
+        return self._by_book.get(book_id, [])
+
+    def read_dates(self, book_id: str) -> Dict[str, Any]:
+        return BooksParser.read_dates_from_journal(self.entries_for(book_id), book_id)
+
+    def __contains__(self, book_id: str) -> bool:
+        return book_id in self._by_book
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def save(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.entries, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'JournalIndex':
+        with open(path) as f:
+            return cls(json.load(f))
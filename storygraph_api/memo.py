@@ -0,0 +1,88 @@
+import copy
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Hashable, Mapping
+
+DEFAULT_RESULT_TTLS = {
+    'book_page': 60 * 60,
+    'content_warnings': 24 * 60 * 60,
+    'search': 10 * 60,
+    'get_ai_summary': 24 * 60 * 60,
+    'get_user_id': 24 * 60 * 60,
+}
+
+MISS = object()
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 1024, ttls: Mapping[str, float] | None = None,
+                 default_ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttls = dict(DEFAULT_RESULT_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits: Dict[str, int] = defaultdict(int)
+        self._misses: Dict[str, int] = defaultdict(int)
+
+    def get(self, method: str, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get((method, key))
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[(method, key)]
+                entry = None
+            if entry is None:
+                self._misses[method] += 1
+                return MISS
+            self._entries.move_to_end((method, key))
+            self._hits[method] += 1
+        # Callers get their own copy so mutating a result never corrupts the cache.
+        return copy.deepcopy(entry[1])
+
+    def set(self, method: str, key: Hashable, value: Any) -> None:
+        ttl = self.ttls.get(method, self.default_ttl)
+        if ttl is None or ttl <= 0 or self.max_entries <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[(method, key)] = (expires_at, value)
+            self._entries.move_to_end((method, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, method: str | None = None, key: Hashable = MISS) -> None:
+        with self._lock:
+            if method is None:
+                self._entries.clear()
+            elif key is not MISS:
+                self._entries.pop((method, key), None)
+            else:
+                for entry_key in [k for k in self._entries if k[0] == method]:
+                    del self._entries[entry_key]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            methods = set(self._hits) | set(self._misses)
+            return {method: {'hits': self._hits[method], 'misses': self._misses[method]} for method in sorted(methods)}
+
+    @property
+    def hits(self) -> int:
+        return sum(self._hits.values())
+
+    @property
+    def misses(self) -> int:
+        return sum(self._misses.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def memo_get(memo: ResultCache | None, method: str, key: Hashable) -> Any:
+    return memo.get(method, key) if memo is not None else MISS
+
+
+def memo_set(memo: ResultCache | None, method: str, key: Hashable, value: Any) -> None:
+    if memo is not None:
+        memo.set(method, key, value)
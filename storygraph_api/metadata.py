@@ -0,0 +1,91 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, Mapping, NamedTuple
+
+METADATA_FIELDS = ('title', 'authors', 'pages', 'first_pub', 'tags', 'cover_url')
+# Titles, authors and covers almost never change once a book is listed.
+DEFAULT_MAX_AGE = 30 * 24 * 60 * 60
+
+
+class StoredBook(NamedTuple):
+    data: Dict[str, Any]
+    stored_at: float
+
+
+def _row(book_id: str, data: Mapping[str, Any], stored_at: float) -> tuple:
+    return (book_id, data['title'], json.dumps(data['authors']), data['pages'], data['first_pub'],
+            json.dumps(data['tags']), data['cover_url'], stored_at)
+
+
+def _stored(row: tuple) -> StoredBook:
+    title, authors, pages, first_pub, tags, cover_url, stored_at = row
+    return StoredBook({'title': title, 'authors': json.loads(authors), 'pages': pages, 'first_pub': first_pub,
+                       'tags': json.loads(tags), 'cover_url': cover_url}, stored_at)
+
+
+class BookStore:
+    def __init__(self, path: str, max_age: float | None = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS books ("
+            "book_id TEXT PRIMARY KEY, title TEXT, authors TEXT NOT NULL, pages TEXT, first_pub TEXT, "
+            "tags TEXT NOT NULL, cover_url TEXT, stored_at REAL NOT NULL)"
+        )
+
+    def get(self, book_id: str) -> StoredBook | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT title, authors, pages, first_pub, tags, cover_url, stored_at FROM books WHERE book_id = ?",
+                (book_id,),
+            ).fetchone()
+        return _stored(row) if row else None
+
+    def get_many(self, book_ids: Iterable[str]) -> Dict[str, StoredBook]:
+        book_ids = list(dict.fromkeys(book_ids))
+        found: Dict[str, StoredBook] = {}
+        # SQLite caps the number of bound parameters, so look ids up in chunks.
+        for start in range(0, len(book_ids), 500):
+            chunk = book_ids[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT book_id, title, authors, pages, first_pub, tags, cover_url, stored_at FROM books "
+                    f"WHERE book_id IN ({', '.join('?' * len(chunk))})", chunk,
+                ).fetchall()
+            found.update((row[0], _stored(row[1:])) for row in rows)
+        return found
+
+    def set(self, book_id: str, data: Mapping[str, Any]) -> None:
+        self.set_many({book_id: data})
+
+    def set_many(self, books: Mapping[str, Mapping[str, Any]]) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO books (book_id, title, authors, pages, first_pub, tags, cover_url, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [_row(book_id, data, now) for book_id, data in books.items()],
+            )
+
+    def is_fresh(self, entry: StoredBook) -> bool:
+        return self.max_age is None or time.time() - entry.stored_at < self.max_age
+
+    def invalidate(self, book_id: str | None = None) -> None:
+        with self._lock:
+            if book_id is None:
+                self._conn.execute("DELETE FROM books")
+            else:
+                self._conn.execute("DELETE FROM books WHERE book_id = ?", (book_id,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM books").fetchone()[0]
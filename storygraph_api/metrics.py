@@ -0,0 +1,221 @@
+import bisect
+import re
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import urlsplit
+from storygraph_api.tracing import span, tracing_enabled
+
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+DEFAULT_PARSE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Compiled on first use by re's own cache rather than at import.
+URL_TEMPLATES = (
+    (r'/books/[^/]+/community_reviews', '/books/{id}/community_reviews'),
+    (r'/books/[^/]+/content_warnings', '/books/{id}/content_warnings'),
+    (r'/books/[^/]+', '/books/{id}'),
+    (r'/profile/[^/]+', '/profile/{user}'),
+    (r'/(books-read|to-read|currently-reading)/[^/]+', r'/\1/{user}'),
+)
+
+
+@dataclass(slots=True)
+class RequestEvent:
+    method: str
+    endpoint: str
+    url: str
+    status: int | None
+    duration: float
+    bytes: int
+    retries: int = 0
+    cache: str | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class ParseEvent:
+    parser: str
+    duration: float
+    cpu_time: float
+    bytes: int
+    error: str | None = None
+
+
+_hooks: List[Callable[[Any], None]] = []
+_hooks_lock = threading.Lock()
+
+
+def add_hook(callback: Callable[[Any], None]) -> Callable[[Any], None]:
+    global _hooks
+    with _hooks_lock:
+        # Copy on write, so emitting never needs the lock.
+        _hooks = _hooks + [callback]
+    return callback
+
+
+def remove_hook(callback: Callable[[Any], None]) -> None:
+    global _hooks
+    with _hooks_lock:
+        _hooks = [hook for hook in _hooks if hook is not callback]
+
+
+def hooks_enabled() -> bool:
+    return bool(_hooks)
+
+
+def emit(event: Any) -> None:
+    for hook in _hooks:
+        hook(event)
+
+
+def url_template(url: str) -> str:
+    path = urlsplit(url).path or '/'
+    for pattern, template in URL_TEMPLATES:
+        if re.fullmatch(pattern, path):
+            return re.sub(pattern, template, path)
+    return path
+
+
+def parse_metrics(func: Callable) -> Callable:
+    name = func.__qualname__
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _hooks and not tracing_enabled():
+            return func(*args, **kwargs)
+        with span(name, 'parse'):
+            if not _hooks:
+                return func(*args, **kwargs)
+            return _measured_parse(func, name, args, kwargs)
+    return wrapper
+
+
+def _measured_parse(func: Callable, name: str, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+    content = args[0] if args else None
+    size = len(content) if isinstance(content, (bytes, str)) else 0
+    start, cpu_start = time.perf_counter(), time.thread_time()
+    error = None
+    try:
+        return func(*args, **kwargs)
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        emit(ParseEvent(name, time.perf_counter() - start, time.thread_time() - cpu_start, size, error))
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'sum', 'count')
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _labels(**labels: Any) -> str:
+    def escape(value: Any) -> str:
+        return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+    return '{' + ','.join(f'{name}="{escape(value)}"' for name, value in labels.items()) + '}'
+
+
+class MetricsCollector:
+    def __init__(self, latency_buckets: Tuple[float, ...] = DEFAULT_LATENCY_BUCKETS,
+                 parse_buckets: Tuple[float, ...] = DEFAULT_PARSE_BUCKETS):
+        self.latency_buckets = tuple(latency_buckets)
+        self.parse_buckets = tuple(parse_buckets)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._requests: Dict[Tuple, int] = defaultdict(int)
+            self._latency: Dict[str, _Histogram] = {}
+            self._bytes: Dict[str, int] = defaultdict(int)
+            self._retries: Dict[str, int] = defaultdict(int)
+            self._cache: Dict[Tuple, int] = defaultdict(int)
+            self._parses: Dict[Tuple, int] = defaultdict(int)
+            self._parse_time: Dict[str, _Histogram] = {}
+            self._parse_cpu: Dict[str, float] = defaultdict(float)
+
+    def __call__(self, event: Any) -> None:
+        if isinstance(event, RequestEvent):
+            self._request(event)
+        elif isinstance(event, ParseEvent):
+            self._parse(event)
+
+    def _request(self, event: RequestEvent) -> None:
+        status = event.status if event.status is not None else (event.error or 'cached')
+        with self._lock:
+            self._requests[(event.endpoint, event.method, status)] += 1
+            if event.cache != 'hit':
+                histogram = self._latency.get(event.endpoint)
+                if histogram is None:
+                    histogram = self._latency[event.endpoint] = _Histogram(self.latency_buckets)
+                histogram.observe(event.duration)
+            self._bytes[event.endpoint] += event.bytes
+            self._retries[event.endpoint] += event.retries
+            if event.cache is not None:
+                self._cache[(event.endpoint, event.cache)] += 1
+
+    def _parse(self, event: ParseEvent) -> None:
+        with self._lock:
+            self._parses[(event.parser, event.error or 'ok')] += 1
+            histogram = self._parse_time.get(event.parser)
+            if histogram is None:
+                histogram = self._parse_time[event.parser] = _Histogram(self.parse_buckets)
+            histogram.observe(event.duration)
+            self._parse_cpu[event.parser] += event.cpu_time
+
+    def to_prometheus(self) -> str:
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        def histogram(name: str, label: str, histograms: Dict[str, _Histogram]) -> None:
+            for key, hist in sorted(histograms.items()):
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(**{label: key, 'le': repr(float(bound))})} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(**{label: key, 'le': '+Inf'})} {hist.count}")
+                lines.append(f"{name}_sum{_labels(**{label: key})} {hist.sum!r}")
+                lines.append(f"{name}_count{_labels(**{label: key})} {hist.count}")
+
+        with self._lock:
+            metric('storygraph_requests_total', 'counter', 'Requests made to StoryGraph, including cache hits.')
+            for (endpoint, method, status), count in sorted(self._requests.items(), key=str):
+                lines.append(f"storygraph_requests_total{_labels(endpoint=endpoint, method=method, status=status)} {count}")
+            metric('storygraph_request_duration_seconds', 'histogram', 'Network latency per request, including retries.')
+            histogram('storygraph_request_duration_seconds', 'endpoint', self._latency)
+            metric('storygraph_response_bytes_total', 'counter', 'Response body bytes received.')
+            for endpoint, size in sorted(self._bytes.items()):
+                lines.append(f"storygraph_response_bytes_total{_labels(endpoint=endpoint)} {size}")
+            metric('storygraph_request_retries_total', 'counter', 'Requests retried after a 429 or 5xx.')
+            for endpoint, retries in sorted(self._retries.items()):
+                lines.append(f"storygraph_request_retries_total{_labels(endpoint=endpoint)} {retries}")
+            metric('storygraph_cache_requests_total', 'counter', 'Response cache lookups by result.')
+            for (endpoint, result), count in sorted(self._cache.items()):
+                lines.append(f"storygraph_cache_requests_total{_labels(endpoint=endpoint, result=result)} {count}")
+            metric('storygraph_parses_total', 'counter', 'Parser extractions by outcome.')
+            for (parser, outcome), count in sorted(self._parses.items()):
+                lines.append(f"storygraph_parses_total{_labels(parser=parser, outcome=outcome)} {count}")
+            metric('storygraph_parse_duration_seconds', 'histogram', 'Wall time per parser extraction.')
+            histogram('storygraph_parse_duration_seconds', 'parser', self._parse_time)
+            metric('storygraph_parse_cpu_seconds_total', 'counter', 'Thread CPU time spent in parser extractions.')
+            for parser, seconds in sorted(self._parse_cpu.items()):
+                lines.append(f"storygraph_parse_cpu_seconds_total{_labels(parser=parser)} {seconds!r}")
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,114 @@
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List
+
+
+@dataclass(slots=True)
+class BookInfo:
+    # Fields left out of a book_info(fields=[...]) projection are None.
+    title: str | None = None
+    authors: List[str] | None = None
+    pages: str | None = None
+    first_pub: str | None = None
+    tags: List[str] | None = None
+    average_rating: str | None = None
+    description: str | None = None
+    warnings: Dict[str, List[str]] | None = None
+    cover_url: str | None = None
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        if not self.errors:
+            del data['errors']
+        return data
+
+
+@dataclass(slots=True)
+class BookMetadata:
+    title: str
+    authors: List[str]
+    pages: str
+    first_pub: str
+    tags: List[str]
+    cover_url: str | None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class ShelfEntry:
+    title: str
+    book_id: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class JournalEntry:
+    date: str
+    status: str | None
+    progress_percent: int | None
+    pages_read_this_session: int | None
+    total_pages_read: int | None
+    total_pages: int | None
+    note: str | None
+    book_title: str | None = None
+    book_id: str | None = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        book = {'book_title': data.pop('book_title'), 'book_id': data.pop('book_id')}
+        if self.book_id is None and self.book_title is None:
+            return data
+        return {**book, **data}
+
+
+@dataclass(slots=True)
+class JournalSync:
+    entries: List[JournalEntry]
+    cursor: Dict[str, Any]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'entries': [entry.to_dict() for entry in self.entries], 'cursor': self.cursor}
+
+
+@dataclass(slots=True)
+class ReadDates:
+    start_date: str | None
+    finish_date: str | None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class SearchResult:
+    title: str
+    author: str
+    book_id: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def to_model(data: Any, model: type) -> Any:
+    if isinstance(data, list):
+        return [model(**item) for item in data]
+    return model(**data)
+
+
+def to_json(result: Any) -> str:
+    if isinstance(result, list):
+        data = [item.to_dict() if hasattr(item, 'to_dict') else item for item in result]
+    else:
+        data = result.to_dict() if hasattr(result, 'to_dict') else result
+    return json.dumps(data, indent=4)
+
+
+def encode(data: Any, model: type, native: bool) -> Any:
+    if native:
+        return to_model(data, model)
+    return json.dumps(data, indent=4)
@@ -0,0 +1,144 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+from storygraph_api.request.ratelimit import RateLimiter, RetryPolicy, retry_delay
+from storygraph_api.tracing import span, submit
+
+NOTION_PAGE_SIZE = 100
+# Notion allows an average of three requests per second per integration.
+NOTION_RATE = 3.0
+DEFAULT_RETRY = RetryPolicy(max_retries=5)
+
+
+class NotionRow(NamedTuple):
+    title: str
+    author: str
+    date: str
+    progress: float
+
+    @classmethod
+    def of(cls, title: str, author: str, date: str, progress: float | None) -> 'NotionRow':
+        return cls(title, author, date, round(progress or 0, 2))
+
+
+@dataclass(slots=True)
+class NotionSyncReport:
+    existing: int = 0
+    created: List[NotionRow] = field(default_factory=list)
+    failed: List[Tuple[NotionRow, str]] = field(default_factory=list)
+
+
+def notion_properties(row: NotionRow) -> Dict[str, Any]:
+    return {
+        "Book Title": {"title": [{"text": {"content": row.title}}]},
+        "Author": {"rich_text": [{"text": {"content": row.author}}]},
+        "Date": {"date": {"start": row.date}},
+        "Progress": {"number": row.progress},
+    }
+
+
+def _plain_text(items: List[Dict[str, Any]] | None) -> str:
+    return ''.join(item.get('plain_text', item.get('text', {}).get('content', '')) for item in items or ())
+
+
+def row_from_page(page: Dict[str, Any]) -> NotionRow | None:
+    properties = page.get('properties', {})
+    try:
+        title = _plain_text(properties['Book Title']['title'])
+        author = _plain_text(properties['Author']['rich_text'])
+        date = (properties['Date']['date'] or {}).get('start')
+        progress = properties['Progress']['number']
+    except (KeyError, TypeError):
+        return None
+    if not date:
+        return None
+    return NotionRow.of(title, author, date[:10], progress)
+
+
+class NotionSync:
+    def __init__(self, client: Any, database_id: str, max_concurrency: int = 3,
+                 rate_limiter: RateLimiter | None = None, retry: RetryPolicy | None = DEFAULT_RETRY):
+        # `client` is a notion_client.Client or anything with the same
+        # databases.query and pages.create methods.
+        self.client = client
+        self.database_id = database_id
+        self.max_concurrency = max(1, max_concurrency)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter(NOTION_RATE)
+        self.retry = retry
+        self._index: Set[NotionRow] | None = None
+        self._lock = threading.Lock()
+
+    def _call(self, method: str, fn: Callable[..., Any], **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                result = fn(**kwargs)
+            except Exception as e:
+                # notion_client's HTTP errors carry the response status and headers.
+                status = getattr(e, 'status', None)
+                if not isinstance(status, int):
+                    raise
+                delay = retry_delay(self.rate_limiter, self.retry, method, status, getattr(e, 'headers', None) or {}, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            if self.rate_limiter is not None:
+                self.rate_limiter.succeeded()
+            return result
+
+    def _pages(self) -> Iterator[NotionRow]:
+        cursor = None
+        while True:
+            kwargs = {'database_id': self.database_id, 'page_size': NOTION_PAGE_SIZE}
+            if cursor:
+                kwargs['start_cursor'] = cursor
+            with span('notion.databases.query', 'http'):
+                # A query only reads, so it retries like a GET.
+                response = self._call('GET', self.client.databases.query, **kwargs)
+            for page in response['results']:
+                row = row_from_page(page)
+                if row is not None:
+                    yield row
+            if not response.get('has_more'):
+                return
+            cursor = response['next_cursor']
+
+    def index(self, refresh: bool = False) -> Set[NotionRow]:
+        with self._lock:
+            if self._index is None or refresh:
+                self._index = set(self._pages())
+            return self._index
+
+    def missing(self, rows: Iterable[NotionRow]) -> List[NotionRow]:
+        index = self.index()
+        return [row for row in dict.fromkeys(rows) if row not in index]
+
+    def create(self, row: NotionRow) -> Dict[str, Any]:
+        with span('notion.pages.create', 'http'):
+            page = self._call('POST', self.client.pages.create, parent={'database_id': self.database_id},
+                              properties=notion_properties(row))
+        with self._lock:
+            if self._index is not None:
+                self._index.add(row)
+        return page
+
+    def sync(self, rows: Iterable[NotionRow]) -> NotionSyncReport:
+        rows = list(dict.fromkeys(rows))
+        missing = self.missing(rows)
+        report = NotionSyncReport(existing=len(rows) - len(missing))
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            futures = [(row, submit(pool, self.create, row)) for row in missing]
+            for row, future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    report.failed.append((row, str(e)))
+                else:
+                    report.created.append(row)
+        return report
@@ -0,0 +1,108 @@
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import aclosing, closing
+from itertools import count
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator, List
+from storygraph_api.parse.stream import FeedParser, aiter_parsed, iter_parsed
+from storygraph_api.tracing import submit
+
+
+def iter_pages(fetch_page: Callable[[int], bytes], parse: Callable[[bytes], List[Any]],
+               window: int = 1) -> Iterator[List[Any]]:
+    # Pages are requested `window` at a time ahead of the consumer and yielded
+    # in page order until the first page that parses to nothing.
+    if window <= 1:
+        page = 1
+        while True:
+            items = parse(fetch_page(page))
+            if not items:
+                return
+            yield items
+            page += 1
+
+    pool = ThreadPoolExecutor(max_workers=window, thread_name_prefix='storygraph-page')
+    pending = deque()
+    next_page = 1
+    try:
+        for _ in range(window):
+            pending.append(submit(pool, fetch_page, next_page))
+            next_page += 1
+        while True:
+            items = parse(pending.popleft().result())
+            if not items:
+                return
+            yield items
+            pending.append(submit(pool, fetch_page, next_page))
+            next_page += 1
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _discard_result(task: asyncio.Task) -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+async def aiter_pages(fetch_page: Callable[[int], Awaitable[bytes]], parse: Callable[[bytes], List[Any]],
+                      window: int = 1) -> AsyncIterator[List[Any]]:
+    pending = deque()
+    next_page = 1
+    try:
+        for _ in range(max(1, window)):
+            pending.append(asyncio.ensure_future(fetch_page(next_page)))
+            next_page += 1
+        while True:
+            items = parse(await pending.popleft())
+            if not items:
+                return
+            yield items
+            pending.append(asyncio.ensure_future(fetch_page(next_page)))
+            next_page += 1
+    finally:
+        for task in pending:
+            task.add_done_callback(_discard_result)
+            task.cancel()
+
+
+def fetch_pages(fetch_page: Callable[[int], bytes], parse: Callable[[bytes], List[Any]],
+                window: int = 1) -> List[Any]:
+    results = []
+    for items in iter_pages(fetch_page, parse, window):
+        results.extend(items)
+    return results
+
+
+async def afetch_pages(fetch_page: Callable[[int], Awaitable[bytes]], parse: Callable[[bytes], List[Any]],
+                       window: int = 1) -> List[Any]:
+    results = []
+    async for items in aiter_pages(fetch_page, parse, window):
+        results.extend(items)
+    return results
+
+
+def stream_pages(stream_page: Callable[[int], Iterable[bytes]], parser: Callable[[], FeedParser]) -> Iterator[Any]:
+    # One page at a time, each parsed while it downloads; records are yielded
+    # as the parser completes them, until a page that yields none.
+    for page in count(1):
+        empty = True
+        with closing(stream_page(page)) as chunks:
+            for record in iter_parsed(chunks, parser()):
+                empty = False
+                yield record
+        if empty:
+            return
+
+
+async def astream_pages(stream_page: Callable[[int], AsyncIterator[bytes]],
+                        parser: Callable[[], FeedParser]) -> AsyncIterator[Any]:
+    for page in count(1):
+        empty = True
+        async with aclosing(stream_page(page)) as chunks, aclosing(aiter_parsed(chunks, parser())) as records:
+            async for record in records:
+                empty = False
+                yield record
+        if empty:
+            return
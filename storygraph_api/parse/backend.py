@@ -0,0 +1,59 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup, SoupStrainer
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'html5lib')
+
+_backend = 'html.parser'
+_partial_parsing = True
+
+
+def set_parser_backend(name: str) -> None:
+    global _backend
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{name}'. Choose one of: {', '.join(PARSER_BACKENDS)}.")
+    if name != 'html.parser':
+        try:
+            __import__(name)
+        except ImportError as e:
+            raise ImportError(f"The '{name}' parser backend requires: pip install {name}") from e
+    _backend = name
+
+
+def get_parser_backend() -> str:
+    return _backend
+
+
+def set_partial_parsing(enabled: bool) -> None:
+    global _partial_parsing
+    _partial_parsing = enabled
+
+
+def get_partial_parsing() -> bool:
+    return _partial_parsing
+
+
+def __getattr__(name: str) -> Any:
+    # bs4 (and soupsieve behind it) is the slowest import in the package, so the
+    # parsers reach its classes through this module and it loads on first use.
+    if name in ('BeautifulSoup', 'NavigableString', 'SoupStrainer', 'Tag'):
+        import bs4
+        value = globals()[name] = getattr(bs4, name)
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+@lru_cache(maxsize=None)
+def strainer(name: str, class_: str) -> 'SoupStrainer':
+    from bs4 import SoupStrainer
+    return SoupStrainer(name, class_=class_)
+
+
+def make_soup(content: Any, parse_only: 'SoupStrainer | None' = None, **kwargs: Any) -> 'BeautifulSoup':
+    from bs4 import BeautifulSoup
+    # html5lib cannot build a partial tree, so it always parses the whole page.
+    if parse_only is not None and _partial_parsing and _backend != 'html5lib':
+        kwargs['parse_only'] = parse_only
+    return BeautifulSoup(content, _backend, **kwargs)
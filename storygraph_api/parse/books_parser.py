@@ -1,95 +1,116 @@
-from storygraph_api.request.books_request import BooksScraper
 from storygraph_api.exception_handler import parsing_exception
-from bs4 import BeautifulSoup, Tag, NavigableString
+from storygraph_api.metrics import parse_metrics
+from storygraph_api.parse import backend
+from storygraph_api.parse.backend import make_soup
 import re
-from typing import Dict, Any, List
+from datetime import datetime
+from typing import Collection, Dict, Any, List, Tuple
 from urllib.parse import parse_qs, urlparse
 
 class BooksParser:
     @staticmethod
+    def _author_names(tag: 'backend.Tag') -> List[str]:
+        authors = []
+        for a in tag.find_all('a'):
+            if isinstance(a, backend.Tag):
+                href = a.get("href")
+                if isinstance(href, str) and href.startswith("/authors"):
+                    authors.append(a.text)
+        return authors
+
+    @staticmethod
+    @parse_metrics
     @parsing_exception
-    def book_page(book_id: str) -> Dict[str, Any]:
-        content = BooksScraper.main(book_id)
-        soup = BeautifulSoup(content, 'html.parser')
+    def book_page(content: bytes, fields: Collection[str] | None = None) -> Dict[str, Any]:
+        # Only the requested optional fields are extracted; the description
+        # costs a regex and a second parse.
+        soup = make_soup(content)
 
         h3_tag = soup.find('h3', class_="font-serif font-bold text-2xl md:w-11/12")
-        if not isinstance(h3_tag, Tag):
+        if not isinstance(h3_tag, backend.Tag):
             raise Exception("Could not find the main title header.")
 
         title = ""
-        if h3_tag.contents and isinstance(h3_tag.contents[0], NavigableString):
+        if h3_tag.contents and isinstance(h3_tag.contents[0], backend.NavigableString):
             title = h3_tag.contents[0].strip()
 
-        authors = []
-        for a in h3_tag.find_all('a'):
-            if isinstance(a, Tag):
-                href = a.get("href")
-                if isinstance(href, str) and href.startswith("/authors"):
-                    authors.append(a.text)
+        authors = BooksParser._author_names(h3_tag)
 
         p_tag = soup.find('p', class_="text-sm font-light text-darkestGrey dark:text-grey mt-1")
-        if not isinstance(p_tag, Tag) or not p_tag.contents:
+        if not isinstance(p_tag, backend.Tag) or not p_tag.contents:
             raise Exception("Could not find book metadata paragraph.")
 
+        if not authors:
+            # lxml closes the heading at its first <p>, leaving the series and
+            # author paragraphs as siblings between it and the metadata paragraph.
+            for sibling in h3_tag.find_next_siblings():
+                if sibling is p_tag:
+                    break
+                authors.extend(BooksParser._author_names(sibling))
+
         pages_text = p_tag.contents[0]
-        pages = pages_text.strip().split()[0] if isinstance(pages_text, NavigableString) else "N/A"
+        pages = pages_text.strip().split()[0] if isinstance(pages_text, backend.NavigableString) else "N/A"
 
         pub_info_span = p_tag.find('span', string=re.compile(r'first pub'))
         first_pub = pub_info_span.text.split()[-1] if pub_info_span else "N/A"
 
-        tag_div = soup.find('div', class_="book-page-tag-section")
-        tags = [tag.text for tag in tag_div.find_all('span')] if isinstance(tag_div, Tag) else []
+        data = {'title': title, 'authors': authors, 'pages': pages, 'first_pub': first_pub}
 
-        cover_url = None
-        cover_div = soup.find('div', class_="book-cover")
-        if isinstance(cover_div, Tag):
-            img_tag = cover_div.find('img')
-            if isinstance(img_tag, Tag):
-                cover_url = img_tag.get('src')
+        if fields is None or 'tags' in fields:
+            tag_div = soup.find('div', class_="book-page-tag-section")
+            data['tags'] = [tag.text for tag in tag_div.find_all('span')] if isinstance(tag_div, backend.Tag) else []
 
-        description = "Description not found."
+        if fields is None or 'description' in fields:
+            data['description'] = BooksParser._description(soup)
+
+        if fields is None or 'cover_url' in fields:
+            cover_url = None
+            cover_div = soup.find('div', class_="book-cover")
+            if isinstance(cover_div, backend.Tag):
+                img_tag = cover_div.find('img')
+                if isinstance(img_tag, backend.Tag):
+                    cover_url = img_tag.get('src')
+            data['cover_url'] = cover_url
+        return data
+
+    @staticmethod
+    def _description(soup: 'backend.BeautifulSoup') -> str:
         script_tag = soup.find('script', string=re.compile(r"\$\('\.read-more-btn'\)"))
-        if isinstance(script_tag, Tag):
+        if isinstance(script_tag, backend.Tag):
             script_content = script_tag.string
             if script_content:
                 pattern = re.compile(r"\.html\('(.*)'\)", re.DOTALL)
                 match = pattern.search(str(script_content))
                 if match:
                     html_str = match.group(1).replace(r'\/', r'/')
-                    desc_soup = BeautifulSoup(html_str, 'html.parser')
+                    desc_soup = make_soup(html_str)
                     desc_div = desc_soup.find('div', class_='trix-content')
                     if desc_div:
-                        description = desc_div.get_text(separator="\n", strip=True)
+                        return desc_div.get_text(separator="\n", strip=True)
+        return "Description not found."
 
-        review_content = BooksScraper.community_reviews(book_id)
-        rev_soup = BeautifulSoup(review_content, 'html.parser')
+    @staticmethod
+    @parse_metrics
+    @parsing_exception
+    def average_rating(review_content: bytes) -> str:
+        rev_soup = make_soup(review_content)
         avg_rating_span = rev_soup.find('span', class_="average-star-rating")
-        avg_rating = avg_rating_span.text.strip() if avg_rating_span else "N/A"
-
-        warnings = BooksParser.content_warnings(book_id)
-
-        data = {
-            'title': title, 'authors': authors, 'pages': pages,
-            'first_pub': first_pub, 'tags': tags, 'average_rating': avg_rating,
-            'description': description, 'warnings': warnings,
-            'cover_url': cover_url
-        }
-        return data
+        return avg_rating_span.text.strip() if avg_rating_span else "N/A"
 
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def reading_progress(book_id: str, cookies: Dict[str, str]) -> str:
-        content = BooksScraper.book_page_authenticated(book_id, cookies)
-        soup = BeautifulSoup(content, 'html.parser')
+    def reading_progress(content: bytes) -> str:
+        soup = make_soup(content)
 
         status_label = soup.find('button', class_='read-status-label')
-        if isinstance(status_label, Tag) and status_label.text.strip() == 'read':
+        if isinstance(status_label, backend.Tag) and status_label.text.strip() == 'read':
             return "100%"
 
         progress_bar_div = soup.find('div', class_='progress-bar')
-        if isinstance(progress_bar_div, Tag):
+        if isinstance(progress_bar_div, backend.Tag):
             progress_span = progress_bar_div.find('span')
-            if isinstance(progress_span, Tag) and progress_span.string:
+            if isinstance(progress_span, backend.Tag) and progress_span.string:
                 return progress_span.string.strip()
 
             inner_div = progress_bar_div.find('div', style=lambda v: 'width: 0%' in v if v else False)
@@ -97,63 +118,48 @@ class BooksParser:
                 return "0%"
 
         to_read_button = soup.find('button', string=re.compile(r'\s*to read\s*'))
-        if isinstance(to_read_button, Tag):
+        if isinstance(to_read_button, backend.Tag):
             return "0%"
 
         raise Exception("Could not determine reading status from the page.")
 
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def get_read_dates(book_id: str, cookies: Dict[str, str]) -> Dict[str, Any]:
-        try:
-            from storygraph_api.parse.user_parser import UserParser
-            from storygraph_api.request.user_request import UserScraper
-
-            all_entries = []
-            page = 1
-            while True:
-                content = UserScraper.all_journal_entries(cookies, page)
-                entries = UserParser.all_journal_entries(content)
-                if not entries:
-                    break
-                all_entries.extend(entries)
-                page += 1
-
-            start_date = None
-            finish_date = None
-
-            for entry in all_entries:
-                if entry.get('book_id') == book_id:
-                    if entry.get('status') == 'Started reading':
-                        date_str = entry.get('date', '')
-                        if date_str:
-                            try:
-                                from datetime import datetime
-                                parsed_date = datetime.strptime(date_str, '%d %B %Y')
-                                start_date = parsed_date.strftime('%Y-%m-%d')
-                            except:
-                                pass
-                    elif entry.get('status') == 'Finished':
-                        date_str = entry.get('date', '')
-                        if date_str:
-                            try:
-                                from datetime import datetime
-                                parsed_date = datetime.strptime(date_str, '%d %B %Y')
-                                finish_date = parsed_date.strftime('%Y-%m-%d')
-                            except:
-                                pass
-
-            return {'start_date': start_date, 'finish_date': finish_date}
-
-        except Exception:
-            pass
-
-        content = BooksScraper.book_page_authenticated(book_id, cookies)
-        soup = BeautifulSoup(content, 'html.parser')
+    def read_dates_from_journal(all_entries: List[Dict[str, Any]], book_id: str) -> Dict[str, Any]:
+        start_date = None
+        finish_date = None
+
+        for entry in all_entries:
+            if entry.get('book_id') == book_id:
+                if entry.get('status') == 'Started reading':
+                    date_str = entry.get('date', '')
+                    if date_str:
+                        try:
+                            parsed_date = datetime.strptime(date_str, '%d %B %Y')
+                            start_date = parsed_date.strftime('%Y-%m-%d')
+                        except:
+                            pass
+                elif entry.get('status') == 'Finished':
+                    date_str = entry.get('date', '')
+                    if date_str:
+                        try:
+                            parsed_date = datetime.strptime(date_str, '%d %B %Y')
+                            finish_date = parsed_date.strftime('%Y-%m-%d')
+                        except:
+                            pass
+
+        return {'start_date': start_date, 'finish_date': finish_date}
+
+    @staticmethod
+    @parse_metrics
+    @parsing_exception
+    def read_dates_edit_link(content: bytes) -> Tuple[str, str] | None:
+        soup = make_soup(content)
 
         edit_link = soup.find('a', href=re.compile(r'/edit-(read-instance|journal-entry)-from-book'))
-        if not (isinstance(edit_link, Tag) and edit_link.get('href')):
-            return {'start_date': None, 'finish_date': None}
+        if not (isinstance(edit_link, backend.Tag) and edit_link.get('href')):
+            return None
 
         href = edit_link['href']
         if not isinstance(href, str):
@@ -162,48 +168,39 @@ class BooksParser:
         parsed_url = urlparse(href)
         query_params = parse_qs(parsed_url.query)
 
-        id_val = None
-        form_content = b''
-        id_type = ''
-
         if 'read_instance_id' in query_params:
             id_val = query_params.get('read_instance_id', [None])[0]
-            id_type = 'read_instance'
             if not id_val:
                 raise Exception("Could not extract read_instance_id from edit link.")
-            try:
-                form_content = BooksScraper.get_read_dates_form(book_id, id_val, cookies)
-            except:
-                return {'start_date': None, 'finish_date': None}
+            return 'read_instance', id_val
 
         elif 'journal_entry_id' in query_params:
             id_val = query_params.get('journal_entry_id', [None])[0]
-            id_type = 'journal_entry'
             if not id_val:
                 raise Exception("Could not extract journal_entry_id from edit link.")
-            try:
-                form_content = BooksScraper.get_journal_entry_form(book_id, id_val, cookies)
-            except:
-                return {'start_date': None, 'finish_date': None}
+            return 'journal_entry', id_val
 
-        if not form_content:
-            return {'start_date': None, 'finish_date': None}
+        return None
 
-        form_soup = BeautifulSoup(form_content, 'html.parser')
+    @staticmethod
+    @parse_metrics
+    @parsing_exception
+    def read_dates_form(form_content: bytes, id_type: str) -> Dict[str, Any]:
+        form_soup = make_soup(form_content)
 
         def get_date(date_prefix: str) -> str | None:
             day_select = form_soup.find('select', id=f'{id_type}_{date_prefix}day')
             month_select = form_soup.find('select', id=f'{id_type}_{date_prefix}month')
             year_select = form_soup.find('select', id=f'{id_type}_{date_prefix}year')
 
-            if not (isinstance(day_select, Tag) and isinstance(month_select, Tag) and isinstance(year_select, Tag)):
+            if not (isinstance(day_select, backend.Tag) and isinstance(month_select, backend.Tag) and isinstance(year_select, backend.Tag)):
                 return None
 
             day_option = day_select.find('option', selected=True)
             month_option = month_select.find('option', selected=True)
             year_option = year_select.find('option', selected=True)
 
-            if isinstance(day_option, Tag) and isinstance(month_option, Tag) and isinstance(year_option, Tag):
+            if isinstance(day_option, backend.Tag) and isinstance(month_option, backend.Tag) and isinstance(year_option, backend.Tag):
                 day = day_option.get('value')
                 month = month_option.get('value')
                 year = year_option.get('value')
@@ -218,24 +215,24 @@ class BooksParser:
         return {'start_date': start_date, 'finish_date': finish_date}
 
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def get_ai_summary(book_id: str, user_id: str) -> Dict[str, str]:
-        content = BooksScraper.get_ai_summary(book_id, user_id)
-        soup = BeautifulSoup(content, 'html.parser')
+    def get_ai_summary(content: bytes) -> Dict[str, str]:
+        soup = make_soup(content)
 
         template = soup.find('template')
-        if isinstance(template, Tag):
+        if isinstance(template, backend.Tag):
             p_tag = template.find('p')
-            if isinstance(p_tag, Tag) and p_tag.string:
+            if isinstance(p_tag, backend.Tag) and p_tag.string:
                 return {'summary': p_tag.string.strip()}
 
         raise Exception("Could not parse AI summary.")
 
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def content_warnings(book_id: str) -> Dict[str, List[str]]:
-        warnings_content = BooksScraper.content_warnings(book_id)
-        warnings_soup = BeautifulSoup(warnings_content, 'html.parser')
+    def content_warnings(warnings_content: bytes) -> Dict[str, List[str]]:
+        warnings_soup = make_soup(warnings_content)
 
         standard_panes = warnings_soup.find_all('div', class_='standard-pane')
         if len(standard_panes) < 2:
@@ -247,7 +244,7 @@ class BooksParser:
         tag_re = re.compile(r'^(.*) \((\d+)\)$')
 
         for tag in user_warnings_pane.children:
-            if not isinstance(tag, Tag): continue
+            if not isinstance(tag, backend.Tag): continue
 
             if tag.name == 'p':
                 if tag.text == 'Graphic': current_list_key = 'graphic'
@@ -259,27 +256,27 @@ class BooksParser:
         return warnings
 
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def search(query: str) -> List[Dict[str, str]]:
-        content = BooksScraper.search(query)
-        soup = BeautifulSoup(content, 'html.parser')
+    def search(content: bytes) -> List[Dict[str, str]]:
+        soup = make_soup(content)
         search_results: List[Dict[str, str]] = []
 
         books = soup.find_all('div', class_="book-title-author-and-series w-11/12")
         for book in books:
-            if not isinstance(book, Tag): continue
+            if not isinstance(book, backend.Tag): continue
 
             title_tag = book.find('a')
-            title = title_tag.text.strip() if isinstance(title_tag, Tag) else "N/A"
+            title = title_tag.text.strip() if isinstance(title_tag, backend.Tag) else "N/A"
 
-            href_val = title_tag.get('href') if isinstance(title_tag, Tag) else None
+            href_val = title_tag.get('href') if isinstance(title_tag, backend.Tag) else None
 
             href = href_val[0] if isinstance(href_val, list) else href_val
             book_id = href.split('/')[-1] if isinstance(href, str) else "N/A"
 
             author = "N/A"
             for a_tag in book.find_all('a'):
-                if isinstance(a_tag, Tag):
+                if isinstance(a_tag, backend.Tag):
                     href = a_tag.get("href")
                     if isinstance(href, str) and href.startswith('/author'):
                         author = a_tag.text.strip()
@@ -290,10 +287,10 @@ class BooksParser:
         return search_results
 
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def journal_entries(book_id: str, cookies: Dict[str, str]) -> List[Dict[str, Any]]:
-        content = BooksScraper.get_journal_page(book_id, cookies)
-        soup = BeautifulSoup(content, 'html.parser')
+    def journal_entries(content: bytes) -> List[Dict[str, Any]]:
+        soup = make_soup(content)
 
         journal_entries: List[Dict[str, Any]] = []
 
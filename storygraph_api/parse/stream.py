@@ -0,0 +1,92 @@
+import codecs
+from html.parser import HTMLParser
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, List, Protocol
+
+
+class FeedParser(Protocol):
+    def feed(self, chunk: bytes) -> List[Any]: ...
+
+    def close(self) -> List[Any]: ...
+
+
+# Cuts the source of every <tag class="class_"> element out of HTML fed in
+# arbitrary chunks. A block is returned by the feed() call that reads its
+# closing tag; everything outside the blocks is dropped as it goes.
+class BlockSplitter(HTMLParser):
+    def __init__(self, tag: str, class_: str, encoding: str = 'utf-8'):
+        super().__init__(convert_charrefs=False)
+        self.tag = tag
+        self.class_ = class_
+        self._decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._parts: List[str] = []
+        self._depth = 0
+        self._done: List[str] = []
+
+    def feed(self, data: bytes | str) -> List[str]:
+        if isinstance(data, bytes):
+            data = self._decoder.decode(data)
+        super().feed(data)
+        return self._take()
+
+    def close(self) -> List[str]:
+        super().feed(self._decoder.decode(b'', final=True))
+        super().close()
+        return self._take()
+
+    def _take(self) -> List[str]:
+        done, self._done = self._done, []
+        return done
+
+    def _append(self, text: str) -> None:
+        if self._depth:
+            self._parts.append(text)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if self._depth:
+            self._parts.append(self.get_starttag_text())
+            # Only elements of the block's own tag are counted: HTML leaves
+            # void and implicitly closed elements without end tags.
+            if tag == self.tag:
+                self._depth += 1
+        elif tag == self.tag and self.class_ in (dict(attrs).get('class') or '').split():
+            self._parts = [self.get_starttag_text()]
+            self._depth = 1
+
+    def handle_startendtag(self, tag: str, attrs: list) -> None:
+        self._append(self.get_starttag_text())
+
+    def handle_endtag(self, tag: str) -> None:
+        if not self._depth:
+            return
+        self._parts.append(f"</{tag}>")
+        if tag == self.tag:
+            self._depth -= 1
+            if not self._depth:
+                self._done.append(''.join(self._parts))
+                self._parts = []
+
+    def handle_data(self, data: str) -> None:
+        self._append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        self._append(f"&{name};")
+
+    def handle_charref(self, name: str) -> None:
+        self._append(f"&#{name};")
+
+    def handle_comment(self, data: str) -> None:
+        self._append(f"<!--{data}-->")
+
+
+def iter_parsed(chunks: Iterable[bytes], parser: FeedParser) -> Iterator[Any]:
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+async def aiter_parsed(chunks: AsyncIterable[bytes], parser: FeedParser) -> AsyncIterator[Any]:
+    async for chunk in chunks:
+        for item in parser.feed(chunk):
+            yield item
+    for item in parser.close():
+        yield item
@@ -1,26 +1,30 @@
-from storygraph_api.request.user_request import UserScraper
 from storygraph_api.exception_handler import parsing_exception
-from bs4 import BeautifulSoup, Tag
-from typing import Dict
+from storygraph_api.metrics import parse_metrics
+from storygraph_api.parse import backend
+from storygraph_api.parse.backend import make_soup, strainer
+from storygraph_api.parse.stream import BlockSplitter
+from collections import deque
+from typing import Any, Dict, List
 import re
 
+SHELF_BOOKS = ('div', "book-title-author-and-series")
+JOURNAL_ENTRIES = ('div', "mb-7")
+
 class UserParser:
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def get_user_id(username: str) -> Dict[str, str]:
-        content = UserScraper.get_profile_page(username)
-        soup = BeautifulSoup(content, 'html.parser')
+    def get_user_id(content: bytes, username: str) -> Dict[str, str]:
+        soup = make_soup(content)
         profile_pane = soup.find('div', id='profile-heading-pane')
-        if isinstance(profile_pane, Tag):
+        if isinstance(profile_pane, backend.Tag):
             user_id = profile_pane.get('data-user-id')
             if user_id and isinstance(user_id, str):
                 return {'user_id': user_id}
         raise Exception(f"Could not find user_id for username '{username}'.")
 
     @staticmethod
-    @parsing_exception
-    def parse_html(html):
-        soup = BeautifulSoup(html, 'html.parser')
+    def _shelf_books(soup) -> List[Dict[str, str]]:
         books_list = []
         books = soup.find_all('div', class_="book-title-author-and-series")
         for book in books:
@@ -30,29 +34,20 @@ class UserParser:
                 'title': title,
                 'book_id': book_id
                 })
-        data = list({(book['title'], book['book_id']): book for book in books_list}.values())
-        return data
-
-    @staticmethod
-    def currently_reading(uname, cookie):
-        content = UserScraper.currently_reading(uname, cookie)
-        return UserParser.parse_html(content)
-
-    @staticmethod
-    def to_read(uname, cookie):
-        content = UserScraper.to_read(uname, cookie)
-        return UserParser.parse_html(content)
-
-    @staticmethod
-    def books_read(uname, cookie):
-        content = UserScraper.books_read(uname, cookie)
-        return UserParser.parse_html(content)
+        soup.decompose()
+        return books_list
 
     @staticmethod
+    @parse_metrics
     @parsing_exception
-    def all_journal_entries(html_content):
-        soup = BeautifulSoup(html_content, 'html.parser')
+    def parse_html(html):
+        soup = make_soup(html, parse_only=strainer(*SHELF_BOOKS))
+        books_list = UserParser._shelf_books(soup)
+        data = list({(book['title'], book['book_id']): book for book in books_list}.values())
+        return data
 
+    @staticmethod
+    def _journal_entries(soup) -> List[Dict[str, Any]]:
         journal_entries = []
 
         for entry in soup.find_all('div', class_="mb-7"):
@@ -115,6 +110,15 @@ class UserParser:
             except Exception:
                 continue
 
+        soup.decompose()
+        return journal_entries
+
+    @staticmethod
+    @parse_metrics
+    @parsing_exception
+    def all_journal_entries(html_content):
+        soup = make_soup(html_content, parse_only=strainer(*JOURNAL_ENTRIES))
+        journal_entries = UserParser._journal_entries(soup)
         book_total_pages = {}
 
         for entry in journal_entries:
@@ -128,3 +132,66 @@ class UserParser:
                 entry['total_pages'] = book_total_pages[book_id]
 
         return journal_entries
+
+
+# Streaming counterparts of parse_html and all_journal_entries: feed() takes
+# the next chunk of a page and returns the records completed by it.
+class ShelfStream:
+    def __init__(self):
+        self._blocks = BlockSplitter(*SHELF_BOOKS)
+        self._seen = set()
+
+    @parsing_exception
+    def _books(self, blocks: List[str]) -> List[Dict[str, str]]:
+        books = []
+        for block in blocks:
+            for book in UserParser._shelf_books(make_soup(block)):
+                key = (book['title'], book['book_id'])
+                if key not in self._seen:
+                    self._seen.add(key)
+                    books.append(book)
+        return books
+
+    def feed(self, chunk: bytes) -> List[Dict[str, str]]:
+        return self._books(self._blocks.feed(chunk))
+
+    def close(self) -> List[Dict[str, str]]:
+        return self._books(self._blocks.close())
+
+
+class JournalStream:
+    def __init__(self):
+        self._blocks = BlockSplitter(*JOURNAL_ENTRIES)
+        self._pending: deque = deque()
+        self._total_pages: Dict[str, int] = {}
+
+    @parsing_exception
+    def _entries(self, blocks: List[str], final: bool) -> List[Dict[str, Any]]:
+        for block in blocks:
+            for entry in UserParser._journal_entries(make_soup(block)):
+                book_id = entry.get('book_id')
+                if book_id and entry.get('total_pages') is not None:
+                    self._total_pages[book_id] = entry['total_pages']
+                self._pending.append(entry)
+
+        # An entry without a page count takes it from the last entry for the
+        # same book on the page, as all_journal_entries does. Any later entry
+        # may still change it, so it waits (and keeps everything behind it
+        # waiting) until the page ends.
+        ready = []
+        while self._pending:
+            entry = self._pending[0]
+            book_id = entry.get('book_id')
+            if book_id and entry.get('total_pages') is None:
+                if not final:
+                    break
+                if book_id in self._total_pages:
+                    entry['total_pages'] = self._total_pages[book_id]
+            ready.append(self._pending.popleft())
+        return ready
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        return self._entries(self._blocks.feed(chunk), final=False)
+
+    def close(self) -> List[Dict[str, Any]]:
+        return self._entries(self._blocks.close(), final=True)
@@ -0,0 +1,130 @@
+import multiprocessing
+import threading
+from collections import deque
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, List
+from storygraph_api.parse.backend import (
+    get_parser_backend, get_partial_parsing, set_parser_backend, set_partial_parsing
+)
+from storygraph_api.tracing import submit
+
+
+def _init_worker(backend: str, partial: bool) -> None:
+    set_parser_backend(backend)
+    set_partial_parsing(partial)
+
+
+def _start_method() -> str:
+    # Forking a process whose fetch threads are already running can copy held
+    # locks into the child, so workers start from a clean interpreter.
+    return 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+class ParsePipeline:
+    # Two stages: fetch_workers threads download pages and parse_workers
+    # processes turn them into records, so parsing is not held to one core by
+    # the GIL. At most max_pending items are between the stages at once.
+    def __init__(self, parse_workers: int | None = None, fetch_workers: int = 8, max_pending: int | None = None,
+                 start_method: str | None = None):
+        self.parse_workers = parse_workers or multiprocessing.cpu_count()
+        self.fetch_workers = max(1, fetch_workers)
+        self.max_pending = max(1, max_pending or 2 * (self.parse_workers + self.fetch_workers))
+        self.start_method = start_method or _start_method()
+        self._fetch_pool: ThreadPoolExecutor | None = None
+        self._parse_pool: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def _pools(self):
+        with self._lock:
+            if self._fetch_pool is None:
+                self._fetch_pool = ThreadPoolExecutor(max_workers=self.fetch_workers,
+                                                      thread_name_prefix='storygraph-fetch')
+                # Workers are configured with the parser settings in effect now.
+                self._parse_pool = ProcessPoolExecutor(
+                    max_workers=self.parse_workers, mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker, initargs=(get_parser_backend(), get_partial_parsing()),
+                )
+            return self._fetch_pool, self._parse_pool
+
+    def submit(self, fetch: Callable[..., bytes], parse: Callable[[bytes], Any], *args: Any) -> Future:
+        # fetch(*args) runs on a thread and parse(content) in a worker process,
+        # so parse must be picklable: a module-level function or a parser's
+        # static method, or a functools.partial of one.
+        fetch_pool, parse_pool = self._pools()
+        result = Future()
+
+        def parsed(future: Future) -> None:
+            if future.cancelled():
+                result.set_exception(CancelledError())
+            elif future.exception() is not None:
+                result.set_exception(future.exception())
+            else:
+                result.set_result(future.result())
+
+        def fetched(future: Future) -> None:
+            if not result.set_running_or_notify_cancel():
+                return
+            if future.cancelled():
+                result.set_exception(CancelledError())
+                return
+            if future.exception() is not None:
+                result.set_exception(future.exception())
+                return
+            try:
+                parse_pool.submit(parse, future.result()).add_done_callback(parsed)
+            except Exception as e:
+                result.set_exception(e)
+
+        fetching = submit(fetch_pool, fetch, *args)
+        result.add_done_callback(lambda done: fetching.cancel() if done.cancelled() else None)
+        fetching.add_done_callback(fetched)
+        return result
+
+    def map(self, fetch: Callable[..., bytes], parse: Callable[[bytes], Any], items: Iterable[Any]) -> Iterator[Any]:
+        # Results come back in the order of items; an error is raised at the
+        # position of the item that failed.
+        pending: deque = deque()
+        try:
+            for item in items:
+                pending.append(self.submit(fetch, parse, item))
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def pages(self, fetch_page: Callable[[int], bytes], parse: Callable[[bytes], List[Any]],
+              window: int | None = None) -> Iterator[List[Any]]:
+        # Same contract as pagination.iter_pages: pages in order until the
+        # first one that parses to nothing. By default one page per parse
+        # worker is requested ahead; the ones past the end are cancelled.
+        window = min(self.max_pending, max(1, window or self.parse_workers))
+        pending: deque = deque()
+        next_page = 1
+        try:
+            while True:
+                while len(pending) < window:
+                    pending.append(self.submit(fetch_page, parse, next_page))
+                    next_page += 1
+                items = pending.popleft().result()
+                if not items:
+                    return
+                yield items
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fetch_pool is not None:
+                self._fetch_pool.shutdown(cancel_futures=True)
+                self._parse_pool.shutdown(cancel_futures=True)
+                self._fetch_pool = self._parse_pool = None
+
+    def __enter__(self) -> 'ParsePipeline':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -0,0 +1,98 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Mapping, NamedTuple
+from urllib.parse import urlencode, urlsplit
+
+DEFAULT_TTLS = {
+    r'^/books/[^/]+$': 60 * 60,
+    r'^/books/[^/]+/community_reviews$': 24 * 60 * 60,
+    r'^/books/[^/]+/content_warnings$': 7 * 24 * 60 * 60,
+    r'^/personalized-preview\.turbo_stream$': 30 * 24 * 60 * 60,
+}
+
+
+class CachedResponse(NamedTuple):
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+    stored_at: float
+
+
+class ResponseCache:
+    def __init__(self, path: str, ttls: Mapping[str, float] | None = None, default_ttl: float | None = None):
+        self.path = path
+        self.ttls = [(re.compile(pattern), ttl) for pattern, ttl in (DEFAULT_TTLS if ttls is None else ttls).items()]
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, content BLOB NOT NULL, "
+            "etag TEXT, last_modified TEXT, stored_at REAL NOT NULL)"
+        )
+
+    def ttl_for(self, url: str, cookies: Mapping[str, str] | None = None) -> float | None:
+        path = urlsplit(url).path
+        ttl = next((ttl for pattern, ttl in self.ttls if pattern.search(path)), self.default_ttl)
+        # A page fetched with cookies carries per-user state (reading progress,
+        # read dates), so it is cached but always revalidated.
+        if ttl is not None and cookies:
+            return 0
+        return ttl
+
+    @staticmethod
+    def key(url: str, params: Mapping[str, str] | None, cookies: Mapping[str, str] | None) -> str:
+        # Cookie-bearing responses are keyed by account so one account never
+        # sees a page rendered for another.
+        query = urlencode(sorted((params or {}).items()))
+        account = urlencode(sorted((cookies or {}).items()))
+        return hashlib.sha256(f"{url}?{query}\0{account}".encode()).hexdigest()
+
+    def get(self, key: str) -> CachedResponse | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, etag, last_modified, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def set(self, key: str, url: str, content: bytes, headers: Mapping[str, str]) -> None:
+        if 'no-store' in headers.get('Cache-Control', ''):
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, content, etag, last_modified, stored_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, content, headers.get('ETag'), headers.get('Last-Modified'), time.time()),
+            )
+
+    def refresh(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def invalidate(self, url_pattern: str | None = None) -> None:
+        with self._lock:
+            if url_pattern is None:
+                self._conn.execute("DELETE FROM responses")
+            else:
+                self._conn.execute("DELETE FROM responses WHERE url LIKE ?", (url_pattern,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def is_fresh(entry: CachedResponse, ttl: float) -> bool:
+        return time.time() - entry.stored_at < ttl
+
+    @staticmethod
+    def conditional_headers(entry: CachedResponse) -> Dict[str, str]:
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
@@ -0,0 +1,112 @@
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Collection, Mapping
+
+THROTTLE_STATUSES = frozenset({429, 503})
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    def __init__(self, rate: float = 5.0, burst: int | None = None, min_rate: float | None = None,
+                 increase: float | None = None, decrease: float = 0.5):
+        # AIMD: every throttled response multiplies the rate by `decrease`,
+        # every other response adds `increase` back until `max_rate` is reached.
+        if rate <= 0:
+            raise ValueError("rate must be positive.")
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self.min_rate = min_rate if min_rate is not None else rate / 20
+        self.increase = increase if increase is not None else rate / 50
+        self.decrease = decrease
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def succeeded(self) -> None:
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = min(self._tokens, 0.0)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+
+class RetryPolicy:
+    def __init__(self, max_retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0,
+                 max_retry_after: float = 120.0, statuses: Collection[int] = RETRY_STATUSES,
+                 methods: Collection[str] = IDEMPOTENT_METHODS):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.statuses = frozenset(statuses)
+        self.methods = frozenset(methods)
+
+    def should_retry(self, method: str, status: int, attempt: int) -> bool:
+        if attempt >= self.max_retries or status not in self.statuses:
+            return False
+        # A 429 means the request was never processed, so any method may retry.
+        return status == 429 or method.upper() in self.methods
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after) + random.uniform(0, self.backoff)
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+def retry_delay(limiter: RateLimiter | None, retry: RetryPolicy | None, method: str, status: int,
+                headers: Mapping[str, str], attempt: int) -> float | None:
+    retry_after = parse_retry_after(headers.get('Retry-After')) if status in RETRY_STATUSES else None
+    if limiter is not None:
+        if status in THROTTLE_STATUSES:
+            limiter.throttled(retry_after)
+        elif status < 500:
+            limiter.succeeded()
+    if retry is None or not retry.should_retry(method, status, attempt):
+        return None
+    return retry.delay(attempt, retry_after)
@@ -0,0 +1,287 @@
+import asyncio
+import threading
+import time
+from http.cookiejar import DefaultCookiePolicy
+from typing import TYPE_CHECKING, Dict, Any, AsyncIterator, Iterator, Tuple
+from storygraph_api.exception_handler import request_exception
+from storygraph_api.request.cache import ResponseCache
+from storygraph_api.metrics import RequestEvent, emit, hooks_enabled, url_template
+from storygraph_api.tracing import Span, span
+from storygraph_api.singleflight import SingleFlight, AsyncSingleFlight
+from storygraph_api.request.ratelimit import RateLimiter, RetryPolicy, retry_delay
+
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_BASE_URL = 'https://app.thestorygraph.com'
+DEFAULT_RETRY = RetryPolicy()
+STREAM_CHUNK_SIZE = 16 * 1024
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7'
+}
+
+
+def _flight_key(url: str, params: Dict[str, Any] | None, cookies: Dict[str, str]) -> Tuple:
+    return url, tuple(sorted((params or {}).items())), tuple(sorted(cookies.items()))
+
+
+def _body_size(response: Any, stream: bool) -> int:
+    # A streamed body has not been read yet; its Content-Length is the size on
+    # the wire, before any decompression.
+    if stream:
+        return int(response.headers.get('Content-Length') or 0)
+    return len(response.content)
+
+
+def _record_request(current: Span | None, method: str, url: str, start: float, status: int | None, size: int,
+                    retries: int, cache: str | None, error: str | None = None) -> None:
+    if current is not None:
+        current.set(status=status, bytes=size, retries=retries)
+    if hooks_enabled():
+        emit(RequestEvent(method, url_template(url), url, status, time.perf_counter() - start, size, retries, cache, error))
+
+
+class Transport:
+    def __init__(self, pool_size: int = 10, headers: Dict[str, str] | None = None,
+                 cookies: Dict[str, str] | None = None, timeout: float | None = 30,
+                 cache: ResponseCache | None = None, rate_limiter: RateLimiter | None = None,
+                 retry: RetryPolicy | None = DEFAULT_RETRY, coalesce: bool = True,
+                 base_url: str = DEFAULT_BASE_URL):
+        import requests
+        from requests.adapters import HTTPAdapter
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.cookies = dict(cookies or {})
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.flight = SingleFlight() if coalesce else None
+        self.session = requests.Session()
+        # Cookies are sent per request and never stored on the session, so one
+        # shared pool can serve several accounts from several threads at once.
+        self.session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        self.session.headers.update(DEFAULT_HEADERS)
+        self.session.headers.update(headers or {})
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _merge_cookies(self, cookies: Dict[str, str] | None) -> Dict[str, str]:
+        if not cookies:
+            return self.cookies
+        return {**self.cookies, **cookies}
+
+    def _send(self, method: str, url: str, cookies: Dict[str, str] | None = None, cache: str | None = None,
+              stream: bool = False, **kwargs: Any) -> 'requests.Response':
+        with span(f"{method} {url_template(url)}", 'http', url=url, cache=cache) as current:
+            start = time.perf_counter()
+            attempt = 0
+            try:
+                while True:
+                    if self.rate_limiter is not None:
+                        self.rate_limiter.acquire()
+                    response = self.session.request(method, url, cookies=self._merge_cookies(cookies),
+                                                    timeout=self.timeout, stream=stream, **kwargs)
+                    delay = retry_delay(self.rate_limiter, self.retry, method, response.status_code, response.headers, attempt)
+                    if delay is None:
+                        break
+                    response.close()
+                    time.sleep(delay)
+                    attempt += 1
+            except Exception as e:
+                _record_request(current, method, url, start, None, 0, attempt, cache, type(e).__name__)
+                raise
+            _record_request(current, method, url, start, response.status_code, _body_size(response, stream),
+                            attempt, cache)
+        return response
+
+    @request_exception
+    def request(self, method: str, url: str, cookies: Dict[str, str] | None = None, **kwargs: Any) -> bytes:
+        response = self._send(method, url, cookies=cookies, **kwargs)
+        response.raise_for_status()
+        return response.content
+
+    @request_exception
+    def get(self, url: str, cookies: Dict[str, str] | None = None, params: Dict[str, str] | None = None) -> bytes:
+        if self.flight is None:
+            return self._get(url, cookies, params)
+        key = _flight_key(url, params, self._merge_cookies(cookies))
+        return self.flight.do(key, lambda: self._get(url, cookies, params))
+
+    def _get(self, url: str, cookies: Dict[str, str] | None, params: Dict[str, str] | None) -> bytes:
+        merged = self._merge_cookies(cookies)
+        ttl = self.cache.ttl_for(url, merged) if self.cache is not None else None
+        if ttl is None:
+            return self.request('GET', url, cookies=cookies, params=params)
+
+        key = self.cache.key(url, params, merged)
+        entry = self.cache.get(key)
+        if entry and self.cache.is_fresh(entry, ttl):
+            with span(f"GET {url_template(url)}", 'http', url=url, cache='hit') as current:
+                _record_request(current, 'GET', url, time.perf_counter(), None, len(entry.content), 0, 'hit')
+            return entry.content
+
+        headers = self.cache.conditional_headers(entry) if entry else {}
+        response = self._send('GET', url, cookies=cookies, params=params, headers=headers,
+                              cache='revalidate' if entry else 'miss')
+        if response.status_code == 304 and entry:
+            self.cache.refresh(key)
+            return entry.content
+        response.raise_for_status()
+        self.cache.set(key, url, response.content, response.headers)
+        return response.content
+
+    @request_exception
+    def stream(self, url: str, cookies: Dict[str, str] | None = None, params: Dict[str, str] | None = None,
+               chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+        # Yields the body as it arrives, already decompressed; the response
+        # cache and request coalescing only apply to get().
+        response = self._send('GET', url, cookies=cookies, params=params, stream=True)
+        with response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+
+    def post(self, url: str, cookies: Dict[str, str] | None = None, data: Dict[str, str] | None = None) -> bytes:
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        return self.request('POST', url, cookies=cookies, data=data, headers=headers)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> 'Transport':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class AsyncTransport:
+    def __init__(self, pool_size: int = 10, headers: Dict[str, str] | None = None,
+                 cookies: Dict[str, str] | None = None, timeout: float | None = 30,
+                 cache: ResponseCache | None = None, rate_limiter: RateLimiter | None = None,
+                 retry: RetryPolicy | None = DEFAULT_RETRY, coalesce: bool = True,
+                 base_url: str = DEFAULT_BASE_URL):
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("AsyncTransport requires httpx: pip install 'storygraph-api[async]'") from e
+        self.base_url = base_url.rstrip('/')
+        self.cookies = dict(cookies or {})
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.retry = retry
+        self.flight = AsyncSingleFlight() if coalesce else None
+        self.client = httpx.AsyncClient(
+            headers={**DEFAULT_HEADERS, **(headers or {})},
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        self.client.cookies.jar.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    def _cookie_header(self, cookies: Dict[str, str] | None) -> Dict[str, str]:
+        merged = {**self.cookies, **(cookies or {})}
+        if not merged:
+            return {}
+        return {'Cookie': '; '.join(f"{name}={value}" for name, value in merged.items())}
+
+    async def _send(self, method: str, url: str, cookies: Dict[str, str] | None = None,
+                    headers: Dict[str, str] | None = None, cache: str | None = None, stream: bool = False,
+                    **kwargs: Any):
+        headers = {**self._cookie_header(cookies), **(headers or {})}
+        with span(f"{method} {url_template(url)}", 'http', url=url, cache=cache) as current:
+            start = time.perf_counter()
+            attempt = 0
+            try:
+                while True:
+                    if self.rate_limiter is not None:
+                        await self.rate_limiter.aacquire()
+                    request = self.client.build_request(method, url, headers=headers, **kwargs)
+                    response = await self.client.send(request, stream=stream)
+                    delay = retry_delay(self.rate_limiter, self.retry, method, response.status_code, response.headers, attempt)
+                    if delay is None:
+                        break
+                    await response.aclose()
+                    await asyncio.sleep(delay)
+                    attempt += 1
+            except Exception as e:
+                _record_request(current, method, url, start, None, 0, attempt, cache, type(e).__name__)
+                raise
+            _record_request(current, method, url, start, response.status_code, _body_size(response, stream),
+                            attempt, cache)
+        return response
+
+    @request_exception
+    async def request(self, method: str, url: str, cookies: Dict[str, str] | None = None,
+                      headers: Dict[str, str] | None = None, **kwargs: Any) -> bytes:
+        response = await self._send(method, url, cookies=cookies, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response.content
+
+    @request_exception
+    async def get(self, url: str, cookies: Dict[str, str] | None = None, params: Dict[str, str] | None = None) -> bytes:
+        if self.flight is None:
+            return await self._get(url, cookies, params)
+        key = _flight_key(url, params, {**self.cookies, **(cookies or {})})
+        return await self.flight.do(key, lambda: self._get(url, cookies, params))
+
+    async def _get(self, url: str, cookies: Dict[str, str] | None, params: Dict[str, str] | None) -> bytes:
+        merged = {**self.cookies, **(cookies or {})}
+        ttl = self.cache.ttl_for(url, merged) if self.cache is not None else None
+        if ttl is None:
+            return await self.request('GET', url, cookies=cookies, params=params)
+
+        key = self.cache.key(url, params, merged)
+        entry = self.cache.get(key)
+        if entry and self.cache.is_fresh(entry, ttl):
+            with span(f"GET {url_template(url)}", 'http', url=url, cache='hit') as current:
+                _record_request(current, 'GET', url, time.perf_counter(), None, len(entry.content), 0, 'hit')
+            return entry.content
+
+        headers = self.cache.conditional_headers(entry) if entry else {}
+        response = await self._send('GET', url, cookies=cookies, params=params, headers=headers,
+                                    cache='revalidate' if entry else 'miss')
+        if response.status_code == 304 and entry:
+            self.cache.refresh(key)
+            return entry.content
+        response.raise_for_status()
+        self.cache.set(key, url, response.content, response.headers)
+        return response.content
+
+    @request_exception
+    async def stream(self, url: str, cookies: Dict[str, str] | None = None, params: Dict[str, str] | None = None,
+                     chunk_size: int = STREAM_CHUNK_SIZE) -> AsyncIterator[bytes]:
+        response = await self._send('GET', url, cookies=cookies, params=params, stream=True)
+        try:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes(chunk_size):
+                yield chunk
+        finally:
+            await response.aclose()
+
+    async def post(self, url: str, cookies: Dict[str, str] | None = None, data: Dict[str, str] | None = None) -> bytes:
+        headers = {'Content-Type': 'application/x-www-form-urlencoded'}
+        return await self.request('POST', url, cookies=cookies, data=data, headers=headers)
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def __aenter__(self) -> 'AsyncTransport':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+_default_transport: Transport | None = None
+_default_lock = threading.Lock()
+
+
+def default_transport() -> Transport:
+    global _default_transport
+    with _default_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
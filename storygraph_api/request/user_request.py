@@ -1,43 +1,36 @@
-import requests
-from typing import Dict
+from storygraph_api.request.transport import Transport, AsyncTransport, default_transport
+from typing import AsyncIterator, Dict, Iterator
 
 class UserScraper:
-    @staticmethod
-    def get_profile_page(username: str) -> bytes:
-        url = f"https://app.thestorygraph.com/profile/{username}"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36',
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7"
-        }
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.content
-
-    @staticmethod
-    def fetch_paginated_url(url: str, cookies: dict) -> bytes:
-        headers = {
-            'User-agent': 'mozilla/5.0 (windows nt 10.0; win64; x64) applewebkit/537.36 (khtml, like gecko) chrome/91.0.4472.124 safari/537.36'
-        }
-        response = requests.get(url, cookies=cookies, headers=headers)
-        response.raise_for_status()
-        return response.content
-
-    @staticmethod
-    def currently_reading(uname: str, cookies: Dict[str, str], page: int) -> bytes:
-        url = f"https://app.thestorygraph.com/currently-reading/{uname}?page={page}"
-        return UserScraper.fetch_paginated_url(url, cookies)
-
-    @staticmethod
-    def to_read(uname: str, cookies: Dict[str, str], page: int) -> bytes:
-        url = f"https://app.thestorygraph.com/to-read/{uname}?page={page}"
-        return UserScraper.fetch_paginated_url(url, cookies)
-
-    @staticmethod
-    def books_read(uname: str, cookies: Dict[str, str], page: int) -> bytes:
-        url = f"https://app.thestorygraph.com/books-read/{uname}?page={page}"
-        return UserScraper.fetch_paginated_url(url, cookies)
-
-    @staticmethod
-    def all_journal_entries(cookies: Dict[str, str], page: int) -> bytes:
-        url = f"https://app.thestorygraph.com/journal?page={page}"
-        return UserScraper.fetch_paginated_url(url, cookies)
+    def __init__(self, transport: Transport | AsyncTransport | None = None):
+        self.transport = transport or default_transport()
+
+    @property
+    def base_url(self) -> str:
+        return self.transport.base_url
+
+    def get_profile_page(self, username: str) -> bytes:
+        url = f"{self.base_url}/profile/{username}"
+        return self.transport.get(url)
+
+    def fetch_paginated_url(self, url: str, cookies: dict,
+                            stream: bool = False) -> bytes | Iterator[bytes] | AsyncIterator[bytes]:
+        if stream:
+            return self.transport.stream(url, cookies=cookies)
+        return self.transport.get(url, cookies=cookies)
+
+    def currently_reading(self, uname: str, cookies: Dict[str, str], page: int, stream: bool = False) -> bytes:
+        url = f"{self.base_url}/currently-reading/{uname}?page={page}"
+        return self.fetch_paginated_url(url, cookies, stream)
+
+    def to_read(self, uname: str, cookies: Dict[str, str], page: int, stream: bool = False) -> bytes:
+        url = f"{self.base_url}/to-read/{uname}?page={page}"
+        return self.fetch_paginated_url(url, cookies, stream)
+
+    def books_read(self, uname: str, cookies: Dict[str, str], page: int, stream: bool = False) -> bytes:
+        url = f"{self.base_url}/books-read/{uname}?page={page}"
+        return self.fetch_paginated_url(url, cookies, stream)
+
+    def all_journal_entries(self, cookies: Dict[str, str], page: int, stream: bool = False) -> bytes:
+        url = f"{self.base_url}/journal?page={page}"
+        return self.fetch_paginated_url(url, cookies, stream)
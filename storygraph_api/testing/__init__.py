@@ -0,0 +1,2 @@
+from .server import MockStoryGraph
+from .notion import FakeNotion, FakeNotionError
@@ -0,0 +1,179 @@
+"""Drive the clients against a local mock StoryGraph server and report latency.
+
+    python -m storygraph_api.testing.loadtest --requests 500 --concurrency 16 --latency 0.05
+    python -m storygraph_api.testing.loadtest --workload shelf --throttle-rate 0.05 --rate 20 --async
+"""
+import argparse
+import asyncio
+import math
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List
+
+from storygraph_api.books_client import Book, AsyncBook
+from storygraph_api.users_client import User, AsyncUser
+from storygraph_api.pipeline import ParsePipeline
+from storygraph_api.request.ratelimit import RateLimiter
+from storygraph_api.request.transport import Transport, AsyncTransport
+from storygraph_api.testing.server import MockStoryGraph, book_id
+
+WORKLOADS = ('book_info', 'search', 'shelf', 'journal', 'mixed')
+COOKIES = {'_storygraph_session': 'load-test', 'remember_user_token': 'load-test'}
+
+
+@dataclass(slots=True)
+class LoadReport:
+    operations: int
+    errors: int
+    duration: float
+    latencies: List[float] = field(repr=False)
+    failures: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return self.operations / self.duration if self.duration else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'operations': self.operations, 'errors': self.errors, 'duration_s': round(self.duration, 3),
+            'throughput_ops_s': round(self.throughput, 1),
+            'latency_ms': {name: round(self.percentile(q) * 1000, 1)
+                           for name, q in (('p50', 50), ('p90', 90), ('p99', 99), ('max', 100))},
+            'failures': self.failures,
+        }
+
+
+def _timed(operation: Callable[[int], Any], i: int):
+    start = time.perf_counter()
+    try:
+        operation(i)
+    except Exception as e:
+        return time.perf_counter() - start, type(e).__name__
+    return time.perf_counter() - start, None
+
+
+def run_load(operation: Callable[[int], Any], operations: int, concurrency: int) -> LoadReport:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda i: _timed(operation, i), range(operations)))
+    return _report(results, time.perf_counter() - start)
+
+
+async def arun_load(operation: Callable[[int], Awaitable[Any]], operations: int, concurrency: int) -> LoadReport:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await operation(i)
+            except Exception as e:
+                return time.perf_counter() - start, type(e).__name__
+            return time.perf_counter() - start, None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(timed(i) for i in range(operations)))
+    return _report(results, time.perf_counter() - start)
+
+
+def _report(results, duration: float) -> LoadReport:
+    failures = Counter(error for _, error in results if error is not None)
+    return LoadReport(operations=len(results), errors=sum(failures.values()), duration=duration,
+                      latencies=[latency for latency, _ in results], failures=dict(failures))
+
+
+def _operations(book, user, workload: str, library_size: int) -> List[Callable[[int], Any]]:
+    table = {
+        'book_info': lambda i: book.book_info(book_id(i % library_size)),
+        'search': lambda i: book.search(f"book {i % library_size}"),
+        'shelf': lambda i: user.books_read('reader', COOKIES),
+        'journal': lambda i: user.get_all_journal_entries(COOKIES),
+    }
+    if workload == 'mixed':
+        return list(table.values())
+    return [table[workload]]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workload', choices=WORKLOADS, default='book_info')
+    parser.add_argument('--requests', type=int, default=200, help='client operations to run')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--async', dest='use_async', action='store_true', help='use AsyncBook/AsyncUser')
+    parser.add_argument('--base-url', help='target an already running server instead of starting a mock')
+    parser.add_argument('--latency', type=float, default=0.02, help='mock server latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='fraction of responses that are 429s')
+    parser.add_argument('--retry-after', type=float, default=0.2)
+    parser.add_argument('--library-size', type=int, default=500)
+    parser.add_argument('--journal-size', type=int, default=300)
+    parser.add_argument('--chrome-kb', type=int, default=0, help='site layout added to every page')
+    parser.add_argument('--gzip', action='store_true', help='mock server compresses pages')
+    parser.add_argument('--bandwidth-kb', type=float, default=0.0, help='mock server send rate per response in KB/s')
+    parser.add_argument('--stream', action='store_true', help='parse shelf and journal pages while they download')
+    parser.add_argument('--parse-workers', type=int, default=0, help='parse in a process pool of this size (sync only)')
+    parser.add_argument('--rate', type=float, help='client-side rate limit in requests per second')
+    parser.add_argument('--no-coalesce', action='store_true')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    mock = None
+    base_url = args.base_url
+    if base_url is None:
+        mock = MockStoryGraph(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                              throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+                              library_size=args.library_size, journal_size=args.journal_size,
+                              chrome_kb=args.chrome_kb, seed=args.seed, compress=args.gzip,
+                              bandwidth_kb=args.bandwidth_kb).start()
+        base_url = mock.base_url
+
+    options = dict(pool_size=args.concurrency, base_url=base_url, coalesce=not args.no_coalesce,
+                   rate_limiter=RateLimiter(args.rate) if args.rate else None)
+    try:
+        if args.use_async:
+            report = asyncio.run(_run_async(options, args))
+        else:
+            pipeline = ParsePipeline(args.parse_workers, fetch_workers=args.concurrency) if args.parse_workers else None
+            with Transport(**options) as transport:
+                book = Book(transport, native=True, pipeline=pipeline)
+                user = User(transport, native=True, stream=args.stream, pipeline=pipeline)
+                operations = _operations(book, user, args.workload, args.library_size)
+                try:
+                    report = run_load(lambda i: operations[i % len(operations)](i), args.requests, args.concurrency)
+                finally:
+                    if pipeline is not None:
+                        pipeline.close()
+    finally:
+        if mock is not None:
+            mock.stop()
+
+    summary = report.to_dict()
+    print(f"{summary['operations']} operations in {summary['duration_s']} s "
+          f"({summary['throughput_ops_s']} ops/s), {summary['errors']} errors")
+    print('latency ms: ' + '  '.join(f"{name} {value}" for name, value in summary['latency_ms'].items()))
+    if summary['failures']:
+        print('failures: ' + ', '.join(f"{name} x{count}" for name, count in summary['failures'].items()))
+    if mock is not None:
+        stats = mock.stats()
+        print(f"upstream requests: {stats['requests']}  statuses: {stats['statuses']}")
+    return 0
+
+
+async def _run_async(options: Dict[str, Any], args) -> LoadReport:
+    async with AsyncTransport(**options) as transport:
+        book, user = AsyncBook(transport, native=True), AsyncUser(transport, native=True, stream=args.stream)
+        operations = _operations(book, user, args.workload, args.library_size)
+        return await arun_load(lambda i: operations[i % len(operations)](i), args.requests, args.concurrency)
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
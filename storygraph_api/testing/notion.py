@@ -0,0 +1,91 @@
+import threading
+import time
+import uuid
+from collections import Counter, defaultdict
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+
+class FakeNotionError(Exception):
+    # Shaped like notion_client.APIResponseError: status, code and headers.
+    def __init__(self, status: int, code: str, message: str, headers: Dict[str, str] | None = None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.headers = headers or {}
+
+
+def _rich_text(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [{'type': 'text', 'text': item['text'], 'plain_text': item['text']['content']} for item in items]
+
+
+def _response_property(value: Dict[str, Any]) -> Dict[str, Any]:
+    if 'title' in value:
+        return {'type': 'title', 'title': _rich_text(value['title'])}
+    if 'rich_text' in value:
+        return {'type': 'rich_text', 'rich_text': _rich_text(value['rich_text'])}
+    if 'date' in value:
+        return {'type': 'date', 'date': {'start': value['date']['start'], 'end': None, 'time_zone': None}}
+    if 'number' in value:
+        return {'type': 'number', 'number': value['number']}
+    return value
+
+
+class FakeNotion:
+    # Implements only what NotionSync uses: databases.query and pages.create.
+    def __init__(self, latency: float = 0.0, throttle_every: int = 0, retry_after: float = 0.0):
+        self.latency = latency
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self.pages_by_database: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        self.calls: Counter = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.databases = SimpleNamespace(query=self._query)
+        self.pages = SimpleNamespace(create=self._create)
+
+    def add_page(self, database_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        page = {'object': 'page', 'id': str(uuid.uuid4()), 'parent': {'database_id': database_id},
+                'properties': {name: _response_property(value) for name, value in properties.items()}}
+        with self._lock:
+            self.pages_by_database[database_id].append(page)
+        return page
+
+    def _enter(self, name: str) -> None:
+        with self._lock:
+            self.calls[name] += 1
+            throttled = self.throttle_every and sum(self.calls.values()) % self.throttle_every == 0
+            if not throttled:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if throttled:
+            raise FakeNotionError(429, 'rate_limited', 'Rate limited', {'Retry-After': str(self.retry_after)})
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+
+    def _query(self, database_id: str, start_cursor: str | None = None, page_size: int = 100,
+               **kwargs: Any) -> Dict[str, Any]:
+        if 'filter' in kwargs or 'sorts' in kwargs:
+            raise NotImplementedError("FakeNotion does not support filters or sorts.")
+        self._enter('databases.query')
+        try:
+            with self._lock:
+                pages = list(self.pages_by_database[database_id])
+            start = int(start_cursor or 0)
+            end = start + min(page_size, 100)
+            return {'object': 'list', 'results': pages[start:end], 'has_more': end < len(pages),
+                    'next_cursor': str(end) if end < len(pages) else None}
+        finally:
+            self._exit()
+
+    def _create(self, parent: Dict[str, str], properties: Dict[str, Any], **kwargs: Any) -> Dict[str, Any]:
+        self._enter('pages.create')
+        try:
+            return self.add_page(parent['database_id'], properties)
+        finally:
+            self._exit()
@@ -0,0 +1,227 @@
+import gzip
+import hashlib
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from storygraph_api.testing import templates
+
+SHELF_PAGE_SIZE = 10
+JOURNAL_PAGE_SIZE = 10
+SHELVES = ('books-read', 'to-read', 'currently-reading')
+TRICKLE_SIZE = 4096
+
+
+def book_id(index: int) -> str:
+    return f"book-{index:04d}"
+
+
+class MockStoryGraph:
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: float = 1,
+                 library_size: int = 100, journal_size: int = 200, chrome_kb: int = 0, seed: int | None = None,
+                 compress: bool = False, bandwidth_kb: float = 0.0):
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.library_size = library_size
+        self.journal_size = journal_size
+        self.chrome = templates.site_chrome(chrome_kb)
+        # gzip pages for clients that accept it, and trickle bodies out at
+        # bandwidth_kb KB/s so streamed parsing has a download to overlap with.
+        self.compress = compress
+        self.bandwidth_kb = bandwidth_kb
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests: Counter = Counter()
+        self._statuses: Counter = Counter()
+        self._in_flight = 0
+        self._max_in_flight = 0
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("The mock server is not running; call start() first.")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockStoryGraph':
+        handler = type('Handler', (_Handler,), {'mock': self})
+        self._server = ThreadingHTTPServer((self.host, self.port), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name='mock-storygraph', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self) -> 'MockStoryGraph':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'requests': sum(self._requests.values()), 'routes': dict(self._requests),
+                    'statuses': dict(self._statuses), 'max_in_flight': self._max_in_flight}
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._requests.clear()
+            self._statuses.clear()
+            self._max_in_flight = self._in_flight
+
+    def _enter(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self._max_in_flight = max(self._max_in_flight, self._in_flight)
+
+    def _exit(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def shelf(self, name: str) -> List[str]:
+        # 60% read, 30% to read and 10% currently reading.
+        read = self.library_size * 6 // 10
+        to_read = self.library_size * 3 // 10
+        bounds = {'books-read': (0, read), 'to-read': (read, read + to_read),
+                  'currently-reading': (read + to_read, self.library_size)}
+        start, end = bounds[name]
+        return [book_id(i) for i in range(start, end)]
+
+    def journal(self) -> List[Dict[str, Any]]:
+        statuses = ('Finished', None, 'Started reading')
+        newest = date(2024, 12, 31)
+        return [{'book_id': book_id(i % max(1, self.library_size)), 'date': newest - timedelta(days=i // 3),
+                 'status': statuses[i % 3], 'progress': (i * 7) % 100} for i in range(self.journal_size)]
+
+    def _roll(self) -> Tuple[float, int | None]:
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            roll = self._random.random()
+        if roll < self.throttle_rate:
+            return delay, 429
+        if roll < self.throttle_rate + self.error_rate:
+            return delay, 500
+        return delay, None
+
+    def _record(self, route: str, status: int) -> None:
+        with self._lock:
+            self._requests[route] += 1
+            self._statuses[status] += 1
+
+    def render(self, method: str, path: str, query: Dict[str, str]) -> Tuple[str, bytes | None]:
+        page = int(query.get('page') or 1)
+        if method == 'POST' and path in ('/edit-read-instance-from-book', '/edit-journal-entry-from-book'):
+            return 'edit_form', templates.read_instance_form(query.get('book_id', ''))
+        if method != 'GET':
+            return 'unknown', None
+
+        if match := re.fullmatch(r'/books/([^/]+)', path):
+            return 'book', templates.book_page(match.group(1), self.chrome)
+        if match := re.fullmatch(r'/books/([^/]+)/community_reviews', path):
+            return 'community_reviews', templates.community_reviews(match.group(1), self.chrome)
+        if match := re.fullmatch(r'/books/([^/]+)/content_warnings', path):
+            return 'content_warnings', templates.content_warnings(match.group(1), self.chrome)
+        if path == '/browse':
+            return 'browse', templates.search(query.get('search_term', ''), self.library_size, self.chrome)
+        if path == '/personalized-preview.turbo_stream':
+            return 'summary', templates.summary(query.get('book_id', ''))
+        if match := re.fullmatch(r'/profile/([^/]+)', path):
+            return 'profile', templates.profile(match.group(1), self.chrome)
+        if match := re.fullmatch(r'/(books-read|to-read|currently-reading)/([^/]+)', path):
+            books = self.shelf(match.group(1))
+            start = (page - 1) * SHELF_PAGE_SIZE
+            return match.group(1), templates.shelf(books[start:start + SHELF_PAGE_SIZE], self.chrome)
+        if path == '/journal':
+            if 'book_id' in query:
+                entries = [entry for entry in self.journal() if entry['book_id'] == query['book_id']]
+                return 'book_journal', templates.book_journal(entries, self.chrome)
+            start = (page - 1) * JOURNAL_PAGE_SIZE
+            return 'journal', templates.journal(self.journal()[start:start + JOURNAL_PAGE_SIZE], self.chrome)
+        return 'unknown', None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out in separate writes; without this, delayed ACKs
+    # add about 40 ms to every keep-alive response.
+    disable_nagle_algorithm = True
+    mock: MockStoryGraph
+
+    def do_GET(self) -> None:
+        self._respond('GET')
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get('Content-Length') or 0)
+        if length:
+            self.rfile.read(length)
+        self._respond('POST')
+
+    def _respond(self, method: str) -> None:
+        self.mock._enter()
+        try:
+            self._send_page(method)
+        finally:
+            self.mock._exit()
+
+    def _send_page(self, method: str) -> None:
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        route, body = self.mock.render(method, url.path, query)
+        delay, injected = self.mock._roll()
+        if delay:
+            time.sleep(delay)
+
+        headers = {'Content-Type': 'text/vnd.turbo-stream.html' if route == 'summary' else 'text/html; charset=utf-8'}
+        if body is None:
+            status, body = 404, b'Not Found'
+        elif injected == 429:
+            status, body = 429, b'Too Many Requests'
+            headers['Retry-After'] = str(self.mock.retry_after)
+        elif injected is not None:
+            status, body = injected, b'Internal Server Error'
+        else:
+            etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+            headers['ETag'] = etag
+            status = 304 if self.headers.get('If-None-Match') == etag else 200
+            if status == 304:
+                body = b''
+            elif self.mock.compress and 'gzip' in self.headers.get('Accept-Encoding', ''):
+                body = gzip.compress(body)
+                headers['Content-Encoding'] = 'gzip'
+
+        self.mock._record(route, status)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not self.mock.bandwidth_kb:
+            self.wfile.write(body)
+            return
+        for start in range(0, len(body), TRICKLE_SIZE):
+            self.wfile.write(body[start:start + TRICKLE_SIZE])
+            self.wfile.flush()
+            time.sleep(TRICKLE_SIZE / (self.mock.bandwidth_kb * 1024))
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
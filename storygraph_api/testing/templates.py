@@ -0,0 +1,175 @@
+import hashlib
+import json
+from datetime import date
+from html import escape
+from typing import Any, Dict, List
+
+PAGE = ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{title} | The StoryGraph</title></head>'
+        '<body class="bg-white dark:bg-darkestGrey">{chrome}<main class="max-w-6xl mx-auto">{body}</main>'
+        '<footer><p>The StoryGraph</p></footer></body></html>')
+
+TAGS = ('fiction', 'nonfiction', 'fantasy', 'science fiction', 'mystery', 'adventurous', 'dark', 'emotional',
+        'funny', 'hopeful', 'challenging', 'fast-paced', 'medium-paced', 'slow-paced')
+
+
+def site_chrome(kb: int) -> str:
+    """Navigation, menus and inline scripts roughly the size of the live site's layout."""
+    if kb <= 0:
+        return ''
+    parts = ['<header class="site-header"><nav class="top-nav"><ul>']
+    size = 0
+    i = 0
+    while size < kb * 1024:
+        item = (f'<li class="nav-item px-2"><a class="text-sm hover:underline" href="/browse?page={i}">'
+                f'<span class="icon icon-{i % 7}"></span>Menu entry {i}</a>'
+                f'<div class="dropdown hidden"><a href="/genres/{i}">Genre {i}</a><a href="/moods/{i}">Mood {i}</a></div></li>')
+        parts.append(item)
+        size += len(item)
+        i += 1
+        if i % 40 == 0:
+            script = '<script>window.__state_%d = %s;</script>' % (i, json.dumps({'flags': list(range(30))}))
+            parts.append(script)
+            size += len(script)
+    parts.append('</ul></nav></header>')
+    return ''.join(parts)
+
+
+def _page(title: str, body: str, chrome: str = '') -> bytes:
+    return PAGE.format(title=escape(title), chrome=chrome, body=body).encode()
+
+
+def book_details(book_id: str) -> Dict[str, Any]:
+    seed = int(hashlib.sha1(book_id.encode()).hexdigest(), 16)
+    number = book_id.rsplit('-', 1)[-1]
+    return {
+        'title': f"Book Number {int(number) if number.isdigit() else number}",
+        'authors': [f"Author {seed % 97}"] + ([f"Author {seed % 89}"] if seed % 3 == 0 else []),
+        'pages': 120 + seed % 700,
+        'first_pub': 1900 + seed % 124,
+        'tags': [TAGS[(seed >> shift) % len(TAGS)] for shift in (0, 4, 8, 12)],
+        'rating': f"{2.5 + (seed % 250) / 100:.2f}",
+        'progress': seed % 101,
+    }
+
+
+def book_page(book_id: str, chrome: str = '') -> bytes:
+    book = book_details(book_id)
+    authors = ', '.join(f'<a href="/authors/{escape(name.lower().replace(" ", "-"))}">{escape(name)}</a>'
+                        for name in book['authors'])
+    tags = ''.join(f'<span>{escape(tag)}</span>' for tag in dict.fromkeys(book['tags']))
+    description = f"{escape(book['title'])} is a synthetic book served by the mock StoryGraph server."
+    body = (
+        '<div class="book-title-author-and-series">'
+        f'<h3 class="font-serif font-bold text-2xl md:w-11/12">{escape(book["title"])}'
+        f'<p class="font-body">{authors}</p></h3>'
+        f'<p class="text-sm font-light text-darkestGrey dark:text-grey mt-1">{book["pages"]} pages'
+        '<span class="mx-1">•</span>format: <span>paperback</span><span class="mx-1">•</span>'
+        f'<span>first pub {book["first_pub"]}</span></p></div>'
+        f'<div class="book-cover"><img alt="{escape(book["title"])}" src="https://cdn.thestorygraph.com/covers/{escape(book_id)}.jpg"></div>'
+        f'<div class="book-page-tag-section">{tags}</div>'
+        '<div class="read-status-wrapper"><button class="read-status-label">currently reading</button>'
+        f'<div class="progress-bar"><span>{book["progress"]}%</span></div>'
+        f'<a href="/edit-read-instance-from-book?book_id={escape(book_id)}&amp;read_instance_id=ri-{escape(book_id)}">Edit read dates</a></div>'
+        '<div class="blurb-pane"><div class="trix-content">Loading...</div><button class="read-more-btn">Read more</button></div>'
+        "<script>$('.read-more-btn').click(function() {"
+        f"$('.blurb-pane').html('<div class=\"trix-content\">{description}<\\/div>');"
+        '});</script>'
+    )
+    return _page(book['title'], body, chrome)
+
+
+def community_reviews(book_id: str, chrome: str = '') -> bytes:
+    book = book_details(book_id)
+    body = ('<div class="community-reviews-header">'
+            f'<h4>{escape(book["title"])}</h4><span class="average-star-rating"> {book["rating"]} </span></div>')
+    return _page('Community Reviews', body, chrome)
+
+
+def content_warnings(book_id: str, chrome: str = '') -> bytes:
+    seed = int(hashlib.sha1(book_id.encode()).hexdigest(), 16)
+    groups = ''.join(f'<p>{level}</p><div>Warning {(seed >> i) % 40} ({i + 3})</div>'
+                     for i, level in enumerate(('Graphic', 'Moderate', 'Minor')))
+    body = ('<div class="standard-pane"><p class="font-semibold">Author-provided warnings</p><p>None provided</p></div>'
+            f'<div class="standard-pane">{groups}</div>')
+    return _page('Content Warnings', body, chrome)
+
+
+def _search_pane(book_id: str) -> str:
+    book = book_details(book_id)
+    return ('<div class="book-pane"><div class="book-title-author-and-series w-11/12">'
+            f'<h3><a href="/books/{escape(book_id)}">{escape(book["title"])}</a></h3>'
+            f'<p><a href="/authors/a">{escape(book["authors"][0])}</a></p></div></div>')
+
+
+def search(query: str, library_size: int, chrome: str = '') -> bytes:
+    digits = ''.join(ch for ch in query if ch.isdigit())
+    start = int(digits) % library_size if digits and library_size else 0
+    ids = [f"book-{(start + i) % max(1, library_size):04d}" for i in range(min(10, library_size))]
+    body = f'<div class="search-results-books-panes">{"".join(_search_pane(book_id) for book_id in ids)}</div>'
+    return _page('Browse', body, chrome)
+
+
+def summary(book_id: str) -> bytes:
+    book = book_details(book_id)
+    return ('<turbo-stream action="replace" target="personalized-preview"><template>'
+            f'<div class="personalized-preview"><p> A synthetic summary of {escape(book["title"])}. </p></div>'
+            '</template></turbo-stream>').encode()
+
+
+def profile(username: str, chrome: str = '') -> bytes:
+    user_id = 'u-' + hashlib.sha1(username.encode()).hexdigest()[:6]
+    body = f'<div id="profile-heading-pane" data-user-id="{user_id}"><h3>{escape(username)}</h3></div>'
+    return _page(f"{username}'s profile", body, chrome)
+
+
+def shelf(book_ids: List[str], chrome: str = '') -> bytes:
+    panes = []
+    for book_id in book_ids:
+        book = book_details(book_id)
+        panes.append('<div class="book-pane"><div class="book-title-author-and-series">'
+                     f'<h3><a href="/books/{escape(book_id)}">{escape(book["title"])}</a></h3>'
+                     f'<p><a href="/authors/a">{escape(book["authors"][0])}</a></p></div>'
+                     f'<div class="book-cover"><img src="https://cdn.thestorygraph.com/covers/{escape(book_id)}.jpg"></div></div>')
+    return _page('Books', f'<div class="books-list">{"".join(panes)}</div>', chrome)
+
+
+def _journal_date(day: date) -> str:
+    return f"{day.day} {day:%B %Y}"
+
+
+def _entry_details(entry: Dict[str, Any]) -> str:
+    book = book_details(entry['book_id'])
+    if entry['status'] is not None:
+        return f'<span class="inline-flex items-center px-2">{entry["status"]}</span>'
+    read = book['pages'] * entry['progress'] // 100
+    return (f'<div class="text-teal-500">{entry["progress"]}%</div>'
+            f'<p class="clear-both text-sm">{read // 2} pages read ({read} pages out of {book["pages"]})</p>')
+
+
+def journal(entries: List[Dict[str, Any]], chrome: str = '') -> bytes:
+    panes = []
+    for entry in entries:
+        book = book_details(entry['book_id'])
+        panes.append('<div class="mb-7"><p class="font-semibold text-sm md:text-base font-semibold">'
+                     f'<a href="/books/{escape(entry["book_id"])}">{escape(book["title"])}</a></p>'
+                     f'<p class="font-semibold text-xs md:text-sm">{_journal_date(entry["date"])}\n'
+                     f'<span class="font-normal">edited</span></p>{_entry_details(entry)}</div>')
+    return _page('Journal', f'<div class="journal-entries">{"".join(panes)}</div>', chrome)
+
+
+def book_journal(entries: List[Dict[str, Any]], chrome: str = '') -> bytes:
+    panes = [f'<div class="grid grid-cols-4 gap-2"><p class="font-semibold">{_journal_date(entry["date"])}\n'
+             f'<span>edit</span></p>{_entry_details(entry)}</div>' for entry in reversed(entries)]
+    return _page('Journal', f'<span class="journal-entry-panes">{"".join(panes)}</span>', chrome)
+
+
+def read_instance_form(book_id: str) -> bytes:
+    seed = int(hashlib.sha1(book_id.encode()).hexdigest(), 16)
+    start = (1 + seed % 28, 1 + seed % 12, 2020 + seed % 5)
+    finish = (1 + seed % 28, 1 + seed % 12, start[2] + 1)
+    selects = []
+    for prefix, (day, month, year) in (('read_instance_start', start), ('read_instance', finish)):
+        selects.append(f'<select id="{prefix}_day"><option value="{day}" selected>{day}</option></select>'
+                       f'<select id="{prefix}_month"><option value="{month}" selected>{month}</option></select>'
+                       f'<select id="{prefix}_year"><option value="{year}" selected>{year}</option></select>')
+    return f'<form>{"".join(selects)}</form>'.encode()
@@ -0,0 +1,150 @@
+import itertools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, ContextManager, Dict, Iterator, List
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future
+
+_ids = itertools.count(1)
+_current: ContextVar['Span | None'] = ContextVar('storygraph_span', default=None)
+_tracer: 'Tracer | None' = None
+# Shared by every span opened while tracing is off; yields None.
+_NO_SPAN = nullcontext()
+
+
+@dataclass(slots=True)
+class Span:
+    name: str
+    category: str
+    span_id: int
+    parent_id: int | None
+    lane: int
+    start: int
+    end: int | None = None
+    attrs: Dict[str, Any] = field(default_factory=dict)
+
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+
+    @property
+    def duration(self) -> float:
+        return ((self.end or time.perf_counter_ns()) - self.start) / 1e9
+
+
+class Tracer:
+    def __init__(self):
+        self.spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def record(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+    def tree(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+        nodes = {span.span_id: {'name': span.name, 'category': span.category,
+                                'duration_ms': round(span.duration * 1000, 3), 'attrs': dict(span.attrs),
+                                'children': []} for span in spans}
+        roots = []
+        for span in spans:
+            parent = nodes.get(span.parent_id)
+            (parent['children'] if parent else roots).append(nodes[span.span_id])
+        return roots
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        # Complete ("X") events nest by time on each lane. Threads and asyncio
+        # tasks get lanes of their own so concurrent spans never interleave.
+        with self._lock:
+            spans = list(self.spans)
+        pid = os.getpid()
+        origin = min((span.start for span in spans), default=0)
+        events = [{
+            'name': span.name, 'cat': span.category, 'ph': 'X', 'pid': pid, 'tid': span.lane,
+            'ts': (span.start - origin) / 1000, 'dur': ((span.end or span.start) - span.start) / 1000,
+            'args': {**span.attrs, 'span_id': span.span_id, 'parent_id': span.parent_id},
+        } for span in spans]
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def enable_tracing(tracer: Tracer | None = None) -> Tracer:
+    global _tracer
+    _tracer = tracer or Tracer()
+    return _tracer
+
+
+def disable_tracing() -> None:
+    global _tracer
+    _tracer = None
+
+
+def tracing_enabled() -> bool:
+    return _tracer is not None
+
+
+@contextmanager
+def trace(path: str | None = None) -> Iterator[Tracer]:
+    tracer = enable_tracing()
+    try:
+        yield tracer
+    finally:
+        disable_tracing()
+        if path is not None:
+            tracer.export(path)
+
+
+def _lane() -> int:
+    # No task can be running unless asyncio is loaded, and importing it here
+    # would cost every synchronous caller.
+    asyncio = sys.modules.get('asyncio')
+    try:
+        task = asyncio.current_task() if asyncio is not None else None
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+def span(name: str, category: str = 'function', **attrs: Any) -> ContextManager[Span | None]:
+    # Untraced calls skip the generator below; its setup costs more than
+    # the small parsers it would wrap.
+    tracer = _tracer
+    if tracer is None:
+        return _NO_SPAN
+    return _span(tracer, name, category, attrs)
+
+
+@contextmanager
+def _span(tracer: Tracer, name: str, category: str, attrs: Dict[str, Any]) -> Iterator[Span]:
+    parent = _current.get()
+    current = Span(name, category, next(_ids), parent.span_id if parent else None, _lane(),
+                   time.perf_counter_ns(), attrs=attrs)
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.attrs['error'] = type(e).__name__
+        raise
+    finally:
+        current.end = time.perf_counter_ns()
+        _current.reset(token)
+        tracer.record(current)
+
+
+def submit(pool: 'Executor', fn: Callable[..., Any], *args: Any) -> 'Future':
+    # Worker threads start with an empty context; carry the caller's span over.
+    return pool.submit(copy_context().run, fn, *args)
@@ -1,51 +1,215 @@
-from storygraph_api.parse.user_parser import UserParser
+from storygraph_api.parse.user_parser import UserParser, ShelfStream, JournalStream
 from storygraph_api.request.user_request import UserScraper
+from storygraph_api.request.transport import Transport, AsyncTransport
 from storygraph_api.exception_handler import handle_exceptions
+from storygraph_api.pagination import iter_pages, aiter_pages, stream_pages, astream_pages
+from storygraph_api.memo import ResultCache, MISS, memo_get, memo_set
+from storygraph_api.models import JournalEntry, JournalSync, ShelfEntry, encode
+from storygraph_api.journal import new_entries, reached_cursor, advance_cursor
 import json
+from contextlib import aclosing, closing
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, Iterator, Mapping
+
+if TYPE_CHECKING:
+    from storygraph_api.pipeline import ParsePipeline
+
+def _journal_sync(entries: list, cursor: Mapping[str, Any] | None, native: bool):
+    next_cursor = advance_cursor(cursor, entries)
+    if native:
+        return JournalSync([JournalEntry(**entry) for entry in entries], next_cursor)
+    return json.dumps({'entries': entries, 'cursor': next_cursor}, indent=4)
 
 class User:
+    def __init__(self, transport: Transport | None = None, page_window: int = 1,
+                 memo: ResultCache | None = None, native: bool = False, stream: bool = False,
+                 pipeline: 'ParsePipeline | None' = None):
+        self.memo = memo
+        self.native = native
+        self.scraper = UserScraper(transport)
+        self.page_window = page_window
+        self.stream = stream
+        self.pipeline = pipeline
+
     @handle_exceptions
     def get_user_id(self, username: str) -> str:
-        data = UserParser.get_user_id(username)
+        data = memo_get(self.memo, 'get_user_id', username)
+        if data is MISS:
+            content = self.scraper.get_profile_page(username)
+            data = UserParser.get_user_id(content, username)
+            memo_set(self.memo, 'get_user_id', username, data)
+        if self.native:
+            return data['user_id']
         return json.dumps(data, indent=4)
 
+    def _pages(self, fetch_page, parse):
+        if self.pipeline is not None:
+            return self.pipeline.pages(fetch_page, parse)
+        return iter_pages(fetch_page, parse, self.page_window)
+
+    def _iter_paginated_books(self, fetch_function, uname, cookies):
+        if self.stream:
+            yield from stream_pages(lambda page: fetch_function(uname, cookies, page, stream=True), ShelfStream)
+            return
+        for books in self._pages(lambda page: fetch_function(uname, cookies, page), UserParser.parse_html):
+            yield from books
+
     def _fetch_paginated_books(self, fetch_function, uname, cookies):
-        all_books = []
-        page = 1
-        while True:
-            content = fetch_function(uname, cookies, page)
-            books = UserParser.parse_html(content)
-            if not books:
-                break
-            all_books.extend(books)
-            page += 1
-        return all_books
+        return list(self._iter_paginated_books(fetch_function, uname, cookies))
+
+    def _iter_journal_entries(self, cookies):
+        if self.stream:
+            yield from stream_pages(lambda page: self.scraper.all_journal_entries(cookies, page, stream=True),
+                                    JournalStream)
+            return
+        for entries in self._pages(lambda page: self.scraper.all_journal_entries(cookies, page),
+                                   UserParser.all_journal_entries):
+            yield from entries
+
+    def _records(self, records, model):
+        if not self.native:
+            return records
+        return (model(**record) for record in records)
+
+    def iter_currently_reading(self, uname: str, cookies: Dict[str, str]) -> Iterator[Dict[str, str] | ShelfEntry]:
+        return self._records(self._iter_paginated_books(self.scraper.currently_reading, uname, cookies), ShelfEntry)
+
+    def iter_to_read(self, uname: str, cookies: Dict[str, str]) -> Iterator[Dict[str, str] | ShelfEntry]:
+        return self._records(self._iter_paginated_books(self.scraper.to_read, uname, cookies), ShelfEntry)
+
+    def iter_books_read(self, uname: str, cookies: Dict[str, str]) -> Iterator[Dict[str, str] | ShelfEntry]:
+        return self._records(self._iter_paginated_books(self.scraper.books_read, uname, cookies), ShelfEntry)
+
+    def iter_journal_entries(self, cookies: Dict[str, str]) -> Iterator[Dict[str, Any] | JournalEntry]:
+        return self._records(self._iter_journal_entries(cookies), JournalEntry)
 
     @handle_exceptions
     def currently_reading(self, uname, cookies):
-        data = self._fetch_paginated_books(UserScraper.currently_reading, uname, cookies)
-        return json.dumps(data, indent=4)
+        data = self._fetch_paginated_books(self.scraper.currently_reading, uname, cookies)
+        return encode(data, ShelfEntry, self.native)
 
     @handle_exceptions
     def to_read(self, uname, cookies):
-        data = self._fetch_paginated_books(UserScraper.to_read, uname, cookies)
-        return json.dumps(data, indent=4)
+        data = self._fetch_paginated_books(self.scraper.to_read, uname, cookies)
+        return encode(data, ShelfEntry, self.native)
 
     @handle_exceptions
     def books_read(self, uname, cookies):
-        data = self._fetch_paginated_books(UserScraper.books_read, uname, cookies)
-        return json.dumps(data, indent=4)
+        data = self._fetch_paginated_books(self.scraper.books_read, uname, cookies)
+        return encode(data, ShelfEntry, self.native)
 
     @handle_exceptions
     def get_all_journal_entries(self, cookies):
-        all_entries = []
-        page = 1
-        while True:
-            content = UserScraper.all_journal_entries(cookies, page)
-            entries = UserParser.all_journal_entries(content)
-            if not entries:
-                break
-            all_entries.extend(entries)
-            page += 1
-        return json.dumps(all_entries, indent=4)
-    
+        all_entries = list(self._iter_journal_entries(cookies))
+        return encode(all_entries, JournalEntry, self.native)
+
+    @handle_exceptions
+    def sync_journal_entries(self, cookies: Dict[str, str], cursor: Mapping[str, Any] | None = None):
+        with closing(self._iter_journal_entries(cookies)) as journal:
+            entries = list(new_entries(journal, cursor))
+        return _journal_sync(entries, cursor, self.native)
+
+
+class AsyncUser:
+    def __init__(self, transport: AsyncTransport | None = None, page_window: int = 1,
+                 memo: ResultCache | None = None, native: bool = False, stream: bool = False):
+        self.memo = memo
+        self.native = native
+        self.page_window = page_window
+        self.stream = stream
+        self._owns_transport = transport is None
+        self.transport = transport or AsyncTransport()
+        self.scraper = UserScraper(self.transport)
+
+    async def aclose(self) -> None:
+        if self._owns_transport:
+            await self.transport.aclose()
+
+    async def __aenter__(self) -> 'AsyncUser':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    @handle_exceptions
+    async def get_user_id(self, username: str) -> str:
+        data = memo_get(self.memo, 'get_user_id', username)
+        if data is MISS:
+            content = await self.scraper.get_profile_page(username)
+            data = UserParser.get_user_id(content, username)
+            memo_set(self.memo, 'get_user_id', username, data)
+        if self.native:
+            return data['user_id']
+        return json.dumps(data, indent=4)
+
+    async def _iter_paginated_books(self, fetch_function, uname, cookies):
+        if self.stream:
+            async for book in astream_pages(lambda page: fetch_function(uname, cookies, page, stream=True),
+                                            ShelfStream):
+                yield book
+            return
+        async for books in aiter_pages(lambda page: fetch_function(uname, cookies, page),
+                                       UserParser.parse_html, self.page_window):
+            for book in books:
+                yield book
+
+    async def _fetch_paginated_books(self, fetch_function, uname, cookies):
+        return [book async for book in self._iter_paginated_books(fetch_function, uname, cookies)]
+
+    async def _iter_journal_entries(self, cookies):
+        if self.stream:
+            async for entry in astream_pages(lambda page: self.scraper.all_journal_entries(cookies, page, stream=True),
+                                             JournalStream):
+                yield entry
+            return
+        async for entries in aiter_pages(lambda page: self.scraper.all_journal_entries(cookies, page),
+                                         UserParser.all_journal_entries, self.page_window):
+            for entry in entries:
+                yield entry
+
+    def _records(self, records, model):
+        if not self.native:
+            return records
+        return (model(**record) async for record in records)
+
+    def iter_currently_reading(self, uname: str, cookies: Dict[str, str]) -> AsyncIterator[Dict[str, str] | ShelfEntry]:
+        return self._records(self._iter_paginated_books(self.scraper.currently_reading, uname, cookies), ShelfEntry)
+
+    def iter_to_read(self, uname: str, cookies: Dict[str, str]) -> AsyncIterator[Dict[str, str] | ShelfEntry]:
+        return self._records(self._iter_paginated_books(self.scraper.to_read, uname, cookies), ShelfEntry)
+
+    def iter_books_read(self, uname: str, cookies: Dict[str, str]) -> AsyncIterator[Dict[str, str] | ShelfEntry]:
+        return self._records(self._iter_paginated_books(self.scraper.books_read, uname, cookies), ShelfEntry)
+
+    def iter_journal_entries(self, cookies: Dict[str, str]) -> AsyncIterator[Dict[str, Any] | JournalEntry]:
+        return self._records(self._iter_journal_entries(cookies), JournalEntry)
+
+    @handle_exceptions
+    async def currently_reading(self, uname, cookies):
+        data = await self._fetch_paginated_books(self.scraper.currently_reading, uname, cookies)
+        return encode(data, ShelfEntry, self.native)
+
+    @handle_exceptions
+    async def to_read(self, uname, cookies):
+        data = await self._fetch_paginated_books(self.scraper.to_read, uname, cookies)
+        return encode(data, ShelfEntry, self.native)
+
+    @handle_exceptions
+    async def books_read(self, uname, cookies):
+        data = await self._fetch_paginated_books(self.scraper.books_read, uname, cookies)
+        return encode(data, ShelfEntry, self.native)
+
+    @handle_exceptions
+    async def get_all_journal_entries(self, cookies):
+        all_entries = [entry async for entry in self._iter_journal_entries(cookies)]
+        return encode(all_entries, JournalEntry, self.native)
+
+    @handle_exceptions
+    async def sync_journal_entries(self, cookies: Dict[str, str], cursor: Mapping[str, Any] | None = None):
+        reached = reached_cursor(cursor)
+        entries = []
+        async with aclosing(self._iter_journal_entries(cookies)) as journal:
+            async for entry in journal:
+                if reached(entry):
+                    break
+                entries.append(entry)
+        return _journal_sync(entries, cursor, self.native)
@@ -0,0 +1,251 @@
+import asyncio
+import inspect
+import json
+import threading
+import time
+import unittest
+
+from storygraph_api.books_client import AsyncBook, Book
+from storygraph_api.exceptions import RequestError
+from storygraph_api.journal import JournalIndex
+from storygraph_api.models import BookInfo, ReadDates
+from storygraph_api.memo import MISS, ResultCache
+from storygraph_api.request.transport import AsyncTransport, Transport
+from storygraph_api.testing.server import MockStoryGraph
+
+
+class FlakyMock(MockStoryGraph):
+    # Routes or paths listed in `failing` answer 404 until removed.
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.failing = set()
+
+    def render(self, method, path, query):
+        route, body = super().render(method, path, query)
+        return (route, None) if route in self.failing or path in self.failing else (route, body)
+
+
+class BookClientTest(unittest.TestCase):
+    def setUp(self):
+        self.mock = FlakyMock().start()
+        self.transport = Transport(base_url=self.mock.base_url)
+        self.memo = ResultCache()
+        self.book = Book(self.transport, native=True, memo=self.memo)
+
+    def tearDown(self):
+        self.book.close()
+        self.transport.close()
+        self.mock.stop()
+
+    def test_failed_sub_page_is_marked_and_not_memoized(self):
+        self.mock.failing.add('community_reviews')
+        info = self.book.book_info('book-0003')
+        self.assertIsNone(info.average_rating)
+        self.assertIn('average_rating', info.errors)
+        self.assertIsNotNone(info.warnings)
+        self.assertEqual(info.title, 'Book Number 3')
+        self.assertIs(self.memo.get('book_page', 'book-0003'), MISS)
+
+        self.mock.failing.clear()
+        info = self.book.book_info('book-0003')
+        self.assertIsNotNone(info.average_rating)
+        self.assertFalse(info.errors)
+        self.assertIsNot(self.memo.get('book_page', 'book-0003'), MISS)
+
+    def test_failed_main_page_fails_the_call(self):
+        self.mock.failing.add('book')
+        with self.assertRaises(RequestError):
+            self.book.book_info('book-0003')
+
+    def test_main_page_fields_cost_one_request(self):
+        info = self.book.book_info('book-0003', fields=['title', 'authors'])
+        self.assertEqual(info.title, 'Book Number 3')
+        self.assertTrue(info.authors)
+        self.assertEqual(self.mock.stats()['routes'], {'book': 1})
+
+    def test_rating_only_fetches_community_reviews(self):
+        info = self.book.book_info('book-0003', fields=['average_rating'])
+        self.assertIsNotNone(info.average_rating)
+        self.assertEqual(self.mock.stats()['routes'], {'community_reviews': 1})
+
+    def test_worker_pool_is_created_on_first_use(self):
+        def workers():
+            return [thread for thread in threading.enumerate() if thread.name.startswith('storygraph-book')]
+
+        self.book.close()
+        before = len(workers())
+        clients = [Book(self.transport) for _ in range(20)]
+        # Main-page fields need no sub-pages, so they start no pool either.
+        clients[0].book_info('book-0003', fields=['title'])
+        self.assertTrue(all(client._executor is None for client in clients))
+
+        with clients[1] as book:
+            book.book_info('book-0003')
+            self.assertIsNotNone(book._executor)
+            self.assertGreater(len(workers()), before)
+        self.assertIsNone(book._executor)
+        self.assertEqual(len(workers()), before)
+        # Closing twice, or closing a client that never started its pool, is fine.
+        for client in clients:
+            client.close()
+            client.close()
+
+    def test_unknown_field_raises(self):
+        for call in (lambda: self.book.book_info('book-0003', fields=['title', 'rating']),
+                     lambda: self.book.book_info_many(['book-0003'], fields=['rating']),
+                     lambda: Book(self.transport).book_info('book-0003', fields=['rating'])):
+            with self.assertRaisesRegex(ValueError, "rating"):
+                call()
+        self.assertEqual(self.mock.stats()['routes'], {})
+
+    def test_async_unknown_field_raises(self):
+        self.assertTrue(inspect.iscoroutinefunction(AsyncBook.book_info))
+        self.assertTrue(inspect.iscoroutinefunction(AsyncBook.book_info_many))
+
+        async def run():
+            async with AsyncTransport(base_url=self.mock.base_url) as transport:
+                # Like any coroutine, the call itself does nothing until awaited.
+                call = AsyncBook(transport).book_info('book-0003', fields=['rating'])
+                with self.assertRaisesRegex(ValueError, "rating"):
+                    await call
+                with self.assertRaisesRegex(ValueError, "rating"):
+                    await AsyncBook(transport).book_info_many(['book-0003'], fields=['rating'])
+        asyncio.run(run())
+        self.assertEqual(self.mock.stats()['routes'], {})
+
+
+class BookInfoManyTest(unittest.TestCase):
+    IDS = ['book-0004', 'book-0001', 'missing', 'book-0004', 'book-0002', 'book-0001', 'book-0005', 'book-0003']
+
+    def setUp(self):
+        self.mock = FlakyMock(latency=0.05).start()
+        self.mock.failing.add('/books/missing')
+
+    def tearDown(self):
+        self.mock.stop()
+
+    def check(self, results):
+        self.assertEqual(len(results), len(self.IDS))
+        for book_id, result in zip(self.IDS, results):
+            if book_id == 'missing':
+                self.assertIsInstance(result, RequestError)
+            else:
+                self.assertIsInstance(result, BookInfo)
+                self.assertEqual(result.title, f"Book Number {int(book_id[-4:])}")
+        stats = self.mock.stats()
+        # Six distinct ids; every good one also needs reviews and warnings.
+        self.assertEqual(stats['routes'], {'book': 6, 'community_reviews': 6, 'content_warnings': 6})
+        self.assertLessEqual(stats['max_in_flight'], 2)
+
+    def test_sync(self):
+        with Transport(base_url=self.mock.base_url, coalesce=False) as transport, \
+                Book(transport, native=True) as book:
+            self.check(book.book_info_many(self.IDS, max_concurrency=2))
+            self.mock.reset_stats()
+            book.book_info_many(['book-0010', 'book-0011', 'book-0012'], max_concurrency=3)
+            self.assertGreater(self.mock.stats()['max_in_flight'], 2)
+
+    def test_async(self):
+        async def run():
+            async with AsyncTransport(base_url=self.mock.base_url, coalesce=False) as transport:
+                return await AsyncBook(transport, native=True).book_info_many(self.IDS, max_concurrency=2)
+
+        self.check(asyncio.run(run()))
+
+    def test_json_errors_stay_in_their_slot(self):
+        with Transport(base_url=self.mock.base_url) as transport, Book(transport) as book:
+            results = json.loads(book.book_info_many(['book-0001', 'missing', 'book-0002']))
+        self.assertEqual([list(result) == ['error'] for result in results], [False, True, False])
+        self.assertEqual(results[2]['title'], 'Book Number 2')
+
+
+
+class JournalIndexTest(unittest.TestCase):
+    # The journal is slow, so concurrent callers overlap with a build.
+    COOKIES = {'_storygraph_session': 'reader'}
+    OTHER = {'_storygraph_session': 'other-reader'}
+    IDS = ['book-0001', 'book-0002', 'book-0001', 'book-0099']
+
+    def setUp(self):
+        self.mock = FlakyMock(latency=0.1, journal_size=25, library_size=10).start()
+        self.index = JournalIndex([{'book_id': 'book-0001'}])
+
+    def tearDown(self):
+        self.mock.stop()
+
+    def test_sync_waits_for_running_build(self):
+        with Transport(base_url=self.mock.base_url) as transport, Book(transport, native=True) as book:
+            build = threading.Thread(target=book.journal_index, args=(self.COOKIES,))
+            build.start()
+            time.sleep(0.05)
+            book.use_journal_index(self.COOKIES, self.index)
+            build.join()
+            self.assertIs(book.journal_index(self.COOKIES), self.index)
+
+    def test_async_waits_for_running_build(self):
+        async def run():
+            async with AsyncTransport(base_url=self.mock.base_url) as transport:
+                book = AsyncBook(transport, native=True)
+                build = asyncio.create_task(book.journal_index(self.COOKIES))
+                await asyncio.sleep(0.05)
+                await book.use_journal_index(self.COOKIES, self.index)
+                await build
+                return await book.journal_index(self.COOKIES)
+        self.assertIs(asyncio.run(run()), self.index)
+
+    def test_sync_accounts_build_independently(self):
+        with Transport(base_url=self.mock.base_url, coalesce=False) as transport, Book(transport) as book:
+            builds = [threading.Thread(target=book.journal_index, args=(cookies,))
+                      for cookies in (self.COOKIES, self.OTHER)]
+            for build in builds:
+                build.start()
+            for build in builds:
+                build.join()
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 8})
+        self.assertEqual(self.mock.stats()['max_in_flight'], 2)
+
+    def test_async_accounts_build_independently(self):
+        async def run():
+            async with AsyncTransport(base_url=self.mock.base_url, coalesce=False) as transport:
+                book = AsyncBook(transport)
+                await asyncio.gather(book.journal_index(self.COOKIES), book.journal_index(self.OTHER))
+        asyncio.run(run())
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 8})
+        self.assertEqual(self.mock.stats()['max_in_flight'], 2)
+
+    def test_read_dates_many_answers_from_the_index(self):
+        with Transport(base_url=self.mock.base_url) as transport, Book(transport, native=True) as book:
+            dates = book.get_read_dates_many(self.IDS, self.COOKIES)
+            index = book.journal_index(self.COOKIES)
+            self.assertEqual(book.get_read_dates_many(self.IDS, self.COOKIES), dates)
+        self.assertEqual(list(dates), ['book-0001', 'book-0002', 'book-0099'])
+        self.assertEqual(dates['book-0001'], ReadDates(**index.read_dates('book-0001')))
+        self.assertIsNotNone(dates['book-0001'].finish_date)
+        self.assertEqual(dates['book-0099'], ReadDates(None, None))
+        # One pass over the journal (three pages and the empty one after) and no book pages.
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 4})
+
+    def test_read_dates_many_falls_back_to_book_pages(self):
+        self.mock.failing.add('journal')
+        with Transport(base_url=self.mock.base_url) as transport, Book(transport) as book:
+            dates = json.loads(book.get_read_dates_many(self.IDS, self.COOKIES))
+        self.assertEqual(list(dates), ['book-0001', 'book-0002', 'book-0099'])
+        self.assertTrue(all(item['start_date'] for item in dates.values()))
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 1, 'book': 3, 'edit_form': 3})
+
+    def test_async_read_dates_many(self):
+        async def run():
+            async with AsyncTransport(base_url=self.mock.base_url) as transport:
+                return await AsyncBook(transport, native=True).get_read_dates_many(self.IDS, self.COOKIES)
+        dates = asyncio.run(run())
+        self.assertEqual(list(dates), ['book-0001', 'book-0002', 'book-0099'])
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 4})
+
+        self.mock.failing.add('journal')
+        self.mock.reset_stats()
+        dates = asyncio.run(run())
+        self.assertEqual(len(dates), 3)
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 1, 'book': 3, 'edit_form': 3})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import unittest
+from dataclasses import asdict
+from datetime import date
+
+from storygraph_api.exceptions import RequestError
+from storygraph_api.journal import advance_cursor, entry_key
+from storygraph_api.request.transport import AsyncTransport, Transport
+from storygraph_api.testing.server import MockStoryGraph
+from storygraph_api.users_client import AsyncUser, User
+
+COOKIES = {'_storygraph_session': 'reader'}
+
+
+class JournalMock(MockStoryGraph):
+    # A journal that can grow between runs and a page that can be made to fail.
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.entries = super().journal()
+        self.failing_page = None
+
+    def journal(self):
+        return list(self.entries)
+
+    def render(self, method, path, query):
+        if path == '/journal' and int(query.get('page') or 1) == self.failing_page:
+            return 'journal', None
+        return super().render(method, path, query)
+
+
+class JournalSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.mock = JournalMock(journal_size=25, library_size=10).start()
+        self.transport = Transport(base_url=self.mock.base_url)
+        self.user = User(self.transport, native=True)
+
+    def tearDown(self):
+        self.transport.close()
+        self.mock.stop()
+
+    def sync(self, cursor=None):
+        self.mock.reset_stats()
+        return self.user.sync_journal_entries(COOKIES, cursor)
+
+    def test_first_run_without_cursor(self):
+        result = self.sync()
+        self.assertEqual(len(result.entries), 25)
+        self.assertEqual(result.cursor['date'], '2024-12-31')
+        newest = [entry for entry in result.entries if entry.date == '31 December 2024']
+        self.assertEqual(len(newest), 3)
+        self.assertEqual(result.cursor['keys'], sorted(entry_key(asdict(entry)) for entry in newest))
+        # Three full pages and the empty fourth.
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 4})
+
+    def test_rerun_is_a_no_op(self):
+        cursor = self.sync().cursor
+        result = self.sync(cursor)
+        self.assertEqual(result.entries, [])
+        self.assertEqual(result.cursor, cursor)
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 1})
+
+    def test_new_entries_on_cursor_date(self):
+        cursor = self.sync().cursor
+        new = {'book_id': 'book-0007', 'date': date(2024, 12, 31), 'status': None, 'progress': 64}
+        self.mock.entries.insert(0, new)
+        result = self.sync(cursor)
+        self.assertEqual([(entry.book_id, entry.progress_percent) for entry in result.entries], [('book-0007', 64)])
+        self.assertEqual(result.cursor['date'], '2024-12-31')
+        self.assertEqual(len(result.cursor['keys']), 4)
+        self.assertTrue(set(cursor['keys']) < set(result.cursor['keys']))
+        self.assertEqual(self.sync(result.cursor).entries, [])
+
+    def test_stops_at_older_date(self):
+        result = self.sync({'date': '2024-12-29', 'keys': []})
+        self.assertEqual({entry.date for entry in result.entries},
+                         {'31 December 2024', '30 December 2024', '29 December 2024'})
+        self.assertEqual(len(result.entries), 9)
+        self.assertEqual(self.mock.stats()['routes'], {'journal': 1})
+
+    def test_failed_sync_does_not_advance_cursor(self):
+        cursor = {'date': '2024-12-20', 'keys': []}
+        self.mock.failing_page = 2
+        with self.assertRaises(RequestError):
+            self.sync(cursor)
+        failed = json.loads(User(self.transport).sync_journal_entries(COOKIES, cursor))
+        self.assertEqual(list(failed), ['error'])
+
+        self.mock.failing_page = None
+        result = self.sync(cursor)
+        self.assertEqual(result.cursor['date'], '2024-12-31')
+        self.assertEqual(len(result.entries), 25)
+
+
+class AsyncJournalSyncTest(unittest.TestCase):
+    def test_matches_sync_client(self):
+        async def run(base_url, cursor):
+            async with AsyncTransport(base_url=base_url) as transport:
+                return await AsyncUser(transport).sync_journal_entries(COOKIES, cursor)
+
+        with JournalMock(journal_size=25, library_size=10) as mock, Transport(base_url=mock.base_url) as transport:
+            user = User(transport)
+            for cursor in (None, {'date': '2024-12-29', 'keys': []}):
+                self.assertEqual(json.loads(asyncio.run(run(mock.base_url, cursor))),
+                                 json.loads(user.sync_journal_entries(COOKIES, cursor)))
+
+    def test_advance_cursor_keeps_keys_on_same_date(self):
+        entries = [{'book_id': 'a', 'date': '31 December 2024'}, {'book_id': 'b', 'date': '30 December 2024'}]
+        cursor = advance_cursor(None, entries)
+        self.assertEqual(cursor, {'date': '2024-12-31', 'keys': [entry_key(entries[0])]})
+        self.assertEqual(advance_cursor(cursor, []), cursor)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import unittest
+from unittest import mock
+
+from storygraph_api.memo import MISS, ResultCache
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch('storygraph_api.memo.time.monotonic', lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResultCache(max_entries=3, ttls={'book_page': 60})
+        for key in 'abc':
+            cache.set('book_page', key, key.upper())
+        # Reading a refreshes it, so b is now the oldest.
+        self.assertEqual(cache.get('book_page', 'a'), 'A')
+        cache.set('book_page', 'd', 'D')
+        self.assertEqual(len(cache), 3)
+        self.assertIs(cache.get('book_page', 'b'), MISS)
+        self.assertEqual([cache.get('book_page', key) for key in 'acd'], ['A', 'C', 'D'])
+
+        # Overwriting c moves it to the newest end, leaving a as the oldest.
+        cache.set('book_page', 'c', 'C2')
+        cache.set('book_page', 'e', 'E')
+        self.assertIs(cache.get('book_page', 'a'), MISS)
+        self.assertEqual(cache.get('book_page', 'c'), 'C2')
+
+    def test_entries_expire_after_their_method_ttl(self):
+        cache = ResultCache(ttls={'book_page': 60, 'search': 10}, default_ttl=5)
+        cache.set('book_page', 'a', 1)
+        cache.set('search', 'a', 2)
+        cache.set('get_user_id', 'a', 3)
+
+        self.now += 9.9
+        self.assertEqual(cache.get('search', 'a'), 2)
+        self.assertIs(cache.get('get_user_id', 'a'), MISS)
+        self.now += 0.1
+        self.assertIs(cache.get('search', 'a'), MISS)
+        self.assertEqual(cache.get('book_page', 'a'), 1)
+        self.now += 50
+        self.assertIs(cache.get('book_page', 'a'), MISS)
+        self.assertEqual(len(cache), 0)
+
+    def test_methods_without_ttl_are_not_cached(self):
+        cache = ResultCache(ttls={'book_page': 0})
+        cache.set('book_page', 'a', 1)
+        cache.set('search', 'a', 1)
+        self.assertEqual(len(cache), 0)
+        ResultCache(max_entries=0).set('book_page', 'a', 1)
+
+    def test_invalidate(self):
+        cache = ResultCache(ttls={'book_page': 60, 'search': 60})
+        for method in ('book_page', 'search'):
+            for key in 'ab':
+                cache.set(method, key, key)
+
+        cache.invalidate('book_page', 'a')
+        self.assertIs(cache.get('book_page', 'a'), MISS)
+        self.assertEqual(cache.get('book_page', 'b'), 'b')
+        cache.invalidate('search')
+        self.assertIs(cache.get('search', 'a'), MISS)
+        self.assertIs(cache.get('search', 'b'), MISS)
+        self.assertEqual(len(cache), 1)
+        cache.invalidate()
+        self.assertEqual(len(cache), 0)
+
+    def test_hit_and_miss_counters(self):
+        cache = ResultCache(ttls={'book_page': 60, 'search': 60})
+        cache.get('book_page', 'a')
+        cache.set('book_page', 'a', {'title': 'A'})
+        cache.get('book_page', 'a')
+        cache.get('book_page', 'a')
+        cache.get('search', 'a')
+        self.assertEqual(cache.stats(), {'book_page': {'hits': 2, 'misses': 1}, 'search': {'hits': 0, 'misses': 1}})
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    def test_results_are_copies(self):
+        cache = ResultCache(ttls={'book_page': 60})
+        value = {'tags': ['a']}
+        cache.set('book_page', 'a', value)
+        value['tags'].append('b')
+        cache.get('book_page', 'a')['tags'].append('c')
+        self.assertEqual(cache.get('book_page', 'a'), {'tags': ['a']})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from storygraph_api.books_client import AsyncBook, Book
+from storygraph_api.exceptions import RequestError
+from storygraph_api.metadata import BookStore
+from storygraph_api.request.transport import AsyncTransport, Transport
+from test.test_books_client import FlakyMock
+
+
+class BookStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'books.sqlite3')
+        self.mock = FlakyMock().start()
+        self.transport = Transport(base_url=self.mock.base_url)
+        self.store = BookStore(self.path, max_age=3600)
+        self.book = Book(self.transport, native=True, store=self.store)
+
+    def tearDown(self):
+        self.book.close()
+        self.store.close()
+        self.transport.close()
+        self.mock.stop()
+        self.tmp.cleanup()
+
+    def book_requests(self):
+        return self.mock.stats()['routes'].get('book', 0)
+
+    def test_fresh_hit_skips_the_network(self):
+        first = self.book.book_metadata('book-0001')
+        self.assertEqual(first.title, 'Book Number 1')
+        self.assertEqual(self.book_requests(), 1)
+
+        self.assertEqual(self.book.book_metadata('book-0001'), first)
+        many = self.book.book_metadata_many(['book-0001', 'book-0002', 'book-0001'])
+        self.assertEqual([item.title for item in many], ['Book Number 1', 'Book Number 2', 'Book Number 1'])
+        self.assertEqual(self.book_requests(), 2)
+
+        # book_info also fills the store, so main-page metadata fields are free afterwards.
+        self.book.book_info('book-0003')
+        self.book.book_info('book-0003', fields=['title', 'authors'])
+        self.assertEqual(self.book_requests(), 3)
+
+    def test_expired_record_is_refetched(self):
+        self.book.book_metadata('book-0001')
+        stored_at = self.store.get('book-0001').stored_at
+        self.store.max_age = 0
+        self.assertEqual(self.book.book_metadata('book-0001').title, 'Book Number 1')
+        self.assertEqual(self.book_requests(), 2)
+        self.assertGreater(self.store.get('book-0001').stored_at, stored_at)
+
+    def test_stale_record_is_served_when_refetch_fails(self):
+        first = self.book.book_metadata('book-0001')
+        self.store.max_age = 0
+        self.mock.failing.add('book')
+        self.assertEqual(self.book.book_metadata('book-0001'), first)
+        many = self.book.book_metadata_many(['book-0001', 'book-0002'])
+        self.assertEqual(many[0], first)
+        self.assertIsInstance(many[1], RequestError)
+        self.assertEqual(self.book_requests(), 4)
+
+    def test_missing_record_fails_when_fetch_fails(self):
+        self.mock.failing.add('book')
+        with self.assertRaises(RequestError):
+            self.book.book_metadata('book-0001')
+        self.assertEqual(len(self.store), 0)
+
+    def test_records_survive_a_reopen(self):
+        first = self.book.book_metadata('book-0001')
+        self.book.close()
+        self.store.close()
+
+        self.store = BookStore(self.path, max_age=3600)
+        self.book = Book(self.transport, native=True, store=self.store)
+        self.assertEqual(len(self.store), 1)
+        self.assertEqual(self.book.book_metadata('book-0001'), first)
+        self.assertEqual(self.book_requests(), 1)
+
+        conn = sqlite3.connect(self.path)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(books)")]
+        conn.close()
+        self.assertEqual(columns, ['book_id', 'title', 'authors', 'pages', 'first_pub', 'tags', 'cover_url',
+                                   'stored_at'])
+
+    def test_async_fresh_hit_skips_the_network(self):
+        first = self.book.book_metadata('book-0001')
+
+        async def run():
+            async with AsyncTransport(base_url=self.mock.base_url) as transport:
+                book = AsyncBook(transport, native=True, store=self.store)
+                return await book.book_metadata('book-0001'), await book.book_metadata_many(['book-0001'])
+
+        single, many = asyncio.run(run())
+        self.assertEqual(single, first)
+        self.assertEqual(many, [first])
+        self.assertEqual(self.book_requests(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import os
+import tempfile
+import unittest
+
+from storygraph_api.books_client import Book
+from storygraph_api.metrics import (
+    MetricsCollector, ParseEvent, RequestEvent, add_hook, hooks_enabled, remove_hook, url_template
+)
+from storygraph_api.parse.books_parser import BooksParser
+from storygraph_api.request.cache import ResponseCache
+from storygraph_api.request.transport import Transport
+from storygraph_api.testing.server import MockStoryGraph
+
+
+class HookEventTest(unittest.TestCase):
+    def setUp(self):
+        self.events = []
+        self.hook = add_hook(self.events.append)
+        self.addCleanup(remove_hook, self.hook)
+        self.mock = MockStoryGraph().start()
+        self.addCleanup(self.mock.stop)
+
+    def of_type(self, kind):
+        return [event for event in self.events if isinstance(event, kind)]
+
+    def test_request_and_parse_events(self):
+        with Transport(base_url=self.mock.base_url) as transport, Book(transport) as book:
+            book.book_info('book-0001', fields=['title'])
+            page = transport.get(f"{self.mock.base_url}/books/book-0001")
+
+        # The first event is book_info's request; the second is the fetch above.
+        request = self.of_type(RequestEvent)[0]
+        self.assertEqual((request.method, request.endpoint, request.status, request.retries, request.cache,
+                          request.error), ('GET', '/books/{id}', 200, 0, None, None))
+        self.assertEqual(request.url, f"{self.mock.base_url}/books/book-0001")
+        self.assertEqual(request.bytes, len(page))
+        self.assertGreater(request.duration, 0)
+
+        [parse] = self.of_type(ParseEvent)
+        self.assertEqual((parse.parser, parse.bytes, parse.error), ('BooksParser.book_page', len(page), None))
+        self.assertEqual(len(self.of_type(RequestEvent)), 2)
+        self.assertGreaterEqual(parse.duration, 0)
+        self.assertGreaterEqual(parse.cpu_time, 0)
+
+    def test_failures_and_cache_results(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, 'cache.sqlite3'))
+            with Transport(base_url=self.mock.base_url, cache=cache, coalesce=False) as transport:
+                url = f"{self.mock.base_url}/books/book-0001"
+                transport.get(url)
+                transport.get(url)
+                with self.assertRaises(Exception):
+                    transport.get(f"{self.mock.base_url}/unknown")
+            cache.close()
+        with self.assertRaises(Exception) as raised:
+            BooksParser.get_ai_summary(b'<html></html>')
+
+        miss, hit, missing = self.of_type(RequestEvent)
+        self.assertEqual((miss.status, miss.cache), (200, 'miss'))
+        self.assertEqual((hit.status, hit.cache, hit.bytes), (None, 'hit', miss.bytes))
+        self.assertEqual((missing.endpoint, missing.status), ('/unknown', 404))
+        [parse] = self.of_type(ParseEvent)
+        self.assertEqual((parse.parser, parse.error), ('BooksParser.get_ai_summary', type(raised.exception).__name__))
+
+    def test_removed_hook_gets_nothing(self):
+        remove_hook(self.hook)
+        self.assertFalse(hooks_enabled())
+        BooksParser.average_rating(b'<html></html>')
+        self.assertEqual(self.events, [])
+
+    def test_url_templates(self):
+        self.assertEqual(url_template('https://app.thestorygraph.com/books/abc/community_reviews'),
+                         '/books/{id}/community_reviews')
+        self.assertEqual(url_template('https://app.thestorygraph.com/books/abc'), '/books/{id}')
+        self.assertEqual(url_template('https://app.thestorygraph.com/to-read/reader?page=2'), '/to-read/{user}')
+        self.assertEqual(url_template('https://app.thestorygraph.com/journal?page=2'), '/journal')
+        self.assertEqual(url_template('https://app.thestorygraph.com'), '/')
+
+
+class MetricsCollectorTest(unittest.TestCase):
+    def test_prometheus_exposition(self):
+        metrics = MetricsCollector(latency_buckets=(0.1, 1.0), parse_buckets=(0.01,))
+        for event in (
+            RequestEvent('GET', '/books/{id}', 'u', 200, 0.05, 100),
+            RequestEvent('GET', '/books/{id}', 'u', 200, 0.5, 200, retries=2, cache='miss'),
+            RequestEvent('GET', '/books/{id}', 'u', None, 0.0, 100, cache='hit'),
+            RequestEvent('POST', '/edit', 'u', None, 2.0, 0, error='ConnectionError'),
+            ParseEvent('BooksParser.book_page', 0.005, 0.004, 1000),
+            ParseEvent('BooksParser.book_page', 0.02, 0.01, 500, error='ParsingError'),
+            'ignored',
+        ):
+            metrics(event)
+
+        self.assertEqual(metrics.to_prometheus(), '''\
+# HELP storygraph_requests_total Requests made to StoryGraph, including cache hits.
+# TYPE storygraph_requests_total counter
+storygraph_requests_total{endpoint="/books/{id}",method="GET",status="cached"} 1
+storygraph_requests_total{endpoint="/books/{id}",method="GET",status="200"} 2
+storygraph_requests_total{endpoint="/edit",method="POST",status="ConnectionError"} 1
+# HELP storygraph_request_duration_seconds Network latency per request, including retries.
+# TYPE storygraph_request_duration_seconds histogram
+storygraph_request_duration_seconds_bucket{endpoint="/books/{id}",le="0.1"} 1
+storygraph_request_duration_seconds_bucket{endpoint="/books/{id}",le="1.0"} 2
+storygraph_request_duration_seconds_bucket{endpoint="/books/{id}",le="+Inf"} 2
+storygraph_request_duration_seconds_sum{endpoint="/books/{id}"} 0.55
+storygraph_request_duration_seconds_count{endpoint="/books/{id}"} 2
+storygraph_request_duration_seconds_bucket{endpoint="/edit",le="0.1"} 0
+storygraph_request_duration_seconds_bucket{endpoint="/edit",le="1.0"} 0
+storygraph_request_duration_seconds_bucket{endpoint="/edit",le="+Inf"} 1
+storygraph_request_duration_seconds_sum{endpoint="/edit"} 2.0
+storygraph_request_duration_seconds_count{endpoint="/edit"} 1
+# HELP storygraph_response_bytes_total Response body bytes received.
+# TYPE storygraph_response_bytes_total counter
+storygraph_response_bytes_total{endpoint="/books/{id}"} 400
+storygraph_response_bytes_total{endpoint="/edit"} 0
+# HELP storygraph_request_retries_total Requests retried after a 429 or 5xx.
+# TYPE storygraph_request_retries_total counter
+storygraph_request_retries_total{endpoint="/books/{id}"} 2
+storygraph_request_retries_total{endpoint="/edit"} 0
+# HELP storygraph_cache_requests_total Response cache lookups by result.
+# TYPE storygraph_cache_requests_total counter
+storygraph_cache_requests_total{endpoint="/books/{id}",result="hit"} 1
+storygraph_cache_requests_total{endpoint="/books/{id}",result="miss"} 1
+# HELP storygraph_parses_total Parser extractions by outcome.
+# TYPE storygraph_parses_total counter
+storygraph_parses_total{parser="BooksParser.book_page",outcome="ParsingError"} 1
+storygraph_parses_total{parser="BooksParser.book_page",outcome="ok"} 1
+# HELP storygraph_parse_duration_seconds Wall time per parser extraction.
+# TYPE storygraph_parse_duration_seconds histogram
+storygraph_parse_duration_seconds_bucket{parser="BooksParser.book_page",le="0.01"} 1
+storygraph_parse_duration_seconds_bucket{parser="BooksParser.book_page",le="+Inf"} 2
+storygraph_parse_duration_seconds_sum{parser="BooksParser.book_page"} 0.025
+storygraph_parse_duration_seconds_count{parser="BooksParser.book_page"} 2
+# HELP storygraph_parse_cpu_seconds_total Thread CPU time spent in parser extractions.
+# TYPE storygraph_parse_cpu_seconds_total counter
+storygraph_parse_cpu_seconds_total{parser="BooksParser.book_page"} 0.014
+''')
+
+    def test_label_values_are_escaped(self):
+        metrics = MetricsCollector()
+        metrics(RequestEvent('GET', 'a"b\\c\nd', 'u', 200, 0.01, 1))
+        self.assertIn('storygraph_requests_total{endpoint="a\\"b\\\\c\\nd",method="GET",status="200"} 1',
+                      metrics.to_prometheus())
+
+    def test_reset(self):
+        metrics = MetricsCollector()
+        metrics(RequestEvent('GET', '/journal', 'u', 200, 0.01, 1))
+        metrics.reset()
+        self.assertEqual([line for line in metrics.to_prometheus().splitlines() if not line.startswith('#')], [])
+
+
+if __name__ == '__main__':
+    unittest.main()
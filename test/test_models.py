@@ -0,0 +1,136 @@
+import dataclasses
+import json
+import unittest
+
+from storygraph_api.books_client import Book
+from storygraph_api.exceptions import ParsingError, RequestError
+from storygraph_api.models import BookInfo, JournalEntry, JournalSync, ReadDates, SearchResult, ShelfEntry, to_json
+from storygraph_api.request.transport import Transport
+from storygraph_api.testing.server import MockStoryGraph
+from storygraph_api.users_client import User
+
+COOKIES = {'_storygraph_session': 'reader'}
+# A book page whose metadata paragraph has no page count.
+BROKEN_BOOK_PAGE = (b'<html><body><h3 class="font-serif font-bold text-2xl md:w-11/12">Title</h3>'
+                    b'<p class="text-sm font-light text-darkestGrey dark:text-grey mt-1"> <span>x</span></p>'
+                    b'</body></html>')
+
+
+class BrokenMock(MockStoryGraph):
+    # /books/broken serves an unparseable page and /books/missing a 404.
+    def render(self, method, path, query):
+        if path == '/books/broken':
+            return 'book', BROKEN_BOOK_PAGE
+        if path == '/books/missing':
+            return 'book', None
+        return super().render(method, path, query)
+
+
+class NativeModeTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.mock = BrokenMock(journal_size=25, library_size=10).start()
+        cls.transport = Transport(base_url=cls.mock.base_url)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.transport.close()
+        cls.mock.stop()
+
+    def setUp(self):
+        self.book = Book(self.transport)
+        self.native_book = Book(self.transport, native=True)
+        self.user = User(self.transport)
+        self.native_user = User(self.transport, native=True)
+
+    def tearDown(self):
+        self.book.close()
+        self.native_book.close()
+
+    def assertSlotted(self, result, model):
+        self.assertIsInstance(result, model)
+        self.assertTrue(dataclasses.is_dataclass(result))
+        self.assertFalse(hasattr(result, '__dict__'))
+
+    def assertSameJson(self, native, legacy):
+        self.assertEqual(to_json(native), legacy)
+
+    def test_book_results(self):
+        info = self.native_book.book_info('book-0001')
+        self.assertSlotted(info, BookInfo)
+        self.assertSameJson(info, self.book.book_info('book-0001'))
+
+        # A projection leaves the unrequested fields None natively and out of the JSON.
+        partial = self.native_book.book_info('book-0001', fields=['title', 'average_rating'])
+        legacy = json.loads(self.book.book_info('book-0001', fields=['title', 'average_rating']))
+        self.assertEqual(list(legacy), ['title', 'average_rating'])
+        self.assertEqual({key: value for key, value in partial.to_dict().items() if value is not None}, legacy)
+
+        many = self.native_book.book_info_many(['book-0001', 'book-0002'])
+        for item in many:
+            self.assertSlotted(item, BookInfo)
+        self.assertSameJson(many, self.book.book_info_many(['book-0001', 'book-0002']))
+
+        results = self.native_book.search('Book Number')
+        self.assertTrue(results)
+        for item in results:
+            self.assertSlotted(item, SearchResult)
+        self.assertSameJson(results, self.book.search('Book Number'))
+
+    def test_read_dates_and_journal_results(self):
+        dates = self.native_book.get_read_dates('book-0001', COOKIES)
+        self.assertSlotted(dates, ReadDates)
+        self.assertSameJson(dates, self.book.get_read_dates('book-0001', COOKIES))
+
+        entries = self.native_book.get_journal_entries('book-0001', COOKIES)
+        self.assertTrue(entries)
+        for entry in entries:
+            self.assertSlotted(entry, JournalEntry)
+        self.assertSameJson(entries, self.book.get_journal_entries('book-0001', COOKIES))
+
+    def test_user_results(self):
+        for name in ('currently_reading', 'to_read', 'books_read'):
+            shelf = getattr(self.native_user, name)('reader', COOKIES)
+            self.assertTrue(shelf, name)
+            for entry in shelf:
+                self.assertSlotted(entry, ShelfEntry)
+            self.assertSameJson(shelf, getattr(self.user, name)('reader', COOKIES))
+
+        journal = self.native_user.get_all_journal_entries(COOKIES)
+        self.assertEqual(len(journal), 25)
+        for entry in journal:
+            self.assertSlotted(entry, JournalEntry)
+        self.assertSameJson(journal, self.user.get_all_journal_entries(COOKIES))
+
+        sync = self.native_user.sync_journal_entries(COOKIES)
+        self.assertSlotted(sync, JournalSync)
+        self.assertSameJson(sync, self.user.sync_journal_entries(COOKIES))
+
+    def test_plain_values(self):
+        user_id = self.native_user.get_user_id('reader')
+        self.assertIsInstance(user_id, str)
+        self.assertEqual(json.loads(self.user.get_user_id('reader')), {'user_id': user_id})
+
+    def test_native_mode_raises_typed_errors(self):
+        with self.assertRaises(RequestError):
+            self.native_book.book_info('missing')
+        with self.assertRaises(ParsingError):
+            self.native_book.book_info('broken')
+        with self.assertRaises(ParsingError):
+            self.native_book.book_metadata('broken')
+
+        many = self.native_book.book_info_many(['book-0001', 'missing', 'broken'])
+        self.assertSlotted(many[0], BookInfo)
+        self.assertIsInstance(many[1], RequestError)
+        self.assertIsInstance(many[2], ParsingError)
+
+    def test_json_mode_returns_error_objects(self):
+        missing = json.loads(self.book.book_info('missing'))
+        self.assertEqual(list(missing), ['error'])
+        broken = json.loads(self.book.book_info('broken'))
+        self.assertEqual(list(broken), ['error'])
+        self.assertIn('Failed to parse page content', broken['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
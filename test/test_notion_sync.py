@@ -0,0 +1,56 @@
+import unittest
+
+from storygraph_api.notion_sync import NotionRow, NotionSync, notion_properties
+from storygraph_api.request.ratelimit import RateLimiter, RetryPolicy
+from storygraph_api.testing.notion import FakeNotion
+
+DATABASE = 'db-1'
+
+
+def rows(start, stop):
+    return [NotionRow.of(f'Book {i}', f'Author {i % 7}', f'2024-01-{1 + i % 28:02d}', i * 1.5) for i in range(start, stop)]
+
+
+class NotionSyncTest(unittest.TestCase):
+    def setUp(self):
+        self.notion = FakeNotion(latency=0.002, throttle_every=9)
+        for row in rows(0, 250):
+            self.notion.add_page(DATABASE, notion_properties(row))
+        self.sync = NotionSync(self.notion, DATABASE, max_concurrency=4, rate_limiter=RateLimiter(1000),
+                               retry=RetryPolicy(max_retries=5, backoff=0.001))
+
+    def test_creates_only_missing_rows(self):
+        wanted = rows(200, 300) + rows(290, 300)
+        report = self.sync.sync(wanted)
+
+        self.assertEqual(report.existing, 50)
+        self.assertEqual(sorted(report.created), sorted(rows(250, 300)))
+        self.assertEqual(report.failed, [])
+        # 250 existing pages are read in three queries, not one query per entry.
+        self.assertEqual(self.notion.calls['databases.query'], 3)
+        self.assertLessEqual(self.notion.max_in_flight, 4)
+        self.assertEqual(self.sync.index(refresh=True), set(rows(0, 300)))
+
+    def test_second_run_creates_nothing(self):
+        self.sync.sync(rows(240, 260))
+        created = self.notion.calls['pages.create']
+        report = self.sync.sync(rows(240, 260))
+
+        self.assertEqual((report.existing, report.created), (20, []))
+        self.assertEqual(self.notion.calls['pages.create'], created)
+        self.assertEqual(len(self.notion.pages_by_database[DATABASE]), 260)
+
+    def test_gives_up_after_retries(self):
+        notion = FakeNotion()
+        sync = NotionSync(notion, DATABASE, rate_limiter=RateLimiter(1000), retry=RetryPolicy(max_retries=2, backoff=0.001))
+        sync.index()
+        notion.throttle_every = 1
+        report = sync.sync(rows(0, 2))
+
+        self.assertEqual(report.created, [])
+        self.assertEqual([row for row, _ in report.failed], rows(0, 2))
+        self.assertEqual(notion.calls['pages.create'], 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from storygraph_api import pagination
+from storygraph_api.pagination import afetch_pages, aiter_pages, fetch_pages, iter_pages
+
+
+def parse(content):
+    # Page n holds the items n*10 and n*10+1; b'' is an empty page.
+    return [int(content) * 10, int(content) * 10 + 1] if content else []
+
+
+class FakeJournal:
+    # Pages 1..last have items; earlier pages answer more slowly, so with a
+    # window the later pages finish first.
+    def __init__(self, last, delay=0.0, block_after=None):
+        self.last = last
+        self.delay = delay
+        self.block_after = block_after
+        self.release = threading.Event()
+        self.requested = []
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def fetch_page(self, page):
+        with self.lock:
+            self.requested.append(page)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if self.block_after is not None and page > self.block_after:
+                self.release.wait(5)
+            time.sleep(self.delay / page)
+            return str(page).encode() if page <= self.last else b''
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class IterPagesTest(unittest.TestCase):
+    def test_pages_arrive_in_order_with_a_window(self):
+        journal = FakeJournal(last=5, delay=0.05)
+        pages = list(iter_pages(journal.fetch_page, parse, window=3))
+        self.assertEqual(pages, [[10, 11], [20, 21], [30, 31], [40, 41], [50, 51]])
+        self.assertEqual(journal.max_running, 3)
+        # Everything up to the empty page 6, plus at most the window past it.
+        self.assertEqual(sorted(journal.requested)[:6], [1, 2, 3, 4, 5, 6])
+        self.assertLessEqual(max(journal.requested), 6 + 2)
+
+    def test_without_a_window_pages_are_fetched_one_at_a_time(self):
+        journal = FakeJournal(last=3)
+        self.assertEqual(fetch_pages(journal.fetch_page, parse), [10, 11, 20, 21, 30, 31])
+        self.assertEqual(journal.requested, [1, 2, 3, 4])
+        self.assertEqual(journal.max_running, 1)
+
+    def test_stops_at_the_first_empty_page(self):
+        # Page 3 is empty; page 4 has items but is never returned.
+        fetch = lambda page: b'' if page == 3 else str(page).encode()
+        self.assertEqual(fetch_pages(fetch, parse, window=4), [10, 11, 20, 21])
+        self.assertEqual(fetch_pages(fetch, parse), [10, 11, 20, 21])
+
+    def test_stopping_cancels_outstanding_fetches(self):
+        journal = FakeJournal(last=10, block_after=1)
+        futures = {}
+        submit = pagination.submit
+
+        def record(pool, fn, page):
+            futures[page] = submit(pool, fn, page)
+            return futures[page]
+
+        with mock.patch('storygraph_api.pagination.submit', record):
+            pages = iter_pages(journal.fetch_page, parse, window=3)
+            self.assertEqual(next(pages), [10, 11])
+            start = time.perf_counter()
+            pages.close()
+        # Fetches already running are left to finish on their own.
+        self.assertLess(time.perf_counter() - start, 1)
+
+        journal.release.set()
+        time.sleep(0.1)
+        # Closing at the yield stops before the next page is queued.
+        self.assertEqual(sorted(futures), [1, 2, 3])
+        for page, future in futures.items():
+            self.assertTrue(future.cancelled() or page in journal.requested, page)
+        self.assertEqual(sorted(journal.requested), [page for page in futures if not futures[page].cancelled()])
+
+    def test_errors_surface_at_their_page(self):
+        def fetch(page):
+            if page == 2:
+                raise ConnectionError('page 2')
+            return str(page).encode()
+
+        pages = iter_pages(fetch, parse, window=3)
+        self.assertEqual(next(pages), [10, 11])
+        with self.assertRaisesRegex(ConnectionError, 'page 2'):
+            next(pages)
+
+
+class AsyncIterPagesTest(unittest.TestCase):
+    def test_pages_arrive_in_order_and_the_rest_are_cancelled(self):
+        started, cancelled = [], []
+
+        async def fetch_page(page):
+            started.append(page)
+            try:
+                await asyncio.sleep(0.05 / page if page <= 6 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(page)
+                raise
+            return str(page).encode() if page <= 5 else b''
+
+        async def run():
+            pages = [items async for items in aiter_pages(fetch_page, parse, window=4)]
+            # Let the cancellations run.
+            await asyncio.sleep(0)
+            return pages
+
+        pages = asyncio.run(run())
+        self.assertEqual(pages, [[10, 11], [20, 21], [30, 31], [40, 41], [50, 51]])
+        # Page 9 was queued after page 5 and cancelled before it ever ran.
+        self.assertEqual(started, list(range(1, 9)))
+        self.assertEqual(sorted(cancelled), [7, 8])
+
+    def test_afetch_pages_flattens(self):
+        async def fetch_page(page):
+            return str(page).encode() if page <= 2 else b''
+
+        self.assertEqual(asyncio.run(afetch_pages(fetch_page, parse, window=2)), [10, 11, 20, 21])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import importlib.util
+import os
+import unittest
+
+from storygraph_api.parse.backend import (
+    PARSER_BACKENDS, get_parser_backend, set_parser_backend, get_partial_parsing, set_partial_parsing
+)
+from storygraph_api.parse.books_parser import BooksParser
+from storygraph_api.parse.stream import iter_parsed
+from storygraph_api.parse.user_parser import UserParser, ShelfStream, JournalStream
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+def extract_all():
+    return {
+        'book_page': BooksParser.book_page(fixture('book.html')),
+        'average_rating': BooksParser.average_rating(fixture('community_reviews.html')),
+        'content_warnings': BooksParser.content_warnings(fixture('content_warnings.html')),
+        'reading_progress': BooksParser.reading_progress(fixture('book.html')),
+        'read_dates_edit_link': BooksParser.read_dates_edit_link(fixture('book.html')),
+        'read_dates_form': BooksParser.read_dates_form(fixture('read_instance_form.html'), 'read_instance'),
+        'get_ai_summary': BooksParser.get_ai_summary(fixture('summary.turbo_stream')),
+        'search': BooksParser.search(fixture('search.html')),
+        'journal_entries': BooksParser.journal_entries(fixture('book_journal.html')),
+        'get_user_id': UserParser.get_user_id(fixture('profile.html'), 'reader'),
+        'parse_html': UserParser.parse_html(fixture('shelf.html')),
+        'parse_html_empty': UserParser.parse_html(fixture('shelf_empty.html')),
+        'all_journal_entries': UserParser.all_journal_entries(fixture('journal.html')),
+        'all_journal_entries_empty': UserParser.all_journal_entries(fixture('journal_empty.html')),
+    }
+
+
+class ParserBackendTest(unittest.TestCase):
+    def setUp(self):
+        self.previous_backend = get_parser_backend()
+        self.previous_partial = get_partial_parsing()
+
+    def tearDown(self):
+        set_parser_backend(self.previous_backend)
+        set_partial_parsing(self.previous_partial)
+
+    def test_default_backend_extracts_fixtures(self):
+        set_parser_backend('html.parser')
+        results = extract_all()
+
+        book = results['book_page']
+        self.assertEqual(book['title'], 'Dune')
+        self.assertEqual(book['authors'], ['Frank Herbert', 'Brian Herbert'])
+        self.assertEqual(book['pages'], '658')
+        self.assertEqual(book['first_pub'], '1965')
+        self.assertEqual(book['cover_url'], 'https://cdn.thestorygraph.com/covers/dune.jpg')
+        self.assertTrue(book['description'].startswith('Set on the desert planet Arrakis'))
+        self.assertEqual(results['average_rating'], '4.26')
+        self.assertEqual(results['content_warnings'], {
+            'graphic': ['Violence', 'Death'], 'moderate': ['Drug use', 'Torture'], 'minor': ['Animal death', 'Misogyny']
+        })
+        self.assertEqual(results['reading_progress'], '42%')
+        self.assertEqual(results['read_dates_edit_link'], ('read_instance', 'ri-777'))
+        self.assertEqual(results['read_dates_form'], {'start_date': '2024-03-12', 'finish_date': '2024-03-28'})
+        self.assertEqual(results['get_user_id'], {'user_id': 'u-5f2c9a'})
+        self.assertEqual(len(results['search']), 3)
+        self.assertEqual(len(results['parse_html']), 10)
+        self.assertEqual(results['parse_html_empty'], [])
+        self.assertEqual(len(results['all_journal_entries']), 12)
+        self.assertEqual(results['all_journal_entries_empty'], [])
+        self.assertEqual(results['journal_entries'][-1]['status'], 'Finished')
+
+    def test_backends_agree(self):
+        set_parser_backend('html.parser')
+        expected = extract_all()
+        for backend in PARSER_BACKENDS[1:]:
+            if importlib.util.find_spec(backend) is None:
+                continue
+            with self.subTest(backend=backend):
+                set_parser_backend(backend)
+                self.assertEqual(extract_all(), expected)
+
+    def test_partial_parsing_matches_full_tree(self):
+        for backend in ('html.parser', 'lxml'):
+            if importlib.util.find_spec(backend) is None:
+                continue
+            with self.subTest(backend=backend):
+                set_parser_backend(backend)
+                set_partial_parsing(False)
+                expected = extract_all()
+                set_partial_parsing(True)
+                self.assertEqual(extract_all(), expected)
+
+    def test_streamed_parsing_matches_whole_page(self):
+        cases = [('shelf.html', UserParser.parse_html, ShelfStream),
+                 ('journal.html', UserParser.all_journal_entries, JournalStream),
+                 ('journal_empty.html', UserParser.all_journal_entries, JournalStream),
+                 # Book 5's page count changes from 500 to 300; its Finished
+                 # entry has none and takes the last one on the page.
+                 ('journal_page_count_changed.html', UserParser.all_journal_entries, JournalStream)]
+        for name, parse, stream in cases:
+            content = fixture(name)
+            for size in (1, 37, 4096):
+                with self.subTest(page=name, chunk_size=size):
+                    chunks = (content[i:i + size] for i in range(0, len(content), size))
+                    self.assertEqual(list(iter_parsed(chunks, stream())), parse(content))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            set_parser_backend('selectolax')
+
+
+if __name__ == '__main__':
+    unittest.main()
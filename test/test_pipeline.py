@@ -0,0 +1,49 @@
+import os
+import unittest
+
+from storygraph_api.parse.user_parser import UserParser
+from storygraph_api.pipeline import ParsePipeline
+
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+
+def fixture(name):
+    with open(os.path.join(FIXTURES, name), 'rb') as f:
+        return f.read()
+
+
+class ParsePipelineTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = ParsePipeline(parse_workers=2, fetch_workers=3, max_pending=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pipeline.close()
+
+    def test_pages_stop_at_first_empty_page_in_order(self):
+        pages = {1: fixture('journal.html'), 2: fixture('journal.html'), 3: fixture('journal_empty.html')}
+        fetched = []
+
+        def fetch_page(page):
+            fetched.append(page)
+            return pages.get(page, fixture('journal_empty.html'))
+
+        expected = UserParser.all_journal_entries(fixture('journal.html'))
+        self.assertEqual(list(self.pipeline.pages(fetch_page, UserParser.all_journal_entries, window=2)),
+                         [expected, expected])
+        self.assertLessEqual(max(fetched), 4)
+
+    def test_map_keeps_order_and_raises_at_failed_item(self):
+        names = ['shelf.html', 'shelf_empty.html', 'shelf.html'] * 4
+        results = self.pipeline.map(fixture, UserParser.parse_html, names)
+        self.assertEqual(list(results), [UserParser.parse_html(fixture(name)) for name in names])
+
+        results = self.pipeline.map(fixture, UserParser.parse_html, ['shelf.html', 'missing.html', 'shelf.html'])
+        self.assertEqual(len(next(results)), 10)
+        with self.assertRaises(FileNotFoundError):
+            next(results)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import time
+import unittest
+from email.utils import formatdate
+
+from storygraph_api.exceptions import RequestError
+from storygraph_api.request.ratelimit import RateLimiter, RetryPolicy, parse_retry_after, retry_delay
+from storygraph_api.request.transport import Transport
+from storygraph_api.testing.server import MockStoryGraph
+
+FAST_RETRY = RetryPolicy(max_retries=3, backoff=0.001)
+
+
+class RetryAfterTest(unittest.TestCase):
+    def test_seconds(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertEqual(parse_retry_after('-4'), 0.0)
+
+    def test_http_date(self):
+        self.assertAlmostEqual(parse_retry_after(formatdate(time.time() + 30, usegmt=True)), 30, delta=1.5)
+        self.assertEqual(parse_retry_after(formatdate(time.time() - 30, usegmt=True)), 0.0)
+
+    def test_missing_or_invalid(self):
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+    def test_delay_honours_retry_after_cap(self):
+        policy = RetryPolicy(backoff=0.001, max_retry_after=5)
+        self.assertGreaterEqual(retry_delay(None, policy, 'GET', 429, {'Retry-After': '2'}, 0), 2)
+        self.assertLess(retry_delay(None, policy, 'GET', 503, {'Retry-After': '600'}, 0), 5.01)
+
+
+class AimdTest(unittest.TestCase):
+    def test_rate_halves_on_throttle_and_recovers(self):
+        limiter = RateLimiter(10, increase=1, min_rate=1)
+        retry_delay(limiter, None, 'GET', 429, {}, 0)
+        self.assertEqual(limiter.rate, 5)
+        retry_delay(limiter, None, 'GET', 503, {}, 0)
+        self.assertEqual(limiter.rate, 2.5)
+        for _ in range(3):
+            retry_delay(limiter, None, 'GET', 500, {}, 0)
+        self.assertEqual(limiter.rate, 2.5)
+        for _ in range(5):
+            retry_delay(limiter, None, 'GET', 200, {}, 0)
+        self.assertEqual(limiter.rate, 7.5)
+        for _ in range(5):
+            retry_delay(limiter, None, 'GET', 200, {}, 0)
+        self.assertEqual(limiter.rate, 10)
+
+    def test_rate_never_drops_below_minimum(self):
+        limiter = RateLimiter(10, min_rate=2)
+        for _ in range(10):
+            limiter.throttled()
+        self.assertEqual(limiter.rate, 2)
+
+    def test_retry_after_pauses_the_bucket(self):
+        limiter = RateLimiter(1000)
+        limiter.throttled(retry_after=0.2)
+        self.assertGreater(limiter.reserve(), 0.15)
+
+
+class TransportRetryTest(unittest.TestCase):
+    def setUp(self):
+        self.mock = MockStoryGraph(retry_after=0.01, seed=7).start()
+        self.transport = Transport(base_url=self.mock.base_url, retry=FAST_RETRY, coalesce=False)
+
+    def tearDown(self):
+        self.transport.close()
+        self.mock.stop()
+
+    def test_get_gives_up_after_max_retries(self):
+        self.mock.error_rate = 1.0
+        with self.assertRaises(RequestError):
+            self.transport.get(f"{self.mock.base_url}/books/book-0001")
+        self.assertEqual(self.mock.stats()['statuses'], {500: 4})
+
+    def test_post_is_not_retried_on_server_error(self):
+        self.mock.error_rate = 1.0
+        with self.assertRaises(RequestError):
+            self.transport.post(f"{self.mock.base_url}/edit-read-instance-from-book?book_id=book-0001")
+        self.assertEqual(self.mock.stats()['statuses'], {500: 1})
+
+    def test_post_is_retried_when_throttled(self):
+        self.mock.throttle_rate = 1.0
+        with self.assertRaises(RequestError):
+            self.transport.post(f"{self.mock.base_url}/edit-read-instance-from-book?book_id=book-0001")
+        self.assertEqual(self.mock.stats()['statuses'], {429: 4})
+
+    def test_recovers_from_transient_errors(self):
+        self.mock.throttle_rate = 0.3
+        self.mock.error_rate = 0.2
+        limiter = RateLimiter(1000)
+        transport = Transport(base_url=self.mock.base_url, retry=RetryPolicy(max_retries=20, backoff=0.001),
+                              rate_limiter=limiter, coalesce=False)
+        with transport:
+            for i in range(20):
+                page = transport.get(f"{self.mock.base_url}/books/book-{i:04d}")
+                self.assertIn(b'book-title-author-and-series', page)
+        statuses = self.mock.stats()['statuses']
+        self.assertEqual(statuses[200], 20)
+        self.assertGreater(statuses.get(429, 0) + statuses.get(500, 0), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
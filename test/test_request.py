@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+
+from storygraph_api.books_client import Book
+from storygraph_api.request.cache import ResponseCache
+from storygraph_api.request.transport import Transport
+from storygraph_api.testing.server import MockStoryGraph
+
+COOKIES = {'_storygraph_session': 'reader'}
+
+
+class ResponseCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mock = MockStoryGraph().start()
+        self.cache = ResponseCache(os.path.join(self.tmp.name, 'cache.sqlite3'))
+        self.transport = Transport(base_url=self.mock.base_url, cache=self.cache, coalesce=False)
+
+    def tearDown(self):
+        self.transport.close()
+        self.cache.close()
+        self.mock.stop()
+        self.tmp.cleanup()
+
+    def test_anonymous_book_page_is_served_from_cache(self):
+        url = f"{self.mock.base_url}/books/book-0001"
+        first = self.transport.get(url)
+        self.assertEqual(self.transport.get(url), first)
+        self.assertEqual(self.mock.stats()['routes'], {'book': 1})
+
+    def test_cookie_bearing_book_page_is_revalidated(self):
+        book = Book(self.transport, native=True)
+        first = book.reading_progress('book-0001', COOKIES)
+        self.assertEqual(book.reading_progress('book-0001', COOKIES), first)
+        stats = self.mock.stats()
+        self.assertEqual(stats['routes'], {'book': 2})
+        self.assertEqual(stats['statuses'], {200: 1, 304: 1})
+
+    def test_ttl_ignores_defaults_for_cookies(self):
+        url = f"{self.mock.base_url}/books/book-0001"
+        self.assertEqual(self.cache.ttl_for(url), 60 * 60)
+        self.assertEqual(self.cache.ttl_for(url, COOKIES), 0)
+        self.assertIsNone(self.cache.ttl_for(f"{self.mock.base_url}/journal", COOKIES))
+
+
+if __name__ == '__main__':
+    unittest.main()
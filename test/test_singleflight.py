@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from storygraph_api.books_client import Book
+from storygraph_api.request.transport import Transport
+from storygraph_api.singleflight import AsyncSingleFlight, SingleFlight
+from storygraph_api.testing.server import MockStoryGraph
+
+
+class SingleFlightTest(unittest.TestCase):
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        calls = []
+
+        def load():
+            calls.append(1)
+            time.sleep(0.1)
+            return {'items': [1, 2]}
+
+        with ThreadPoolExecutor(max_workers=5) as pool:
+            results = list(pool.map(lambda _: flight.do('key', load), range(5)))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{'items': [1, 2]}] * 5)
+        results[0]['items'].append(3)
+        self.assertEqual(results[1], {'items': [1, 2]})
+        self.assertEqual(len(flight), 0)
+
+    def test_error_reaches_every_caller(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            time.sleep(0.1)
+            raise KeyError('boom')
+
+        def call(_):
+            try:
+                flight.do('key', fail)
+            except KeyError as e:
+                return e
+            return None
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            errors = list(pool.map(call, range(4)))
+        self.assertTrue(all(isinstance(error, KeyError) for error in errors))
+        self.assertEqual(len(flight), 0)
+
+
+class AsyncSingleFlightTest(unittest.TestCase):
+    def test_error_reaches_every_waiter(self):
+        async def run():
+            flight = AsyncSingleFlight()
+            calls = []
+
+            async def fail():
+                calls.append(1)
+                await asyncio.sleep(0.05)
+                raise KeyError('boom')
+
+            results = await asyncio.gather(*(flight.do('key', fail) for _ in range(4)), return_exceptions=True)
+            return calls, results, len(flight)
+
+        calls, results, remaining = asyncio.run(run())
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(isinstance(result, KeyError) for result in results))
+        self.assertEqual(remaining, 0)
+
+    def test_waiter_takes_over_when_leader_is_cancelled(self):
+        async def run():
+            flight = AsyncSingleFlight()
+            calls = []
+
+            async def load():
+                calls.append(1)
+                await asyncio.sleep(0.05)
+                return len(calls)
+
+            leader = asyncio.create_task(flight.do('key', load))
+            await asyncio.sleep(0.01)
+            waiters = [asyncio.create_task(flight.do('key', load)) for _ in range(3)]
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            results = await asyncio.gather(*waiters)
+            return leader, calls, results
+
+        leader, calls, results = asyncio.run(run())
+        self.assertTrue(leader.cancelled())
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(results, [2, 2, 2])
+
+    def test_cancelled_waiter_leaves_the_leader_running(self):
+        async def run():
+            flight = AsyncSingleFlight()
+
+            async def load():
+                await asyncio.sleep(0.05)
+                return 'page'
+
+            leader = asyncio.create_task(flight.do('key', load))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.create_task(flight.do('key', load))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            return await leader, waiter
+
+        result, waiter = asyncio.run(run())
+        self.assertEqual(result, 'page')
+        self.assertTrue(waiter.cancelled())
+
+
+class BookCoalescingTest(unittest.TestCase):
+    def test_batch_shares_flight_with_book_info(self):
+        with MockStoryGraph(latency=0.2) as mock, Transport(base_url=mock.base_url, coalesce=False) as transport, \
+                Book(transport, native=True) as book:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                single = pool.submit(book.book_info, 'book-0001')
+                time.sleep(0.05)
+                batch = book.book_info_many(['book-0001', 'book-0002'])
+            self.assertEqual(batch[0], single.result())
+            self.assertEqual(mock.stats()['routes']['book'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from storygraph_api.books_client import Book
+from storygraph_api.request.transport import Transport
+from storygraph_api.testing.server import MockStoryGraph
+from storygraph_api.tracing import span, trace, tracing_enabled
+
+
+class TracingTest(unittest.TestCase):
+    def test_spans_are_shared_no_ops_when_off(self):
+        self.assertFalse(tracing_enabled())
+        self.assertIs(span('a'), span('b', 'parse', attr=1))
+        with span('a') as current:
+            self.assertIsNone(current)
+
+    def test_client_call_nests_http_and_parse_spans(self):
+        with MockStoryGraph() as mock, Transport(base_url=mock.base_url) as transport, \
+                Book(transport) as book:
+            with trace() as tracer:
+                self.assertTrue(tracing_enabled())
+                book.book_info('book-0001', fields=['title'])
+            self.assertFalse(tracing_enabled())
+            book.book_info('book-0002', fields=['title'])
+
+        [root] = tracer.tree()
+        self.assertEqual(root['name'], 'Book.book_info')
+        self.assertEqual([child['name'] for child in root['children']],
+                         ['GET /books/{id}', 'BooksParser.book_page'])
+        self.assertEqual([child['category'] for child in root['children']], ['http', 'parse'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import asyncio
+import json
+import unittest
+from itertools import islice
+
+from storygraph_api.exceptions import RequestError
+from storygraph_api.models import JournalEntry, ShelfEntry
+from storygraph_api.pipeline import ParsePipeline
+from storygraph_api.request.transport import AsyncTransport, Transport
+from storygraph_api.users_client import AsyncUser, User
+from test.test_books_client import FlakyMock
+
+COOKIES = {'_storygraph_session': 'reader'}
+SHELVES = ('currently_reading', 'to_read', 'books_read')
+
+
+class UserIterTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pipeline = ParsePipeline(parse_workers=2, fetch_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pipeline.close()
+
+    def setUp(self):
+        # 18 books read (two pages), 9 to read, 3 currently reading and a
+        # journal of three pages.
+        self.mock = FlakyMock(library_size=30, journal_size=25).start()
+        self.transport = Transport(base_url=self.mock.base_url)
+        self.user = User(self.transport)
+        self.expected = {name: json.loads(getattr(self.user, name)('reader', COOKIES)) for name in SHELVES}
+        self.expected['journal'] = json.loads(self.user.get_all_journal_entries(COOKIES))
+        self.mock.reset_stats()
+
+    def tearDown(self):
+        self.transport.close()
+        self.mock.stop()
+
+    def iterated(self, user):
+        results = {name: list(getattr(user, f'iter_{name}')('reader', COOKIES)) for name in SHELVES}
+        results['journal'] = list(user.iter_journal_entries(COOKIES))
+        return results
+
+    def test_iterators_match_the_list_methods(self):
+        self.assertEqual(len(self.expected['books_read']), 18)
+        self.assertEqual(len(self.expected['journal']), 25)
+        for options in ({}, {'page_window': 3}, {'stream': True}, {'pipeline': self.pipeline}):
+            with self.subTest(**{key: str(value) for key, value in options.items()}):
+                self.assertEqual(self.iterated(User(self.transport, **options)), self.expected)
+
+    def test_native_iterators_yield_models(self):
+        results = self.iterated(User(self.transport, native=True))
+        for name in SHELVES:
+            self.assertTrue(all(isinstance(entry, ShelfEntry) for entry in results[name]))
+            self.assertEqual([entry.to_dict() for entry in results[name]], self.expected[name])
+        self.assertTrue(all(isinstance(entry, JournalEntry) for entry in results['journal']))
+        self.assertEqual([entry.to_dict() for entry in results['journal']], self.expected['journal'])
+
+    def test_iterators_fetch_pages_as_they_are_consumed(self):
+        books = self.user.iter_books_read('reader', COOKIES)
+        self.assertEqual(self.mock.stats()['requests'], 0)
+        self.assertEqual(list(islice(books, 10)), self.expected['books_read'][:10])
+        self.assertEqual(self.mock.stats()['routes'], {'books-read': 1})
+        books.close()
+
+        entries = list(islice(self.user.iter_journal_entries(COOKIES), 11))
+        self.assertEqual(entries, self.expected['journal'][:11])
+        self.assertEqual(self.mock.stats()['routes'], {'books-read': 1, 'journal': 2})
+
+    def test_iterators_raise_request_errors(self):
+        # Iterators are not wrapped by handle_exceptions, so failures raise
+        # even in JSON mode, after the pages that did arrive.
+        self.mock.failing.add('journal')
+        with self.assertRaises(RequestError):
+            next(self.user.iter_journal_entries(COOKIES))
+        self.assertEqual(list(json.loads(self.user.get_all_journal_entries(COOKIES))), ['error'])
+
+    def test_pipeline_is_used_for_lists_and_sync(self):
+        user = User(self.transport, native=True, pipeline=self.pipeline)
+        self.assertEqual([entry.to_dict() for entry in user.books_read('reader', COOKIES)],
+                         self.expected['books_read'])
+        sync = user.sync_journal_entries(COOKIES)
+        self.assertEqual([entry.to_dict() for entry in sync.entries], self.expected['journal'])
+        # The pipeline reads one page per parse worker ahead of the empty page.
+        routes = self.mock.stats()['routes']
+        self.assertGreaterEqual(routes['books-read'], 3)
+        self.assertLessEqual(routes['books-read'], 3 + 2)
+
+
+class AsyncUserIterTest(unittest.TestCase):
+    def test_iterators_match_the_list_methods(self):
+        async def run(transport, **options):
+            user = AsyncUser(transport, **options)
+            results = {}
+            for name in SHELVES:
+                results[name] = [entry async for entry in getattr(user, f'iter_{name}')('reader', COOKIES)]
+            results['journal'] = [entry async for entry in user.iter_journal_entries(COOKIES)]
+            return results
+
+        async def expected(transport):
+            user = AsyncUser(transport)
+            results = {name: json.loads(await getattr(user, name)('reader', COOKIES)) for name in SHELVES}
+            results['journal'] = json.loads(await user.get_all_journal_entries(COOKIES))
+            return results
+
+        async def main(base_url):
+            async with AsyncTransport(base_url=base_url) as transport:
+                wanted = await expected(transport)
+                for options in ({}, {'page_window': 3}, {'stream': True}):
+                    with self.subTest(**options):
+                        self.assertEqual(await run(transport, **options), wanted)
+                native = await run(transport, native=True)
+                self.assertTrue(all(isinstance(entry, JournalEntry) for entry in native['journal']))
+
+        with FlakyMock(library_size=30, journal_size=25) as mock:
+            asyncio.run(main(mock.base_url))
+
+
+if __name__ == '__main__':
+    unittest.main()